@@ -16,9 +16,10 @@ while ! nc -z $POSTGRES_HOST $POSTGRES_PORT; do
 done
 log "✅ PostgreSQL is available at $POSTGRES_HOST:$POSTGRES_PORT"
 
-# Colect static files
+# Colect static files. Incremental: only new or modified files are copied,
+# hashed and compressed (STATIC_ROOT is a volume kept between boots)
 log "Running 'collectstatic' to gather static files..."
-poetry run python /app/src/manage.py collectstatic --noinput -i admin --clear --settings=$DJANGO_SETTINGS_MODULE -v 2
+poetry run python /app/src/manage.py collectstatic --noinput --settings=$DJANGO_SETTINGS_MODULE -v 1
 log "✅ Static files collected successfully."
 
 # Migrate database
@@ -27,6 +28,36 @@ poetry run python $APP_HOME/src/manage.py makemigrations --noinput
 poetry run python $APP_HOME/src/manage.py migrate --noinput
 log "✅ Database migrations completed."
 
-# Inicia o servidor Django
-log "Starting Django development server..."
-exec poetry run python $APP_HOME/src/manage.py runserver 0.0.0.0:8000
+# Background jobs repeating themselves (run by the worker container)
+poetry run python $APP_HOME/src/manage.py purge_registration_tokens --schedule
+poetry run python $APP_HOME/src/manage.py build_slot_grid --schedule
+
+# Compile every template: fails fast on syntax errors before serving traffic
+log "Checking templates..."
+poetry run python $APP_HOME/src/manage.py warm_templates --top 5
+log "✅ Templates compiled successfully."
+
+# Start the server. SERVER_MODE: "wsgi" (default), "asgi" or "dev" (runserver)
+# Workers, keep-alive, timeouts etc. are read from src/project/gunicorn_conf.py
+# (exported: settings.py disables persistent DB connections under ASGI)
+export SERVER_MODE=${SERVER_MODE:-wsgi}
+cd $APP_HOME/src
+case "$SERVER_MODE" in
+  dev)
+    log "Starting Django development server..."
+    exec poetry run python manage.py runserver 0.0.0.0:8000
+    ;;
+  asgi)
+    log "Starting gunicorn with uvicorn workers (ASGI)..."
+    exec poetry run gunicorn project.asgi:application \
+      -c project/gunicorn_conf.py -k uvicorn.workers.UvicornWorker
+    ;;
+  wsgi)
+    log "Starting gunicorn (WSGI)..."
+    exec poetry run gunicorn project.wsgi:application -c project/gunicorn_conf.py
+    ;;
+  *)
+    log "Unknown SERVER_MODE '$SERVER_MODE' (use wsgi, asgi or dev)"
+    exit 1
+    ;;
+esac
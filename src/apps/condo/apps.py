@@ -5,3 +5,6 @@ class CondoConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.condo"
     verbose_name = "Condominium"
+
+    def ready(self) -> None:
+        from . import signals  # noqa: F401
@@ -0,0 +1,15 @@
+from django.utils.functional import SimpleLazyObject
+
+from apps.condo.fragment_cache import FRAGMENT_CACHE_TIMEOUT, get_generation
+
+
+def fragment_cache(request):
+    """
+    Exposes the cache generation of the user's condominium, used to version the
+    cached template fragments. It is only read if a template uses it.
+    """
+    condominium_id = getattr(request.user, "condominium_id", None)
+    return {
+        "fragment_cache_timeout": FRAGMENT_CACHE_TIMEOUT,
+        "condo_generation": SimpleLazyObject(lambda: get_generation(condominium_id)),
+    }
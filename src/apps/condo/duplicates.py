@@ -0,0 +1,55 @@
+"""
+Rows breaking the case insensitive unique names of the condo schema.
+
+Block and common area names are unique in their condominium, and apartment
+names in their block, whatever their case (see the constraints of each
+model). Rows saved before the constraints existed may break them: they are
+listed by "manage.py report_duplicates" and must be renamed or deleted
+before migration 0006 adds the unique indexes.
+"""
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# model: (scope field, name field)
+UNIQUE_NAMES = {
+    "Block": ("condominium", "number_or_name"),
+    "Apartment": ("block", "number_or_name"),
+    "CommonArea": ("condominium", "name"),
+}
+
+
+def find_duplicates(get_model) -> list[dict]:
+    """
+    Lists the groups of rows sharing a name. get_model is apps.get_model,
+    so migrations can pass their historical models.
+    """
+    duplicates = []
+    for model_name, (scope, field) in UNIQUE_NAMES.items():
+        model = get_model("condo", model_name)
+        groups = (
+            model.objects.annotate(lower_name=Lower(field))
+            .values(scope, "lower_name")
+            .annotate(total=Count("pk"), names=ArrayAgg(field), ids=ArrayAgg("pk"))
+            .filter(total__gt=1)
+            .order_by(scope, "lower_name")
+        )
+        duplicates.extend(
+            {
+                "model": model_name,
+                "scope": f"{scope} {group[scope]}",
+                "names": group["names"],
+                "ids": [str(pk) for pk in group["ids"]],
+            }
+            for group in groups
+        )
+    return duplicates
+
+
+def describe(duplicate: dict) -> str:
+    names = ", ".join(repr(name) for name in duplicate["names"])
+    return (
+        f"{duplicate['model']} {names} in {duplicate['scope']} "
+        f"(ids {', '.join(duplicate['ids'])})"
+    )
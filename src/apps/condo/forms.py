@@ -1,8 +1,16 @@
 from django import forms
 from django.core.exceptions import ValidationError
+from django.core.validators import FileExtensionValidator
 from django_countries import countries
 
-from apps.condo.models import Apartment, Block, CommonArea, Condominium
+from apps.condo.models import (
+    APARTMENT_NAME_MESSAGE,
+    Apartment,
+    Block,
+    CommonArea,
+    Condominium,
+    same_name,
+)
 
 
 class CondoSetupForm(forms.ModelForm):
@@ -230,16 +238,14 @@ class ApartmentSetupForm(forms.ModelForm):
 
         if (
             Apartment.objects.filter(
-                number_or_name=apartment_number_or_name_in_form,
+                same_name("number_or_name", apartment_number_or_name_in_form),
                 condominium=self.condominium,
                 block=self.block,
             )
             .exclude(pk=self.instance.pk)
             .exists()
         ):
-            raise ValidationError(
-                "Apartment number (or name) already exists in this block. Please, choose a different one."
-            )
+            raise ValidationError(APARTMENT_NAME_MESSAGE)
         return apartment_number_or_name_in_form
 
 
@@ -453,3 +459,39 @@ class CommonAreaSetupForm(forms.ModelForm):
         ):
             raise ValidationError("Closing time must be higher than opening time.")
         return closing_time_in_form
+
+
+class ResidentInvitationsForm(forms.Form):
+
+    csv_file = forms.FileField(
+        required=True,
+        label="Residents CSV file",
+        help_text="Columns: first_name, last_name, email, block, apartment",
+        validators=[FileExtensionValidator(allowed_extensions=["csv"])],
+        widget=forms.ClearableFileInput(
+            attrs={
+                "class": "form-control",
+                "accept": ".csv",
+                "id": "csv_file",
+            }
+        ),
+        error_messages={"required": "Please, choose a CSV file."},
+    )
+
+
+class ApartmentImportForm(forms.Form):
+
+    csv_file = forms.FileField(
+        required=True,
+        label="Apartments CSV file",
+        help_text="Columns: block, apartment (leave apartment empty to create only the block)",
+        validators=[FileExtensionValidator(allowed_extensions=["csv"])],
+        widget=forms.ClearableFileInput(
+            attrs={
+                "class": "form-control",
+                "accept": ".csv",
+                "id": "csv_file",
+            }
+        ),
+        error_messages={"required": "Please, choose a CSV file."},
+    )
@@ -0,0 +1,32 @@
+"""
+Versioned template fragment caching per condominium.
+
+Fragments rendered from condominium data (setup side header, home header) are
+cached with "{% cache %}" keyed by the condominium id and its "generation", a
+number stored in the cache_generation column of the condominium and bumped by
+the signals of this app whenever the condominium, its blocks, apartments or
+common areas change. Bumping makes every older fragment unreachable (they
+expire by themselves), so nothing has to be deleted.
+
+The generation is read from the database, so a bump reaches every process even
+with the default local memory cache. It is updated in the same transaction as
+the change: requests see the new generation and the new data together.
+"""
+
+from apps.condo.models import Condominium
+
+FRAGMENT_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def get_generation(condominium_id) -> int:
+    generation = (
+        Condominium.objects.filter(pk=condominium_id)
+        .values_list("cache_generation", flat=True)
+        .first()
+    )
+    return generation or 0
+
+
+def bump_generation(condominium_id) -> None:
+    """Invalidates every cached fragment of the condominium"""
+    Condominium.objects.filter(pk=condominium_id).bump_cache_generation()
@@ -0,0 +1,66 @@
+"""
+Resized WebP variants of cover images.
+
+Uploaded covers are usually phone photos of several MB. After each upload,
+every size in COVER_SIZES is generated once as a WebP file stored alongside
+the original (i.e. blocks/2025/01/31/photo.jpg -> photo.thumb.webp), so pages
+only download what they display. Variants are built by a background task (see
+tasks.py): until they exist, get_cover_url(size) falls back to the original
+image.
+
+Covers uploaded before variants existed are processed by
+"manage.py build_cover_variants".
+"""
+
+import io
+import posixpath
+
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+
+# name: (max width, max height). Aspect ratio is kept.
+COVER_SIZES = {
+    "thumb": (640, 400),
+    "large": (1600, 1000),
+}
+WEBP_QUALITY = 80
+
+
+def variant_name(name: str, size: str) -> str:
+    root, _ = posixpath.splitext(name)
+    return f"{root}.{size}.webp"
+
+
+def variant_url(field_file, size: str) -> str:
+    """
+    URL of the "size" variant of an image field file, or of the original image
+    while the variant is not available.
+    """
+    if size not in COVER_SIZES:
+        raise ValueError(f"Unknown cover size {size!r}: use one of {list(COVER_SIZES)}")
+    name = variant_name(field_file.name, size)
+    if field_file.storage.exists(name):
+        return field_file.storage.url(name)
+    return field_file.url
+
+
+def build_variants(storage, name: str) -> list[str]:
+    """
+    Generates every variant of the image "name" in storage, replacing old
+    ones. The image is decoded once and downscaled from the largest size to
+    the smallest one.
+    """
+    with storage.open(name) as file, Image.open(file) as original:
+        image = ImageOps.exif_transpose(original)
+        image = image.convert("RGBA" if image.has_transparency_data else "RGB")
+
+    names = []
+    by_area = sorted(COVER_SIZES.items(), key=lambda item: -item[1][0] * item[1][1])
+    for size, box in by_area:
+        image.thumbnail(box, Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=WEBP_QUALITY, method=4)
+        target = variant_name(name, size)
+        storage.delete(target)
+        names.append(storage.save(target, ContentFile(buffer.getvalue())))
+    return names
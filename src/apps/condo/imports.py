@@ -0,0 +1,185 @@
+"""
+Import of blocks and apartments from a CSV file.
+
+Real buildings rarely follow the floor * 10 + n numbering generated by
+SetupApartmentMultipleCreateView, so managers can upload their own list
+instead: one line per apartment, with a header line (columns in CSV_COLUMNS).
+A line with an empty "apartment" only creates its block.
+
+The file is read as a stream, one line at a time, and new apartments are
+inserted with bulk_create in chunks of BATCH_SIZE. Neither the file nor its
+model instances are held in memory.
+
+Duplicates are detected by name. The existing blocks and apartments of the
+condominium are loaded with one values_list query each. The key and line of
+every apartment read from the file are added to them, so memory still grows
+with the number of lines.
+
+Everything runs in one transaction. If any line is invalid, the transaction
+is rolled back and the errors of every line are returned, so nothing is
+imported from a partially wrong file.
+"""
+
+import csv
+import io
+from dataclasses import dataclass, field
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models.functions import Lower
+
+from apps.condo.models import Apartment, Block
+
+CSV_COLUMNS = ("block", "apartment")
+# apartments inserted by each INSERT statement
+BATCH_SIZE = 500
+# errors kept for the report; the following ones are only counted
+MAX_REPORTED_ERRORS = 100
+
+
+@dataclass
+class ImportResult:
+    blocks_created: int = 0
+    apartments_created: int = 0
+    errors: list[str] = field(default_factory=list)
+    hidden_errors: int = 0
+
+    def add_error(self, message: str):
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+        else:
+            self.hidden_errors += 1
+
+
+def iter_rows(csv_file):
+    """
+    Yields (line number, block, apartment) for every line of an uploaded CSV
+    file, with surrounding blanks removed. Raises ValidationError if the
+    header misses a column and csv.Error or UnicodeDecodeError on unreadable
+    lines.
+    """
+    reader = csv.DictReader(io.TextIOWrapper(csv_file, encoding="utf-8-sig"))
+    missing = set(CSV_COLUMNS) - set(reader.fieldnames or ())
+    if missing:
+        raise ValidationError(f"Missing columns: {', '.join(sorted(missing))}.")
+    for row in reader:
+        yield (
+            reader.line_num,
+            (row["block"] or "").strip(),
+            (row["apartment"] or "").strip(),
+        )
+
+
+def import_apartments(csv_file, condominium) -> ImportResult:
+    """
+    Creates the blocks and apartments listed in an uploaded CSV file. Returns
+    how many were created, or the errors of the file (nothing is created).
+    """
+    result = ImportResult()
+    blocks = dict(
+        Block.objects.filter(condominium=condominium)
+        .annotate(name=Lower("number_or_name"))
+        .values_list("name", "pk")
+    )
+    # (block id, apartment) of every apartment, existing or read from the file
+    apartments = set(
+        Apartment.objects.filter(condominium=condominium)
+        .annotate(name=Lower("number_or_name"))
+        .values_list("block_id", "name")
+    )
+    max_block_length = Block._meta.get_field("number_or_name").max_length
+    max_apartment_length = Apartment._meta.get_field("number_or_name").max_length
+    pending = []
+    # the line where each apartment of the file was found
+    lines = {}
+
+    with transaction.atomic():
+        rows = iter_rows(csv_file)
+        line_num = 1
+        try:
+            for line_num, block_name, apartment_name in rows:
+                if not block_name:
+                    result.add_error(f"Line {line_num}: block is required.")
+                    continue
+                if len(block_name) > max_block_length:
+                    result.add_error(
+                        f"Line {line_num}: block names have at most "
+                        f"{max_block_length} characters."
+                    )
+                    continue
+                if len(apartment_name) > max_apartment_length:
+                    result.add_error(
+                        f"Line {line_num}: apartment names have at most "
+                        f"{max_apartment_length} characters."
+                    )
+                    continue
+
+                block_id = blocks.get(block_name.lower())
+                if block_id is None:
+                    block_id = _create_block(block_name, condominium, result)
+                    blocks[block_name.lower()] = block_id
+                if not apartment_name:
+                    continue
+
+                key = (block_id, apartment_name.lower())
+                if key in apartments:
+                    where = (
+                        f"on line {lines[key]}" if key in lines else "in the database"
+                    )
+                    result.add_error(
+                        f"Line {line_num}: apartment {apartment_name} of block "
+                        f"{block_name} already exists {where}."
+                    )
+                    continue
+                apartments.add(key)
+                lines[key] = line_num
+
+                if result.errors:
+                    # the import will be rolled back, only keep validating
+                    continue
+                pending.append(
+                    Apartment(
+                        number_or_name=apartment_name,
+                        block_id=block_id,
+                        condominium=condominium,
+                    )
+                )
+                if len(pending) == BATCH_SIZE:
+                    result.apartments_created += _flush(pending)
+        except ValidationError as error:
+            result.add_error(" ".join(error.messages))
+        except (UnicodeDecodeError, csv.Error) as error:
+            result.add_error(f"Line {line_num + 1}: unreadable CSV file ({error}).")
+
+        if not result.errors:
+            result.apartments_created += _flush(pending)
+        else:
+            transaction.set_rollback(True)
+            result.blocks_created = result.apartments_created = 0
+    return result
+
+
+@dataclass(frozen=True)
+class PendingBlock:
+    """
+    A block of the file that is not created because the import already failed.
+    Stands for its id while the remaining lines are validated.
+    """
+
+    name: str
+
+
+def _create_block(name: str, condominium, result: ImportResult):
+    if result.errors:
+        # nothing will be saved, only keep validating the block's apartments
+        return PendingBlock(name.lower())
+    block = Block.objects.create(number_or_name=name, condominium=condominium)
+    result.blocks_created += 1
+    return block.pk
+
+
+def _flush(pending: list) -> int:
+    Apartment.objects.bulk_create(pending)
+    created = len(pending)
+    pending.clear()
+    return created
@@ -0,0 +1,48 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from apps.condo import images
+from apps.condo.models import Block, CommonArea, Condominium
+
+
+class Command(BaseCommand):
+    help = (
+        "Builds the resized WebP variants of the covers of condominiums, blocks, "
+        "common areas and users uploaded before they existed (or all of them "
+        "with --force)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rebuild variants that already exist.",
+        )
+
+    def handle(self, *args, **options):
+        built = failed = 0
+        for model in (Condominium, Block, CommonArea, get_user_model()):
+            names = (
+                model.objects.exclude(cover="")
+                .exclude(cover__isnull=True)
+                .values_list("cover", flat=True)
+                .iterator()
+            )
+            storage = model._meta.get_field("cover").storage
+            for name in names:
+                if not options["force"] and all(
+                    storage.exists(images.variant_name(name, size))
+                    for size in images.COVER_SIZES
+                ):
+                    continue
+                try:
+                    images.build_variants(storage, name)
+                except Exception as error:
+                    failed += 1
+                    self.stderr.write(f"{name}: {error}")
+                else:
+                    built += 1
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Variants built for {built} covers ({failed} failed).")
+        )
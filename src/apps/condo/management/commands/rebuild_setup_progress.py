@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.condo.models import SetupProgress
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the setup progress of every condominium. Progress is kept up to "
+        "date by model events; this repairs it after bulk imports or manual changes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            total = SetupProgress.objects.rebuild(batch_size=options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Setup progress rebuilt for {total} condominiums.")
+        )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.condo.models import Block, Condominium
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the denormalized counters of condominiums (blocks, apartments, "
+        "residents and common areas) and blocks (apartments) from their tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--condominium",
+            action="append",
+            dest="condominiums",
+            help="Only recount this condominium id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        condominiums = Condominium.objects.all()
+        blocks = Block.objects.all()
+        if options["condominiums"]:
+            condominiums = condominiums.filter(pk__in=options["condominiums"])
+            blocks = blocks.filter(condominium__in=options["condominiums"])
+
+        with transaction.atomic():
+            blocks_total = blocks.recount()
+            condominiums_total = condominiums.recount()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Counters recomputed for {condominiums_total} condominiums and "
+                f"{blocks_total} blocks."
+            )
+        )
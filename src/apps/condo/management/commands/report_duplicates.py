@@ -0,0 +1,23 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.condo.duplicates import describe, find_duplicates
+
+
+class Command(BaseCommand):
+    help = (
+        "Lists the blocks, apartments and common areas whose names only differ "
+        "by case in the same condominium (or block). They must be fixed before "
+        "the unique name indexes are created."
+    )
+
+    def handle(self, *args, **options):
+        duplicates = find_duplicates(apps.get_model)
+        for duplicate in duplicates:
+            self.stdout.write(describe(duplicate))
+        if duplicates:
+            raise CommandError(
+                f"{len(duplicates)} groups of duplicated names found. Rename or "
+                "delete the rows above before migrating."
+            )
+        self.stdout.write(self.style.SUCCESS("No duplicated names found."))
@@ -0,0 +1,112 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.template import Context, TemplateSyntaxError, engines
+from django.template.backends.django import DjangoTemplates
+
+TEMPLATE_SUFFIXES = (".html", ".txt")
+
+
+def iter_template_names(engine, root):
+    """
+    Yields the name of every template found by the loaders of a Django template
+    engine in directories under root (i.e. apps/*/templates and base_templates,
+    but not the ones shipped by Django itself).
+    """
+    seen = set()
+    for loader in engine.template_loaders:
+        # the cached loader wraps the real ones
+        for inner_loader in getattr(loader, "loaders", [loader]):
+            for directory in map(Path, inner_loader.get_dirs()):
+                if not directory.is_dir() or not directory.is_relative_to(root):
+                    continue
+                for path in sorted(directory.rglob("*")):
+                    name = path.relative_to(directory).as_posix()
+                    if path.suffix in TEMPLATE_SUFFIXES and name not in seen:
+                        seen.add(name)
+                        yield name
+
+
+def compile_templates(root=None, render=False) -> list[dict]:
+    """
+    Compiles every project template, so the cached loader keeps them in memory
+    for the rest of the process. Returns the compile (and optionally render)
+    time of each template. TemplateSyntaxError is not caught.
+    """
+    root = Path(root or settings.BASE_DIR)
+    timings = []
+    for backend in engines.all():
+        if not isinstance(backend, DjangoTemplates):
+            continue
+        engine = backend.engine
+        for name in iter_template_names(engine, root):
+            started = time.perf_counter()
+            template = engine.get_template(name)
+            timing = {"name": name, "compile": time.perf_counter() - started}
+            if render:
+                started = time.perf_counter()
+                try:
+                    template.render(Context())
+                except Exception as error:
+                    # most pages need a request (urls, csrf...): not an error here
+                    timing["render_error"] = type(error).__name__
+                else:
+                    timing["render"] = time.perf_counter() - started
+            timings.append(timing)
+    return timings
+
+
+class Command(BaseCommand):
+    help = (
+        "Compiles every template of the project, failing on the first syntax "
+        "error, and reports how long each one takes to compile (and render)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--render",
+            action="store_true",
+            help="Also render each template with an empty context and time it.",
+        )
+        parser.add_argument(
+            "--top",
+            type=int,
+            default=10,
+            help="Number of slowest templates to list (0 lists all of them).",
+        )
+        parser.add_argument(
+            "--root",
+            help="Only templates under this directory (default: BASE_DIR).",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        try:
+            timings = compile_templates(options["root"], render=options["render"])
+        except TemplateSyntaxError as error:
+            raise CommandError(f"Template syntax error: {error}") from error
+        elapsed = time.perf_counter() - started
+
+        slowest = sorted(
+            timings,
+            key=lambda timing: timing["compile"] + timing.get("render", 0),
+            reverse=True,
+        )
+        for timing in slowest[: options["top"] or None]:
+            line = f"{timing['compile'] * 1000:8.2f} ms compile"
+            if options["render"]:
+                render = (
+                    f"{timing['render'] * 1000:8.2f} ms render"
+                    if "render" in timing
+                    else f"{'-':>8}    render ({timing['render_error']})"
+                )
+                line = f"{line} {render}"
+            self.stdout.write(f"{line}  {timing['name']}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(timings)} templates compiled in {elapsed * 1000:.0f} ms."
+            )
+        )
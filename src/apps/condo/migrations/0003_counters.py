@@ -0,0 +1,77 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:57
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def subquery_count(queryset, field):
+    # frozen copy of apps.condo.models.subquery_count
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk", distinct=True))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def count_existing_rows(apps, schema_editor):
+    Apartment = apps.get_model("condo", "Apartment")
+    Block = apps.get_model("condo", "Block")
+    CommonArea = apps.get_model("condo", "CommonArea")
+    Condominium = apps.get_model("condo", "Condominium")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    Block.objects.update(
+        apartments_count=subquery_count(Apartment.objects.all(), "block")
+    )
+    Condominium.objects.update(
+        blocks_count=subquery_count(Block.objects.all(), "condominium"),
+        apartments_count=subquery_count(Apartment.objects.all(), "condominium"),
+        residents_count=subquery_count(
+            User.objects.filter(groups__name="resident"), "condominium"
+        ),
+        common_areas_count=subquery_count(CommonArea.objects.all(), "condominium"),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0002_alter_commonarea_options_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="block",
+            name="apartments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="condominium",
+            name="apartments_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="condominium",
+            name="blocks_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="condominium",
+            name="common_areas_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="condominium",
+            name="residents_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(count_existing_rows, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Exists, OuterRef
+
+
+def rebuild_setup_progress(apps, schema_editor):
+    """Setup progress is now event driven: every condominium needs a fresh row"""
+    Apartment = apps.get_model("condo", "Apartment")
+    Block = apps.get_model("condo", "Block")
+    CommonArea = apps.get_model("condo", "CommonArea")
+    Condominium = apps.get_model("condo", "Condominium")
+    SetupProgress = apps.get_model("condo", "SetupProgress")
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+
+    SetupProgress.objects.bulk_create(
+        [
+            SetupProgress(condominium=condominium)
+            for condominium in Condominium.objects.filter(setup_progress__isnull=True)
+        ],
+        ignore_conflicts=True,
+    )
+    condominium = OuterRef("condominium")
+    users = User.objects.filter(condominium=condominium)
+    SetupProgress.objects.update(
+        has_condominium=Exists(users),
+        has_blocks=Exists(Block.objects.filter(condominium=condominium)),
+        has_apartments=Exists(Apartment.objects.filter(condominium=condominium)),
+        has_residents=Exists(users.filter(groups__name="resident")),
+        has_common_areas=Exists(CommonArea.objects.filter(condominium=condominium)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0003_counters"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(rebuild_setup_progress, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.15 on 2026-10-17 20:50
+
+import re
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+# frozen copy of apps.condo.models.SORT_NUMBER_LAST
+SORT_NUMBER_LAST = 10**18
+
+
+def natural_sort_key(number_or_name):
+    # frozen copy of apps.condo.models.natural_sort_key
+    match = re.match(r"[0-9]+", number_or_name)
+    if match is None or len(match.group()) > 18:
+        return SORT_NUMBER_LAST, number_or_name.lower()
+    return int(match.group()), number_or_name[match.end() :].lower()
+
+
+def fill_sort_keys(apps, schema_editor):
+    Apartment = apps.get_model("condo", "Apartment")
+    batch = []
+    for apartment in Apartment.objects.only("number_or_name").iterator(BATCH_SIZE):
+        apartment.sort_number, apartment.sort_text = natural_sort_key(
+            apartment.number_or_name
+        )
+        batch.append(apartment)
+        if len(batch) == BATCH_SIZE:
+            Apartment.objects.bulk_update(batch, ["sort_number", "sort_text"])
+            batch = []
+    Apartment.objects.bulk_update(batch, ["sort_number", "sort_text"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0004_setupprogress_backfill"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="apartment",
+            options={"ordering": ["block", "sort_number", "sort_text"]},
+        ),
+        migrations.AddField(
+            model_name="apartment",
+            name="sort_number",
+            # every row is filled by fill_sort_keys below
+            field=models.BigIntegerField(default=SORT_NUMBER_LAST, editable=False),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="apartment",
+            name="sort_text",
+            field=models.CharField(default="", editable=False, max_length=20),
+        ),
+        migrations.RunPython(fill_sort_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="apartment",
+            index=models.Index(
+                fields=["block", "sort_number", "sort_text", "id"],
+                name="condo_apartment_sort_idx",
+            ),
+        ),
+    ]
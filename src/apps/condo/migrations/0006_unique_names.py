@@ -0,0 +1,82 @@
+# Generated by Django 5.1.15 on 2026-10-17 20:59
+
+import django.db.models.functions.text
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import Lower
+
+# frozen copy of apps.condo.duplicates.UNIQUE_NAMES
+UNIQUE_NAMES = {
+    "Block": ("condominium", "number_or_name"),
+    "Apartment": ("block", "number_or_name"),
+    "CommonArea": ("condominium", "name"),
+}
+
+
+def check_duplicates(apps, schema_editor):
+    """Fails with a readable list instead of an IntegrityError on duplicates"""
+    # frozen copy of apps.condo.duplicates.find_duplicates and describe
+    duplicates = []
+    for model_name, (scope, field) in UNIQUE_NAMES.items():
+        model = apps.get_model("condo", model_name)
+        groups = (
+            model.objects.annotate(lower_name=Lower(field))
+            .values(scope, "lower_name")
+            .annotate(total=Count("pk"), names=ArrayAgg(field), ids=ArrayAgg("pk"))
+            .filter(total__gt=1)
+            .order_by(scope, "lower_name")
+        )
+        duplicates.extend(
+            f"{model_name} {', '.join(repr(name) for name in group['names'])} "
+            f"in {scope} {group[scope]} "
+            f"(ids {', '.join(str(pk) for pk in group['ids'])})"
+            for group in groups
+        )
+    if duplicates:
+        raise RuntimeError(
+            "Names must be unique (case insensitive) before migrating, see "
+            "'manage.py report_duplicates':\n" + "\n".join(duplicates)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0005_apartment_sort_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name="block",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="apartment",
+            constraint=models.UniqueConstraint(
+                models.F("block"),
+                django.db.models.functions.text.Lower("number_or_name"),
+                name="condo_apartment_unique_name",
+                violation_error_message="Apartment number (or name) already exists in this block. Please, choose a different one.",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="block",
+            constraint=models.UniqueConstraint(
+                models.F("condominium"),
+                django.db.models.functions.text.Lower("number_or_name"),
+                name="condo_block_unique_name",
+                violation_error_message="Block number (or name) already exists in this condominium. Please, choose a different one.",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="commonarea",
+            constraint=models.UniqueConstraint(
+                models.F("condominium"),
+                django.db.models.functions.text.Lower("name"),
+                name="condo_commonarea_unique_name",
+                violation_error_message="Common Area name already exists in this condominium. Please, choose a different one.",
+            ),
+        ),
+    ]
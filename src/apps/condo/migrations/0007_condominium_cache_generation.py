@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-17 21:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0006_unique_names"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="condominium",
+            name="cache_generation",
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-17 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0007_condominium_cache_generation"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="block",
+            index=models.Index(
+                fields=["condominium", "number_or_name", "id"],
+                name="condo_block_keyset_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="commonarea",
+            index=models.Index(
+                fields=["condominium", "name", "id"], name="condo_commonarea_keyset_idx"
+            ),
+        ),
+    ]
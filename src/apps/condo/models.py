@@ -1,11 +1,19 @@
+import itertools
+import re
 import uuid
+from collections import Counter
 
 from brutils import format_cnpj, remove_symbols_cnpj
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest, Lower
+from django.db.models.lookups import Exact
 from django_countries.fields import CountryField
 
+from apps.condo import images
+
 
 # Base Class
 class DateLogsBaseModel(models.Model):
@@ -26,7 +34,121 @@ class DateLogsBaseModel(models.Model):
         abstract = True
 
 
-class Condominium(DateLogsBaseModel):
+def subquery_count(queryset, field: str):
+    """Number of rows of queryset pointing (through field) to the outer row"""
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(total=Count("pk", distinct=True))
+            .values("total")
+        ),
+        0,
+    )
+
+
+def same_name(field: str, name: str):
+    """
+    Case insensitive match of field and name, written as lower(field) =
+    lower(name) so the functional unique indexes of names are used (__iexact
+    compiles to UPPER() and does not use them).
+    """
+    return Exact(Lower(field), Lower(Value(name)))
+
+
+def is_unique_violation(error, constraint: str) -> bool:
+    """
+    Checks if an IntegrityError was raised by the unique constraint (SQLSTATE
+    23505) named constraint, i.e. a duplicate saved concurrently.
+    """
+    cause = error.__cause__
+    sqlstate = getattr(cause, "pgcode", None) or getattr(cause, "sqlstate", None)
+    name = getattr(getattr(cause, "diag", None), "constraint_name", None)
+    return sqlstate == "23505" and name == constraint
+
+
+class CounterQuerySet(models.QuerySet):
+    """
+    QuerySet of models holding denormalized counter columns. They are kept up
+    to date by the signals of this app (see signals.py); recount() repairs any
+    drift with one single UPDATE statement.
+
+    Subclasses must define get_counter_expressions(), returning the expression
+    computing each counter column, or their definition fails.
+    """
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not callable(getattr(cls, "get_counter_expressions", None)):
+            raise TypeError(f"{cls.__name__} must define get_counter_expressions()")
+
+    def recount(self, fields=None) -> int:
+        expressions = self.get_counter_expressions()
+        if fields is not None:
+            expressions = {field: expressions[field] for field in fields}
+        return self.update(**expressions)
+
+    def increment(self, field: str, delta: int = 1) -> int:
+        # never below zero, even if the counter drifted
+        return self.update(**{field: Greatest(F(field) + delta, 0)})
+
+
+class CounterFieldsMixin:
+    """
+    Plain saves of loaded instances must not write their (possibly stale)
+    counters over the ones maintained in the database.
+    """
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+
+class CoverMixin:
+    """
+    Models with a "cover" image field. Resized variants of the cover are built
+    after each upload (see images.py and signals.py).
+    """
+
+    def get_cover_url(self, size=None):
+        """Returns the URL of the cover image (in one of images.COVER_SIZES if
+        size is given), or None if there's no cover
+        """
+        if not self.cover or not hasattr(self.cover, "url"):
+            return None
+        if size is None:
+            return self.cover.url
+        return images.variant_url(self.cover, size)
+
+
+class CondominiumQuerySet(CounterQuerySet):
+    def with_setup_flags(self):
+        """Annotates every setup flag (see SetupProgress) as EXISTS subqueries"""
+        return self.annotate(**setup_flag_expressions(OuterRef("pk")))
+
+    def bump_cache_generation(self) -> int:
+        """Makes older cached fragments unreachable (see fragment_cache.py)"""
+        return self.update(cache_generation=F("cache_generation") + 1)
+
+    def get_counter_expressions(self) -> dict:
+        residents = get_user_model().objects.filter(groups__name="resident")
+        return {
+            "blocks_count": subquery_count(Block.objects.all(), "condominium"),
+            "apartments_count": subquery_count(Apartment.objects.all(), "condominium"),
+            "residents_count": subquery_count(residents, "condominium"),
+            "common_areas_count": subquery_count(
+                CommonArea.objects.all(), "condominium"
+            ),
+        }
+
+
+class Condominium(CoverMixin, CounterFieldsMixin, DateLogsBaseModel):
     name = models.CharField(max_length=120, blank=False, null=False, unique=False)
     cnpj = models.CharField(
         max_length=18,
@@ -43,28 +165,37 @@ class Condominium(DateLogsBaseModel):
     description = models.TextField(help_text="Write details about your condominium.")
     cover = models.ImageField(upload_to="condo_me/condominiums/%Y/%m/%d/", blank=True)
 
+    # denormalized counters (see signals.py and "manage.py recount")
+    blocks_count = models.PositiveIntegerField(default=0, editable=False)
+    apartments_count = models.PositiveIntegerField(default=0, editable=False)
+    residents_count = models.PositiveIntegerField(default=0, editable=False)
+    common_areas_count = models.PositiveIntegerField(default=0, editable=False)
+    # version of the cached template fragments (see fragment_cache.py)
+    cache_generation = models.PositiveBigIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = (
+        "blocks_count",
+        "apartments_count",
+        "residents_count",
+        "common_areas_count",
+        "cache_generation",
+    )
+    objects = CondominiumQuerySet.as_manager()
+
     def __str__(self) -> str:
         return self.name
 
-    def get_cover_url(self):
-        """Returns the URL of the cover image or a default image
-        if none exists
-        """
-        if self.cover and hasattr(self.cover, "url"):
-            return self.cover.url
-        return None
-
     def num_of_blocks(self) -> int:
-        return self.blocks.count()
+        return self.blocks_count
 
     def num_of_apartments(self) -> int:
-        apartments_qty = 0
-        for block in self.blocks.all():
-            apartments_qty += block.get_apartments_count()
-        return apartments_qty
+        return self.apartments_count
+
+    def num_of_residents(self) -> int:
+        return self.residents_count
 
     def has_common_areas(self) -> bool:
-        return CommonArea.objects.filter(condominium=self).exists()
+        return self.common_areas_count > 0
 
     def clean_cnpj(self):
         """
@@ -103,7 +234,44 @@ class Condominium(DateLogsBaseModel):
         app_label = "condo"
 
 
-class Block(DateLogsBaseModel):
+class CountedModel(DateLogsBaseModel):
+    """
+    Rows counted by the counter columns of their parents. Saving runs inside a
+    transaction, so the post_save counter updates commit (or roll back) with
+    the row itself. Deletions are already atomic.
+    """
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    class Meta:
+        abstract = True
+
+
+BLOCK_NAME_CONSTRAINT = "condo_block_unique_name"
+BLOCK_NAME_MESSAGE = (
+    "Block number (or name) already exists in this condominium. Please, choose "
+    "a different one."
+)
+APARTMENT_NAME_CONSTRAINT = "condo_apartment_unique_name"
+APARTMENT_NAME_MESSAGE = (
+    "Apartment number (or name) already exists in this block. Please, choose a "
+    "different one."
+)
+COMMON_AREA_NAME_CONSTRAINT = "condo_commonarea_unique_name"
+COMMON_AREA_NAME_MESSAGE = (
+    "Common Area name already exists in this condominium. Please, choose a "
+    "different one."
+)
+
+
+class BlockQuerySet(CounterQuerySet):
+    def get_counter_expressions(self) -> dict:
+        return {"apartments_count": subquery_count(Apartment.objects.all(), "block")}
+
+
+class Block(CoverMixin, CounterFieldsMixin, CountedModel):
     number_or_name = models.CharField(
         max_length=120,
         default="Main Block",
@@ -128,29 +296,108 @@ class Block(DateLogsBaseModel):
         verbose_name="Cover Image",
         help_text="Upload an image for this block",
     )
+    apartments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("apartments_count",)
+    objects = BlockQuerySet.as_manager()
 
     def __str__(self) -> str:
         return self.number_or_name
 
-    def get_cover_url(self):
-        """Returns the URL of the cover image or a default image
-        if none exists
-        """
-        if self.cover and hasattr(self.cover, "url"):
-            return self.cover.url
-        return None
-
     def get_apartments_count(self):
-        return self.apartments.count()
+        return self.apartments_count
 
     class Meta:
         app_label = "condo"
+        indexes = [
+            # keyset pagination of the setup block lists
+            models.Index(
+                fields=["condominium", "number_or_name", "id"],
+                name="condo_block_keyset_idx",
+            ),
+        ]
         # Lots of condominiums may have 'Block A', but a specific condominium may have
-        # only one. So:
-        unique_together = ["number_or_name", "condominium"]
+        # only one (whatever its case). So:
+        constraints = [
+            models.UniqueConstraint(
+                F("condominium"),
+                Lower("number_or_name"),
+                name=BLOCK_NAME_CONSTRAINT,
+                violation_error_message=BLOCK_NAME_MESSAGE,
+            ),
+        ]
+
 
+# longest number that always fits in a bigint
+SORT_NUMBER_MAX_DIGITS = 18
+# sort number of names without a leading number, greater than any other one
+# (not NULL: keyset pagination compares sort keys as row values)
+SORT_NUMBER_LAST = 10**SORT_NUMBER_MAX_DIGITS
+LEADING_NUMBER = re.compile(r"[0-9]+")
 
-class Apartment(DateLogsBaseModel):
+
+def natural_sort_key(number_or_name: str) -> tuple[int, str]:
+    """
+    Splits an apartment number in its leading number and the (lowercase)
+    rest, so that 2 < 10 < 10a < 10B < 101 < A1: apartments without a
+    leading number go last.
+    """
+    match = LEADING_NUMBER.match(number_or_name)
+    if match is None or len(match.group()) > SORT_NUMBER_MAX_DIGITS:
+        return SORT_NUMBER_LAST, number_or_name.lower()
+    return int(match.group()), number_or_name[match.end() :].lower()
+
+
+class ApartmentQuerySet(models.QuerySet):
+    def bulk_create(
+        self,
+        objs,
+        batch_size=None,
+        ignore_conflicts=False,
+        update_conflicts=False,
+        **kwargs,
+    ):
+        """
+        bulk_create() sends no signals and does not call save(), so sort keys
+        and the block and condominium counters are updated here, in the same
+        transaction as the insert.
+        """
+        objs = list(objs)
+        for apartment in objs:
+            apartment.set_sort_key()
+        with transaction.atomic(using=self.db):
+            objs = super().bulk_create(
+                objs,
+                batch_size=batch_size,
+                ignore_conflicts=ignore_conflicts,
+                update_conflicts=update_conflicts,
+                **kwargs,
+            )
+            block_ids = Counter(apartment.block_id for apartment in objs)
+            condominium_ids = Counter(apartment.condominium_id for apartment in objs)
+            if ignore_conflicts or update_conflicts:
+                # rows that already existed are unknown, so count them again
+                Block.objects.filter(pk__in=block_ids).recount()
+                Condominium.objects.filter(pk__in=condominium_ids).recount(
+                    ["apartments_count"]
+                )
+            else:
+                for block_id, total in block_ids.items():
+                    Block.objects.filter(pk=block_id).increment(
+                        "apartments_count", total
+                    )
+                for condominium_id, total in condominium_ids.items():
+                    Condominium.objects.filter(pk=condominium_id).increment(
+                        "apartments_count", total
+                    )
+            SetupProgress.objects.filter(condominium__in=condominium_ids).refresh(
+                ["has_apartments"]
+            )
+            Condominium.objects.filter(pk__in=condominium_ids).bump_cache_generation()
+        return objs
+
+
+class Apartment(CountedModel):
     number_or_name = models.CharField(max_length=20, verbose_name="Number (or name)")
     block = models.ForeignKey(
         to=Block, on_delete=models.CASCADE, related_name="apartments"
@@ -158,14 +405,47 @@ class Apartment(DateLogsBaseModel):
     condominium = models.ForeignKey(
         to=Condominium, on_delete=models.CASCADE, related_name="apartments"
     )
+    # natural sort key of number_or_name (see natural_sort_key), kept up to
+    # date by save() and bulk_create()
+    sort_number = models.BigIntegerField(editable=False)
+    sort_text = models.CharField(max_length=20, default="", editable=False)
+
+    objects = ApartmentQuerySet.as_manager()
 
     class Meta:
-        ordering = ["number_or_name", "block"]
+        # block_id only: Block has no default ordering, so there is no join
+        ordering = ["block", "sort_number", "sort_text"]
         app_label = "condo"
+        indexes = [
+            # apartments of a block are read already sorted from this index,
+            # and pages start right after the last row of the previous one
+            models.Index(
+                fields=["block", "sort_number", "sort_text", "id"],
+                name="condo_apartment_sort_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                F("block"),
+                Lower("number_or_name"),
+                name=APARTMENT_NAME_CONSTRAINT,
+                violation_error_message=APARTMENT_NAME_MESSAGE,
+            ),
+        ]
 
     def __str__(self) -> str:
         return f"{self.number_or_name}{self.block}"
 
+    def set_sort_key(self):
+        self.sort_number, self.sort_text = natural_sort_key(self.number_or_name)
+
+    def save(self, *args, **kwargs):
+        self.set_sort_key()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "number_or_name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "sort_number", "sort_text"}
+        super().save(*args, **kwargs)
+
     def num_of_residents(self):
         return self.residents.count()
 
@@ -177,7 +457,7 @@ class Apartment(DateLogsBaseModel):
         return ", ".join(names)
 
 
-class CommonArea(DateLogsBaseModel):
+class CommonArea(CoverMixin, CountedModel):
     MINIMUM_USING_MINUTES = [(30, "30"), (60, "60")]
 
     name = models.CharField(max_length=50, blank=False)
@@ -229,14 +509,6 @@ class CommonArea(DateLogsBaseModel):
     def __str__(self) -> str:
         return self.name
 
-    def get_cover_url(self):
-        """Returns the URL of the cover image or a default image
-        if none exists
-        """
-        if self.cover and hasattr(self.cover, "url"):
-            return self.cover.url
-        return None
-
     def calc_maximum_usage(self):
         if self.minimum_using_minutes and self.maximum_using_fraction:
             return self.minimum_using_minutes * self.maximum_using_fraction
@@ -273,6 +545,86 @@ class CommonArea(DateLogsBaseModel):
     class Meta:
         ordering = ["name"]
         app_label = "condo"
+        indexes = [
+            # keyset pagination of the setup common area list
+            models.Index(
+                fields=["condominium", "name", "id"],
+                name="condo_commonarea_keyset_idx",
+            ),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                F("condominium"),
+                Lower("name"),
+                name=COMMON_AREA_NAME_CONSTRAINT,
+                violation_error_message=COMMON_AREA_NAME_MESSAGE,
+            ),
+        ]
+
+
+SETUP_FLAGS = (
+    "has_condominium",
+    "has_blocks",
+    "has_apartments",
+    "has_residents",
+    "has_common_areas",
+)
+
+
+def setup_flag_expressions(condominium) -> dict:
+    """
+    EXISTS subqueries computing every setup flag of the condominium referenced
+    by "condominium" (an OuterRef), so all of them come in one SQL statement.
+    """
+    users = get_user_model().objects.filter(condominium=condominium)
+    return {
+        "has_condominium": Exists(users),
+        "has_blocks": Exists(Block.objects.filter(condominium=condominium)),
+        "has_apartments": Exists(Apartment.objects.filter(condominium=condominium)),
+        "has_residents": Exists(users.filter(groups__name="resident")),
+        "has_common_areas": Exists(CommonArea.objects.filter(condominium=condominium)),
+    }
+
+
+class SetupProgressQuerySet(models.QuerySet):
+    def refresh(self, fields=None) -> int:
+        """
+        Recomputes the flags (all of them, or only "fields") of every progress
+        in this queryset with one single UPDATE statement.
+        """
+        expressions = setup_flag_expressions(OuterRef("condominium"))
+        if fields is not None:
+            expressions = {field: expressions[field] for field in fields}
+        return self.update(**expressions)
+
+    def rebuild(self, condominiums=None, batch_size=500) -> int:
+        """
+        Bulk variant of SetupProgress.update_status(): reads the flags of many
+        condominiums (all by default) with one annotated SELECT and upserts
+        their progress rows in batches, creating the missing ones.
+        """
+        if condominiums is None:
+            condominiums = Condominium.objects.all()
+        rows = (
+            condominiums.with_setup_flags()
+            .order_by()
+            .values_list("pk", *SETUP_FLAGS)
+            .iterator(chunk_size=batch_size)
+        )
+        progresses = (
+            SetupProgress(condominium_id=pk, **dict(zip(SETUP_FLAGS, flags)))
+            for pk, *flags in rows
+        )
+        total = 0
+        while batch := list(itertools.islice(progresses, batch_size)):
+            self.bulk_create(
+                batch,
+                update_conflicts=True,
+                unique_fields=["condominium"],
+                update_fields=[*SETUP_FLAGS, "updated_at"],
+            )
+            total += len(batch)
+        return total
 
 
 class SetupProgress(DateLogsBaseModel):
@@ -281,6 +633,10 @@ class SetupProgress(DateLogsBaseModel):
     give reference to a manager user.
     Each step is represented by a boolean field indicating if that
     configuration has been completed.
+
+    Flags are refreshed by the signals of this app whenever a block, apartment,
+    common area or resident is created or deleted (see signals.py), so reading
+    the progress is a single row lookup.
     """
 
     condominium = models.OneToOneField(
@@ -292,6 +648,8 @@ class SetupProgress(DateLogsBaseModel):
     has_common_areas = models.BooleanField(default=False)
     has_residents = models.BooleanField(default=False)
 
+    objects = SetupProgressQuerySet.as_manager()
+
     @property
     def setup_percentage(self):
         """Calculates the completion percentage of the condominium setup"""
@@ -324,17 +682,16 @@ class SetupProgress(DateLogsBaseModel):
 
     def update_status(self):
         """
-        Updates the condominium setup status based on existing relatioships
+        Updates the condominium setup status based on existing relatioships.
+        Every flag is computed by one single SELECT (see
+        CondominiumQuerySet.with_setup_flags).
         """
-        self.has_condominium = (
-            get_user_model().objects.filter(condominium=self.condominium).exists()
-        )
-        self.has_blocks = self.condominium.blocks.exists()
-        self.has_apartments = any(
-            block.apartments.exists() for block in self.condominium.blocks.all()
+        flags = (
+            Condominium.objects.filter(pk=self.condominium_id)
+            .with_setup_flags()
+            .values(*SETUP_FLAGS)
+            .get()
         )
-        self.has_residents = self.condominium.condo_person.filter(
-            groups__name="resident"
-        ).exists()
-        self.has_common_areas = self.condominium.common_areas.exists()
+        for flag, value in flags.items():
+            setattr(self, flag, value)
         self.save()
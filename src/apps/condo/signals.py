@@ -0,0 +1,191 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_save,
+)
+from django.dispatch import receiver
+
+from apps.condo import tasks
+from apps.condo.fragment_cache import bump_generation
+from apps.condo.models import (
+    Apartment,
+    Block,
+    CommonArea,
+    Condominium,
+    SetupProgress,
+)
+
+User = get_user_model()
+
+
+def _increment(instance, relation: str, field: str, delta: int) -> None:
+    """
+    Adds delta to the counter "field" of the row instance.<relation> points to,
+    with an F() update. A related instance already loaded in memory (e.g. the
+    one passed to create()) is kept in sync as well.
+    """
+    descriptor = getattr(type(instance), relation)
+    descriptor.field.related_model.objects.filter(
+        pk=getattr(instance, f"{relation}_id")
+    ).increment(field, delta)
+    if descriptor.is_cached(instance):
+        related = getattr(instance, relation)
+        setattr(related, field, max(getattr(related, field) + delta, 0))
+
+
+def _refresh_progress(condominium_ids, *fields) -> None:
+    SetupProgress.objects.filter(condominium__in=condominium_ids).refresh(fields)
+
+
+def _recount_residents(*condominium_ids) -> None:
+    condominium_ids = {pk for pk in condominium_ids if pk is not None}
+    if condominium_ids:
+        Condominium.objects.filter(pk__in=condominium_ids).recount(["residents_count"])
+        _refresh_progress(condominium_ids, "has_condominium", "has_residents")
+
+
+@receiver(post_save, sender=Condominium)
+def create_setup_progress(sender, instance, created, **kwargs):
+    if created:
+        SetupProgress.objects.get_or_create(condominium=instance)
+
+
+@receiver(post_save, sender=Block)
+def count_created_block(sender, instance, created, **kwargs):
+    if created:
+        _increment(instance, "condominium", "blocks_count", 1)
+        _refresh_progress([instance.condominium_id], "has_blocks")
+
+
+@receiver(post_delete, sender=Block)
+def count_deleted_block(sender, instance, **kwargs):
+    _increment(instance, "condominium", "blocks_count", -1)
+    _refresh_progress([instance.condominium_id], "has_blocks")
+
+
+@receiver(post_save, sender=Apartment)
+def count_created_apartment(sender, instance, created, **kwargs):
+    if created:
+        _increment(instance, "block", "apartments_count", 1)
+        _increment(instance, "condominium", "apartments_count", 1)
+        _refresh_progress([instance.condominium_id], "has_apartments")
+
+
+@receiver(post_delete, sender=Apartment)
+def count_deleted_apartment(sender, instance, **kwargs):
+    _increment(instance, "block", "apartments_count", -1)
+    _increment(instance, "condominium", "apartments_count", -1)
+    _refresh_progress([instance.condominium_id], "has_apartments")
+
+
+@receiver(post_save, sender=CommonArea)
+def count_created_common_area(sender, instance, created, **kwargs):
+    if created:
+        _increment(instance, "condominium", "common_areas_count", 1)
+        _refresh_progress([instance.condominium_id], "has_common_areas")
+
+
+@receiver(post_delete, sender=CommonArea)
+def count_deleted_common_area(sender, instance, **kwargs):
+    _increment(instance, "condominium", "common_areas_count", -1)
+    _refresh_progress([instance.condominium_id], "has_common_areas")
+
+
+@receiver(post_save, sender=Condominium)
+@receiver(post_save, sender=Block)
+@receiver(post_save, sender=Apartment)
+@receiver(post_save, sender=CommonArea)
+@receiver(post_delete, sender=Block)
+@receiver(post_delete, sender=Apartment)
+@receiver(post_delete, sender=CommonArea)
+def invalidate_cached_fragments(sender, instance, **kwargs):
+    bump_generation(instance.pk if sender is Condominium else instance.condominium_id)
+
+
+@receiver(post_init, sender=Condominium)
+@receiver(post_init, sender=Block)
+@receiver(post_init, sender=CommonArea)
+@receiver(post_init, sender=User)
+def remember_cover(sender, instance, **kwargs):
+    # a name from the database, or a file given to the constructor (deferred
+    # covers are not in __dict__)
+    cover = instance.__dict__.get("cover")
+    instance._loaded_cover_name = getattr(cover, "name", cover)
+
+
+@receiver(post_save, sender=Condominium)
+@receiver(post_save, sender=Block)
+@receiver(post_save, sender=CommonArea)
+@receiver(post_save, sender=User)
+def build_cover_variants(sender, instance, update_fields=None, **kwargs):
+    """Resized variants are built for new covers only (see images.py)"""
+    if update_fields is not None and "cover" not in update_fields:
+        return
+    if "cover" not in instance.__dict__:
+        return
+    cover = instance.cover
+    if cover and cover.name != getattr(instance, "_loaded_cover_name", None):
+        tasks.build_cover_variants.delay(sender._meta.label_lower, cover.name)
+    instance._loaded_cover_name = cover.name
+
+
+@receiver(pre_save, sender=User)
+def remember_previous_condominium(sender, instance, update_fields=None, **kwargs):
+    """
+    Residents are counted per condominium, so moving a user between
+    condominiums changes two counters (and setup progresses). Saves not
+    touching the condominium (e.g. last_login updates) are skipped.
+    """
+    instance._previous_condominium_id = None
+    if instance._state.adding or (
+        update_fields is not None and "condominium" not in update_fields
+    ):
+        return
+    instance._previous_condominium_id = (
+        sender.objects.filter(pk=instance.pk).values_list("condominium", flat=True)
+    ).first()
+
+
+@receiver(post_save, sender=User)
+def recount_residents_on_user_save(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and "condominium" not in update_fields:
+        return
+    previous = getattr(instance, "_previous_condominium_id", None)
+    if previous != instance.condominium_id:
+        _recount_residents(previous, instance.condominium_id)
+
+
+@receiver(post_delete, sender=User)
+def recount_residents_on_user_delete(sender, instance, **kwargs):
+    _recount_residents(instance.condominium_id)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def recount_residents_on_group_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """
+    Residents are the users of the "resident" group, so adding or removing
+    groups changes the count of the condominium(s) of the affected users.
+    """
+    if action not in ("post_add", "post_remove", "pre_clear", "post_clear"):
+        return
+    if not reverse:
+        if action != "pre_clear":
+            _recount_residents(instance.condominium_id)
+        return
+
+    # group.user_set changes: users are known by pk_set, except on clear
+    if action == "pre_clear":
+        instance._cleared_condominium_ids = set(
+            instance.user_set.values_list("condominium", flat=True)
+        )
+    elif action == "post_clear":
+        _recount_residents(*getattr(instance, "_cleared_condominium_ids", ()))
+    else:
+        _recount_residents(
+            *User.objects.filter(pk__in=pk_set).values_list("condominium", flat=True)
+        )
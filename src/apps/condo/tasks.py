@@ -0,0 +1,11 @@
+from django.apps import apps
+
+from apps.condo import images
+from apps.tasks.queue import task
+
+
+@task(max_attempts=3)
+def build_cover_variants(model_label: str, name: str) -> None:
+    """Builds the resized variants of a cover of a model (i.e. "condo.block")"""
+    storage = apps.get_model(model_label)._meta.get_field("cover").storage
+    images.build_variants(storage, name)
@@ -0,0 +1,12 @@
+from django import template
+
+register = template.Library()
+
+
+@register.filter
+def cover_url(obj, size):
+    """
+    URL of a resized cover (see images.COVER_SIZES), since templates can't pass
+    arguments to get_cover_url: {{ block|cover_url:"thumb" }}
+    """
+    return obj.get_cover_url(size)
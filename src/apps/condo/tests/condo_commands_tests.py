@@ -0,0 +1,58 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+
+class WarmTemplatesCommandTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        (self.root / "pages").mkdir()
+        (self.root / "base.html").write_text(
+            "<main>{% block body %}{% endblock %}</main>"
+        )
+        (self.root / "pages" / "home.html").write_text(
+            '{% extends "base.html" %}{% block body %}Hi {{ name }}{% endblock %}'
+        )
+
+    def templates_settings(self):
+        loaders = [
+            (
+                "django.template.loaders.cached.Loader",
+                [
+                    "django.template.loaders.filesystem.Loader",
+                ],
+            )
+        ]
+        return [
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "DIRS": [self.root],
+                "OPTIONS": {"loaders": loaders},
+            }
+        ]
+
+    def test_compiles_templates_into_the_cached_loader(self):
+        with override_settings(TEMPLATES=self.templates_settings()):
+            out = StringIO()
+            call_command("warm_templates", root=self.root, render=True, stdout=out)
+
+            self.assertIn("2 templates compiled", out.getvalue())
+            self.assertIn("pages/home.html", out.getvalue())
+            cached_loader = engines["django"].engine.template_loaders[0]
+            self.assertEqual(
+                set(cached_loader.get_template_cache), {"base.html", "pages/home.html"}
+            )
+
+    def test_fails_on_template_syntax_error(self):
+        (self.root / "broken.html").write_text("{% if %}")
+        with (
+            override_settings(TEMPLATES=self.templates_settings()),
+            self.assertRaisesMessage(CommandError, "Template syntax error"),
+        ):
+            call_command("warm_templates", root=self.root, stdout=StringIO())
@@ -0,0 +1,97 @@
+import io
+import tempfile
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template import Context, Template
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from apps.condo import images, tasks
+from apps.condo.models import Block, Condominium
+
+
+def jpeg_upload(name="photo.jpg", size=(3000, 2000)):
+    content = io.BytesIO()
+    Image.new("RGB", size, "orange").save(content, format="JPEG")
+    return SimpleUploadedFile(name, content.getvalue(), content_type="image/jpeg")
+
+
+class CoverVariantsTest(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings_override = override_settings(
+            MEDIA_ROOT=media_root.name, TASKS_EAGER=True
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.condominium = Condominium.objects.create(
+            name="MyCondo",
+            description="Good Condo",
+            cnpj="15.306.944/0001-69",
+            address1="My Street, 10",
+            address2="Wonderland",
+            city="Soma City",
+            state="Wellness State",
+            country="BR",
+            postal_code="88456123",
+        )
+
+    def create_block(self, number_or_name="Fender", **kwargs):
+        return Block.objects.create(
+            number_or_name=number_or_name, condominium=self.condominium, **kwargs
+        )
+
+    def test_variants_are_built_after_upload(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            block = self.create_block(cover=jpeg_upload())
+            # not built yet: the original image is used meanwhile
+            self.assertEqual(block.get_cover_url("thumb"), block.get_cover_url())
+
+        self.assertTrue(block.get_cover_url().endswith("photo.jpg"))
+        self.assertTrue(block.get_cover_url("thumb").endswith("photo.thumb.webp"))
+        for size, (width, height) in images.COVER_SIZES.items():
+            name = images.variant_name(block.cover.name, size)
+            with block.cover.storage.open(name) as file, Image.open(file) as variant:
+                self.assertEqual(variant.format, "WEBP")
+                self.assertLessEqual(variant.width, width)
+                self.assertLessEqual(variant.height, height)
+
+    def test_saving_without_new_cover_does_not_rebuild_variants(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            block = self.create_block(cover=jpeg_upload())
+
+        with mock.patch.object(tasks.build_cover_variants, "delay") as delay:
+            block.number_or_name = "Gibson"
+            block.save()
+            Block.objects.get(pk=block.pk).save()
+            self.create_block(number_or_name="Ibanez")
+        delay.assert_not_called()
+
+    def test_cover_url_filter_and_missing_cover(self):
+        block = self.create_block()
+        self.assertIsNone(block.get_cover_url("thumb"))
+        with self.assertRaises(ValueError):
+            block.cover = "covers/photo.jpg"
+            block.get_cover_url("huge")
+
+        rendered = Template('{% load condo_images %}{{ block|cover_url:"thumb" }}')
+        self.assertEqual(
+            rendered.render(Context({"block": block})), "/media/covers/photo.jpg"
+        )
+
+    def test_build_cover_variants_command_processes_old_covers(self):
+        with mock.patch.object(tasks.build_cover_variants, "delay"):
+            block = self.create_block(cover=jpeg_upload())
+        self.assertFalse(block.get_cover_url("thumb").endswith(".webp"))
+
+        out = io.StringIO()
+        call_command("build_cover_variants", stdout=out)
+        self.assertIn("Variants built for 1 covers", out.getvalue())
+        self.assertTrue(block.get_cover_url("thumb").endswith(".webp"))
+
+        call_command("build_cover_variants", stdout=out)
+        self.assertIn("Variants built for 0 covers", out.getvalue())
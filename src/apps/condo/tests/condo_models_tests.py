@@ -1,8 +1,23 @@
+from io import StringIO
+
 from django.contrib.auth.models import Group
 from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import IntegrityError
 
 from apps.condo.forms import CondoSetupForm
-from apps.condo.models import Apartment, Block, Condominium
+from apps.condo.models import (
+    APARTMENT_NAME_CONSTRAINT,
+    BLOCK_NAME_CONSTRAINT,
+    SORT_NUMBER_LAST,
+    Apartment,
+    Block,
+    CommonArea,
+    Condominium,
+    CounterQuerySet,
+    SetupProgress,
+    is_unique_violation,
+)
 from apps.condo_people.tests.base_test_condo_people import CondoPeopleTestBase
 
 
@@ -53,6 +68,141 @@ class CondoModelsTest(CondoPeopleTestBase):
 
         self.assertEqual(self.first_condominium.num_of_apartments(), 1)
 
+    def test_counters_follow_create_delete_and_bulk_create(self):
+        block = Block.objects.create(
+            number_or_name="Fender", condominium=self.first_condominium
+        )
+        apartments = Apartment.objects.bulk_create(
+            Apartment(
+                number_or_name=str(n), block=block, condominium_id=block.condominium_id
+            )
+            for n in range(101, 105)
+        )
+        apartments[0].delete()
+
+        block.refresh_from_db()
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(block.get_apartments_count(), 3)
+        self.assertEqual(self.first_condominium.num_of_apartments(), 3)
+
+        block.delete()
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(self.first_condominium.num_of_blocks(), 0)
+        self.assertEqual(self.first_condominium.num_of_apartments(), 0)
+
+    def test_apartments_are_sorted_by_natural_sort_key(self):
+        block = Block.objects.create(
+            number_or_name="Fender", condominium=self.first_condominium
+        )
+        Apartment.objects.bulk_create(
+            Apartment(number_or_name=name, block=block, condominium=block.condominium)
+            for name in ("A1", "101", "10B", "2")
+        )
+        apartment = Apartment.objects.create(
+            number_or_name="9", block=block, condominium=self.first_condominium
+        )
+        apartment.number_or_name = "10a"
+        apartment.save(update_fields=["number_or_name"])
+
+        self.assertEqual(
+            list(block.apartments.values_list("number_or_name", flat=True)),
+            ["2", "10a", "10B", "101", "A1"],
+        )
+        self.assertEqual(
+            list(Apartment.objects.values_list("sort_number", "sort_text")),
+            [(2, ""), (10, "a"), (10, "b"), (101, ""), (SORT_NUMBER_LAST, "a1")],
+        )
+
+    def test_names_are_unique_whatever_their_case(self):
+        block = Block.objects.create(
+            number_or_name="Fender", condominium=self.first_condominium
+        )
+        Apartment.objects.create(
+            number_or_name="1A", block=block, condominium=self.first_condominium
+        )
+
+        with self.assertRaises(IntegrityError) as raised:
+            Block.objects.create(
+                number_or_name="FENDER", condominium=self.first_condominium
+            )
+        self.assertTrue(is_unique_violation(raised.exception, BLOCK_NAME_CONSTRAINT))
+
+        with self.assertRaises(IntegrityError) as raised:
+            Apartment.objects.create(
+                number_or_name="1a", block=block, condominium=self.first_condominium
+            )
+        self.assertTrue(
+            is_unique_violation(raised.exception, APARTMENT_NAME_CONSTRAINT)
+        )
+        self.assertFalse(is_unique_violation(raised.exception, BLOCK_NAME_CONSTRAINT))
+
+        output = StringIO()
+        call_command("report_duplicates", stdout=output)
+        self.assertIn("No duplicated names found.", output.getvalue())
+
+    def test_counters_are_not_overwritten_by_stale_instances(self):
+        stale_condominium = Condominium.objects.get(pk=self.first_condominium.pk)
+        Block.objects.create(
+            number_or_name="Fender", condominium=self.first_condominium
+        )
+        stale_condominium.name = "Renamed Condo"
+        stale_condominium.save()
+
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(self.first_condominium.name, "Renamed Condo")
+        self.assertEqual(self.first_condominium.num_of_blocks(), 1)
+
+    def test_cache_generation_is_bumped_in_database(self):
+        stale_condominium = Condominium.objects.get(pk=self.first_condominium.pk)
+        block = Block.objects.create(
+            number_or_name="Fender", condominium=self.first_condominium
+        )
+        Apartment.objects.bulk_create(
+            [
+                Apartment(
+                    number_or_name="101",
+                    block=block,
+                    condominium=self.first_condominium,
+                )
+            ]
+        )
+        generation = stale_condominium.cache_generation
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(self.first_condominium.cache_generation, generation + 2)
+
+        # a stale instance does not bring an older generation back
+        stale_condominium.save()
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(self.first_condominium.cache_generation, generation + 3)
+
+    def test_residents_count_follows_resident_group(self):
+        self.test_user.condominium = self.first_condominium
+        self.test_user.save()
+        self.test_user.groups.add(Group.objects.get(name="resident"))
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(self.first_condominium.num_of_residents(), 1)
+
+        self.test_user.groups.clear()
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(self.first_condominium.num_of_residents(), 0)
+
+    def test_recount_command_repairs_drifted_counters(self):
+        Block.objects.create(
+            number_or_name="Fender", condominium=self.first_condominium
+        )
+        Condominium.objects.update(blocks_count=42)
+
+        call_command("recount", stdout=StringIO())
+
+        self.first_condominium.refresh_from_db()
+        self.assertEqual(self.first_condominium.num_of_blocks(), 1)
+
+    def test_counter_querysets_must_define_their_expressions(self):
+        with self.assertRaisesMessage(TypeError, "get_counter_expressions"):
+
+            class IncompleteQuerySet(CounterQuerySet):
+                pass
+
     def test_condominium_cnpj_no_symbols(self):
         condominium = Condominium.objects.first()
         self.assertEqual(condominium.cnpj, "15.306.944/0001-69")
@@ -98,3 +248,50 @@ class CondoModelsTest(CondoPeopleTestBase):
             "This CNPJ is already used. Please, consider choosing a different one.",
             form.errors["cnpj"],
         )
+
+    def test_setup_progress_update_status_computes_flags_in_one_select(self):
+        Block.objects.create(
+            number_or_name="Fender", condominium=self.first_condominium
+        )
+        progress = SetupProgress.objects.get(condominium=self.first_condominium)
+        progress.has_blocks = False
+
+        # one SELECT for every flag, one UPDATE to store them
+        with self.assertNumQueries(2):
+            progress.update_status()
+        self.assertTrue(progress.has_blocks)
+        self.assertFalse(progress.has_apartments)
+
+    def test_setup_progress_rebuild_upserts_many_condominiums(self):
+        SetupProgress.objects.all().delete()
+        second_condominium = Condominium.objects.create(
+            name="OtherCondo",
+            description="Other Condo",
+            cnpj="11.222.333/0001-81",
+            address1="Other Street, 20",
+            address2="Wonderland",
+            city="Soma City",
+            state="Wellness State",
+            country="BR",
+            postal_code="88456123",
+        )
+        CommonArea.objects.create(
+            name="Pool",
+            condominium=second_condominium,
+            description="Shower first",
+            opens_at="08:00",
+            closes_at="20:00",
+            whole_day=True,
+            paid_area=False,
+        )
+        SetupProgress.objects.filter(condominium=second_condominium).update(
+            has_common_areas=False
+        )
+
+        self.assertEqual(SetupProgress.objects.rebuild(batch_size=1), 2)
+        self.assertEqual(SetupProgress.objects.count(), 2)
+        progresses = dict(
+            SetupProgress.objects.values_list("condominium", "has_common_areas")
+        )
+        self.assertTrue(progresses[second_condominium.pk])
+        self.assertFalse(progresses[self.first_condominium.pk])
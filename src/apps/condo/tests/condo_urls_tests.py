@@ -15,6 +15,10 @@ class CondoURLsTest(TestCase):
         common_areas_url = reverse("condo:common_areas")
         self.assertEqual(common_areas_url, "/condo/common_areas/")
 
+    def test_common_areas_calendar_url_is_correct(self):
+        calendar_url = reverse("condo:common_areas_calendar", args=(2025, 3))
+        self.assertEqual(calendar_url, "/condo/common_areas/calendar/2025/3/")
+
     def test_user_profile_settings_url_is_correct(self):
         user_prof_set_url = reverse("condo:user_profile_settings")
         self.assertEqual(user_prof_set_url, "/condo/user/profile/settings/")
@@ -3,12 +3,18 @@ Testing SETUP APARTMENT VIEWS
 """
 
 import uuid
+from unittest import mock
 
 from django.contrib.messages import get_messages
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from apps.condo import imports
 from apps.condo.models import Apartment, Block, Condominium
+from apps.condo.views.condo_setup_views import SetupApartmentsByBlockListView
 
 from .base_test_case import BaseTestCase
 
@@ -70,6 +76,34 @@ class SetupApartmentViewTest(BaseTestCase):
             ordered=False,
         )
 
+    def test_apartmentsbyblocklistview_paginates_in_natural_order(self):
+        Apartment.objects.bulk_create(
+            Apartment(
+                number_or_name=name,
+                block=self.block_one,
+                condominium=self.current_condominium,
+            )
+            for name in ("Store B", "2", "Store A", "1001")
+        )
+        url = reverse(
+            "condo:condo_setup_apartment_list_by_block",
+            kwargs={"block_id": self.block_one.pk},
+        )
+
+        pages = []
+        with mock.patch.object(SetupApartmentsByBlockListView, "page_size", 2):
+            while url:
+                response = self.client.get(url)
+                pages.append(
+                    [
+                        apto.number_or_name
+                        for apto in response.context["apartments_in_block"]
+                    ]
+                )
+                url = response.context["next_page_url"]
+
+        self.assertEqual(pages, [["2", "101"], ["1001", "Store A"], ["Store B"]])
+
     ######### SetupApartmentCreateView() #########
 
     def test_apartmentcreateview_raises_error_if_block_does_not_exist(self):
@@ -92,6 +126,29 @@ class SetupApartmentViewTest(BaseTestCase):
             response, reverse("condo:condo_setup_blocks_to_apartments")
         )
 
+    def test_apartmentcreateview_reads_block_once_per_request(self):
+        url = reverse(
+            "condo:condo_setup_apartment_create",
+            kwargs={"block_id": self.block_one.pk},
+        )
+
+        for method, data in (("get", {}), ("post", {"number_or_name": "102"})):
+            with CaptureQueriesContext(connection) as queries:
+                getattr(self.client, method)(url, data)
+            block_reads = [
+                query["sql"]
+                for query in queries.captured_queries
+                if query["sql"].startswith("SELECT")
+                and 'FROM "condo_block"' in query["sql"]
+            ]
+            self.assertEqual(len(block_reads), 1, method)
+
+        self.assertTrue(
+            Apartment.objects.filter(
+                block=self.block_one, number_or_name="102"
+            ).exists()
+        )
+
     def test_apartmentcreateview_success_url_returns_correct_url(self):
         # create another apartment
         form_data = {"number_or_name": "102"}
@@ -313,7 +370,7 @@ class SetupApartmentViewTest(BaseTestCase):
         self.assertIn("have been created", str(messages[0]))
 
         # verify session data is deleted
-        self.assertNotIn("apartments_to_create", self.client.session)
+        self.assertNotIn("apartments_to_generate", self.client.session)
 
         # verify created apartment number_or_name
         created_apartments = Apartment.objects.filter(
@@ -352,6 +409,72 @@ class SetupApartmentViewTest(BaseTestCase):
             ),
         )
 
+    def test_apartmentmultiplecreate_stores_form_data_in_session(self):
+        url = reverse(
+            "condo:condo_setup_apartment_multiple_create",
+            kwargs={"block_id": self.block_one.pk},
+        )
+        form_data = {
+            "first_floor": 10,  # apartment 101 already exists in db!
+            "last_floor": 11,
+            "apartments_per_floor": 2,
+        }
+
+        response = self.client.post(url, form_data)
+
+        self.assertEqual(self.client.session["apartments_to_generate"], form_data)
+        self.assertEqual(
+            response.context["apartments_to_create"], ["101", "102", "111", "112"]
+        )
+        self.assertEqual(response.context["existing_apartments"], {"101"})
+        self.assertContains(response, 'name="SkipExisting"')
+
+    def test_apartmentmultiplecreate_skips_existing_apartments(self):
+        url = reverse(
+            "condo:condo_setup_apartment_multiple_create",
+            kwargs={"block_id": self.block_one.pk},
+        )
+        form_data = {
+            "first_floor": 10,  # apartment 101 already exists in db!
+            "last_floor": 11,
+            "apartments_per_floor": 2,
+        }
+
+        self.client.post(url, form_data)
+        response = self.client.post(url, data={"SkipExisting": "SkipExisting"})
+
+        self.assertRedirects(
+            response,
+            reverse(
+                "condo:condo_setup_apartment_list_by_block",
+                kwargs={"block_id": self.block_one.pk},
+            ),
+        )
+        messages = [str(message) for message in get_messages(response.wsgi_request)]
+        self.assertEqual(
+            messages,
+            [
+                "Apartments 102, 111, 112 have been created successfully",
+                "Apartments 101 already existed and have been skipped",
+            ],
+        )
+        self.assertEqual(
+            Apartment.objects.filter(
+                block=self.block_one, number_or_name="101"
+            ).count(),
+            1,
+        )
+        self.assertEqual(
+            set(
+                Apartment.objects.filter(block=self.block_one).values_list(
+                    "number_or_name", flat=True
+                )
+            ),
+            {"101", "102", "111", "112"},
+        )
+        self.block_one.refresh_from_db()
+        self.assertEqual(self.block_one.apartments_count, 4)
+
     def test_apartmentmultiplecreate_raises_error_if_session_doesnt_exist(self):
         url = reverse(
             "condo:condo_setup_apartment_multiple_create",
@@ -526,3 +649,95 @@ class SetupApartmentViewTest(BaseTestCase):
             str(messages_list_2[0]),
             "The apartment you're trying to delete either doesn't exist or you don't have permission to delete it.",
         )
+
+
+class SetupApartmentImportViewTest(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.block_one = Block.objects.create(
+            number_or_name="Block One", condominium=self.current_condominium
+        )
+        Apartment.objects.create(
+            number_or_name="101",
+            block=self.block_one,
+            condominium=self.current_condominium,
+        )
+        self.url = reverse("condo:condo_setup_apartment_import")
+
+    def upload(self, content):
+        csv_file = SimpleUploadedFile("apartments.csv", content.encode(), "text/csv")
+        return self.client.post(self.url, {"csv_file": csv_file}, follow=True)
+
+    def test_creates_blocks_and_apartments_of_the_file_in_chunks(self):
+        with mock.patch.object(imports, "BATCH_SIZE", 2):
+            response = self.upload(
+                "block,apartment\n"
+                "block one,102\n"
+                "Block One,Penthouse\n"
+                "Tower B,1A\n"
+                "Tower B,1B\n"
+                "Garage,\n"
+            )
+
+        self.assertEqual(
+            str(list(get_messages(response.wsgi_request))[0]),
+            "2 blocks and 4 apartments have been created successfully.",
+        )
+        tower_b = Block.objects.get(number_or_name="Tower B")
+        self.assertEqual(
+            sorted(tower_b.apartments.values_list("number_or_name", flat=True)),
+            ["1A", "1B"],
+        )
+        self.assertTrue(Block.objects.filter(number_or_name="Garage").exists())
+        self.block_one.refresh_from_db()
+        self.assertEqual(self.block_one.apartments_count, 3)
+        self.current_condominium.refresh_from_db()
+        self.assertEqual(self.current_condominium.apartments_count, 5)
+
+    def test_nothing_is_created_if_any_line_is_invalid(self):
+        response = self.upload(
+            "block,apartment\n"
+            "Tower B,1A\n"
+            "Block One,101\n"
+            ",2A\n"
+            "Tower B,1a\n"
+            # blocks first seen after an error are validated, not created
+            "Tower C,1\n"
+            "tower c,1\n"
+        )
+
+        self.assertEqual(
+            response.context["csv_errors"],
+            [
+                "Line 3: apartment 101 of block Block One already exists in the "
+                "database.",
+                "Line 4: block is required.",
+                "Line 5: apartment 1a of block Tower B already exists on line 2.",
+                "Line 7: apartment 1 of block tower c already exists on line 6.",
+            ],
+        )
+        self.assertFalse(Block.objects.filter(number_or_name="Tower B").exists())
+        self.assertFalse(Block.objects.filter(number_or_name="Tower C").exists())
+        self.assertEqual(Apartment.objects.count(), 1)
+
+    def test_file_with_missing_columns_is_rejected(self):
+        response = self.upload("block,number\nTower B,1A\n")
+
+        self.assertEqual(
+            response.context["csv_errors"], ["Missing columns: apartment."]
+        )
+        self.assertEqual(Block.objects.count(), 1)
+
+    def test_only_first_errors_are_reported(self):
+        lines = "".join(f",{number}\n" for number in range(5))
+        with mock.patch.object(imports, "MAX_REPORTED_ERRORS", 2):
+            response = self.upload("block,apartment\n" + lines)
+
+        self.assertEqual(
+            response.context["csv_errors"],
+            [
+                "Line 2: block is required.",
+                "Line 3: block is required.",
+                "... and 3 more errors.",
+            ],
+        )
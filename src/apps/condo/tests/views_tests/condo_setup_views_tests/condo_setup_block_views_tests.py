@@ -3,11 +3,15 @@ Testing SETUP BLOCK VIEWS
 """
 
 import uuid
+from unittest import mock
 
 from django.contrib.messages import get_messages
+from django.core import signing
+from django.db.models import Q
 from django.urls import reverse
 
 from apps.condo.models import Block, Condominium
+from apps.condo.views.condo_setup_views import SetupBlockListView
 
 from .base_test_case import BaseTestCase
 
@@ -95,6 +99,23 @@ class SetupBlockViewsTest(BaseTestCase):
 
     ######### SetupBlockEditView() #########
 
+    def test_setupblockcreateview_reports_duplicate_created_concurrently(self):
+        # the name is taken after the lookup, so only the unique index sees it
+        with mock.patch(
+            "apps.condo.views.condo_setup_views.setup_block_views.same_name",
+            return_value=Q(pk__in=[]),
+        ):
+            response = self.client.post(
+                reverse("condo:condo_setup_block_create"),
+                {"number_or_name": "block one", "description": "Second Block"},
+            )
+
+        self.assertEqual(
+            response.context["form"].errors["number_or_name"][0],
+            "Block number (or name) already exists in this condominium. Please, choose a different one.",
+        )
+        self.assertEqual(Block.objects.count(), 1)
+
     def test_setupblockeditview_get_object_raises_error_when_invalid_uuid(self):
         # setUp already created one block, but let's create a random UUID
         block_id = uuid.uuid4()  # valid, but inexistent
@@ -166,13 +187,77 @@ class SetupBlockViewsTest(BaseTestCase):
         # get from block_list_view
         response = self.client.get(path=reverse("condo:condo_setup_block_list"))
 
-        queryset = response.context["block_list"].order_by("id")
+        # blocks of the first page, sorted by name
+        blocks = response.context["block_list"]
+
+        # check if there are two objects inside the page
+        self.assertEqual(len(blocks), 2)
+
+        expected_blocks = Block.objects.all().order_by("number_or_name")
+        self.assertQuerySetEqual(blocks, expected_blocks)
+
+    def test_setupblocklistview_paginates_by_keyset(self):
+        for name in ("Block Two", "Block Three"):
+            Block.objects.create(
+                number_or_name=name, condominium=self.current_condominium
+            )
+        url = reverse("condo:condo_setup_blocks_to_apartments")
+
+        with mock.patch.object(SetupBlockListView, "page_size", 1):
+            response = self.client.get(url)
+            names = [block.number_or_name for block in response.context["block_list"]]
+            self.assertEqual(names, ["Block One"])
+            next_page_url = response.context["next_page_url"]
+            self.assertContains(response, next_page_url.replace("&", "&amp;"))
+
+            # infinite scroll: rows of the next page only, rendered as HTML
+            page = self.client.get(f"{next_page_url}&format=json").json()
+            self.assertIn("Block Three", page["html"])
+            self.assertNotIn("Block One", page["html"])
+            # the link of the next page still leads to a regular page
+            self.assertNotIn("format", page["next"])
+
+            page = self.client.get(f"{page['next']}&format=json").json()
+            self.assertIn("Block Two", page["html"])
+            self.assertIsNone(page["next"])
+
+    def test_setupblocklistview_rejects_invalid_cursor(self):
+        response = self.client.get(
+            reverse("condo:condo_setup_block_list"), {"cursor": "forged"}
+        )
 
-        # check if there are two objects inside queryset
-        self.assertEqual(queryset.count(), 2)
+        self.assertEqual(response.status_code, 404)
 
-        expected_blocks = Block.objects.all().order_by("id")
-        self.assertQuerySetEqual(queryset, expected_blocks)
+    def test_cursors_are_only_accepted_by_their_own_list(self):
+        Block.objects.create(
+            number_or_name="Block Two", condominium=self.current_condominium
+        )
+        with mock.patch.object(SetupBlockListView, "page_size", 1):
+            response = self.client.get(reverse("condo:condo_setup_block_list"))
+        cursor = response.context["next_page_url"].split("cursor=")[1]
+
+        # a block list cursor (2 values) replayed on lists of other keysets
+        other_lists = [
+            reverse(
+                "condo:condo_setup_apartment_list_by_block",
+                kwargs={"block_id": Block.objects.get(number_or_name="Block One").pk},
+            ),
+            reverse("condo:condo_setup_common_area_list"),
+        ]
+        for url in other_lists:
+            with self.subTest(url=url):
+                response = self.client.get(f"{url}?cursor={cursor}")
+                self.assertEqual(response.status_code, 404)
+
+        # signed by the list itself, but with the wrong number or type of values
+        view = SetupBlockListView()
+        for values in (["Block One"], ["Block One", "not-a-uuid"], "Block One"):
+            with self.subTest(values=values):
+                forged = signing.dumps(values, salt=view.get_cursor_salt())
+                response = self.client.get(
+                    reverse("condo:condo_setup_block_list"), {"cursor": forged}
+                )
+                self.assertEqual(response.status_code, 404)
 
 
 class SetupBlockDeleteViewTest(BaseTestCase):
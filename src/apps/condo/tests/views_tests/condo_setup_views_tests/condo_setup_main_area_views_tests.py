@@ -5,8 +5,12 @@ The first page rendered when user gets inside "Condominium Setup"
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from apps.condo.models import Apartment, Block, SetupProgress
+
 from .base_test_case import BaseTestCase
 
 
@@ -39,3 +43,42 @@ class SetupAreaViewsTest(BaseTestCase):
         # create a request
         response = self.client.get(reverse("condo:condo_setup_home"))
         self.assertNotIn("condo_page", response.context)
+
+    def test_setup_progress_follows_model_events(self):
+        block = Block.objects.create(
+            number_or_name="A", condominium=self.current_condominium
+        )
+        Apartment.objects.create(
+            number_or_name="101", block=block, condominium=self.current_condominium
+        )
+        progress = SetupProgress.objects.get(condominium=self.current_condominium)
+        self.assertTrue(progress.has_condominium)
+        self.assertTrue(progress.has_blocks)
+        self.assertTrue(progress.has_apartments)
+        self.assertFalse(progress.has_common_areas)
+
+        block.delete()
+        progress.refresh_from_db()
+        self.assertFalse(progress.has_blocks)
+        self.assertFalse(progress.has_apartments)
+
+    def test_setup_home_does_not_write_to_database(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse("condo:condo_setup_home"))
+        self.assertEqual(response.context["setup_percentage"], 20)
+        statements = [query["sql"].split()[0] for query in context.captured_queries]
+        self.assertNotIn("UPDATE", statements)
+        self.assertNotIn("INSERT", statements)
+
+    def test_cached_side_header_is_refreshed_when_condominium_changes(self):
+        apartments_link = (
+            f'<a href="{reverse("condo:condo_setup_blocks_to_apartments")}" '
+            'class="nav-link">'
+        )
+        response = self.client.get(reverse("condo:condo_setup_home"))
+        self.assertNotContains(response, apartments_link)
+
+        # the block bumps the generation stored in the condominium
+        Block.objects.create(number_or_name="A", condominium=self.current_condominium)
+        response = self.client.get(reverse("condo:condo_setup_home"))
+        self.assertContains(response, apartments_link)
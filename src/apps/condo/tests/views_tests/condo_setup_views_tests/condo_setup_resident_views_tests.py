@@ -0,0 +1,184 @@
+"""
+Testing SETUP RESIDENT VIEWS
+"""
+
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.messages import get_messages
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.condo.models import Apartment, Block
+from apps.purchase import invitations, tasks
+from apps.purchase.models import RegistrationToken
+from apps.tasks.models import Job
+
+from .base_test_case import BaseTestCase
+
+HEADER = "first_name,last_name,email,block,apartment\n"
+
+
+class SetupResidentInviteViewTest(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.block = Block.objects.create(
+            number_or_name="Block A", condominium=self.current_condominium
+        )
+        self.apartments = [
+            Apartment.objects.create(
+                number_or_name=number,
+                block=self.block,
+                condominium=self.current_condominium,
+            )
+            for number in ("101", "102", "103")
+        ]
+        self.url = reverse("condo:condo_setup_resident_invite")
+
+    def upload(self, lines, **extra):
+        csv_file = SimpleUploadedFile(
+            "residents.csv", (HEADER + "".join(lines)).encode(), "text/csv"
+        )
+        return self.client.post(self.url, {"csv_file": csv_file}, follow=True, **extra)
+
+    def test_invites_every_resident_of_the_file(self):
+        with mock.patch.object(invitations, "EMAILS_PER_JOB", 2):
+            response = self.upload(
+                [
+                    "Ann,Lee,ann@lee.com,Block A,101\n",
+                    "Bob,Ray,BOB@ray.com,block a,102\n",
+                    "Cid,Roe,cid@roe.com,Block A,103\n",
+                ]
+            )
+
+        messages = list(get_messages(response.wsgi_request))
+        self.assertEqual(
+            str(messages[0]),
+            "3 residents invited. They will receive their registration links by "
+            "e-mail shortly.",
+        )
+        tokens = RegistrationToken.objects.order_by("register_email")
+        self.assertEqual(
+            [
+                (token.register_email, token.register_apartment.number_or_name)
+                for token in tokens
+            ],
+            [("ann@lee.com", "101"), ("bob@ray.com", "102"), ("cid@roe.com", "103")],
+        )
+        self.assertEqual({token.register_group.name for token in tokens}, {"resident"})
+        self.assertEqual(
+            Job.objects.filter(name=tasks.send_invitations.name).count(), 2
+        )
+
+    def test_invitation_emails_share_one_smtp_connection(self):
+        self.upload(["Ann,Lee,ann@lee.com,Block A,101\n", "Bob,Ray,bob@ray.com,A,9\n"])
+        self.upload(
+            ["Ann,Lee,ann@lee.com,Block A,101\n", "Bob,Ray,bob@ray.com,Block A,102\n"]
+        )
+        token_ids = list(RegistrationToken.objects.values_list("pk", flat=True))
+
+        with mock.patch.object(
+            tasks, "get_connection", wraps=tasks.get_connection
+        ) as get_connection:
+            tasks.send_invitations(token_ids, "http://testserver/")
+
+        get_connection.assert_called_once()
+        self.assertCountEqual(
+            [email.to for email in mail.outbox], [["ann@lee.com"], ["bob@ray.com"]]
+        )
+        self.assertIn("/condo_people/register/", mail.outbox[0].body)
+
+    @override_settings(ALLOWED_HOSTS=["condo.example.com"])
+    def test_registration_links_point_to_the_site_of_the_manager(self):
+        self.upload(
+            ["Ann,Lee,ann@lee.com,Block A,101\n"],
+            HTTP_HOST="condo.example.com",
+            secure=True,
+        )
+        job = Job.objects.get(name=tasks.send_invitations.name)
+        tasks.send_invitations(*job.args, **job.kwargs)
+
+        token = RegistrationToken.objects.get()
+        self.assertIn(
+            f"https://condo.example.com/condo_people/register/{token.token}",
+            mail.outbox[0].body,
+        )
+
+    def test_nobody_is_invited_if_any_line_is_invalid(self):
+        get_user_model().objects.create_user(
+            username="dan", email="dan@kim.com", password="P@ssw0rd"
+        )
+        response = self.upload(
+            [
+                "Ann,Lee,ann@lee.com,Block A,101\n",
+                "Bob,Ray,not-an-email,Block A,102\n",
+                "Cid,Roe,ANN@lee.com,Block A,103\n",
+                "Eve,Fox,eve@fox.com,Block B,101\n",
+                "Dan,Kim,Dan@Kim.com,Block A,103\n",
+            ]
+        )
+
+        self.assertFalse(RegistrationToken.objects.exists())
+        self.assertEqual(
+            response.context["csv_errors"],
+            [
+                "Line 3: Enter a valid email address.",
+                "Line 4: ann@lee.com is already invited on line 2.",
+                "Line 5: apartment 101 of block Block B does not exist.",
+                "Line 6: dan@kim.com is already registered.",
+            ],
+        )
+
+    def test_residents_with_a_pending_invitation_are_not_invited_again(self):
+        self.upload(["Ann,Lee,ann@lee.com,Block A,101\n"])
+        RegistrationToken.objects.update(expires_at=timezone.now())
+        self.upload(["Ann,Lee,ann@lee.com,Block A,101\n"])
+        self.assertEqual(RegistrationToken.objects.count(), 2)
+
+        response = self.upload(
+            [
+                "Ann,Lee,ANN@lee.com,Block A,101\n",
+                "Bob,Ray,bob@ray.com,Block A,102\n",
+            ]
+        )
+
+        self.assertEqual(RegistrationToken.objects.count(), 2)
+        self.assertEqual(
+            response.context["csv_errors"],
+            ["Line 2: ann@lee.com was already invited and has not registered yet."],
+        )
+
+    def test_file_with_missing_columns_is_rejected(self):
+        csv_file = SimpleUploadedFile("residents.csv", b"name,email\nAnn,ann@lee.com\n")
+        response = self.client.post(self.url, {"csv_file": csv_file})
+        self.assertEqual(
+            response.context["csv_errors"],
+            ["Missing columns: apartment, block, first_name, last_name."],
+        )
+
+    def test_invited_resident_joins_apartment_on_registration(self):
+        self.upload(["Ann,Lee,ann@lee.com,Block A,101\n"])
+        self.client.logout()
+        session = self.client.session
+        session["token"] = RegistrationToken.objects.get().token
+        session.save()
+
+        self.client.post(
+            reverse("condo_people:register_create"),
+            {
+                "first_name": "Ann",
+                "last_name": "Lee",
+                "email": "ann@lee.com",
+                "username": "annlee",
+                "password1": "BetweenTheBars",
+                "password2": "BetweenTheBars",
+            },
+        )
+
+        resident = get_user_model().objects.get(username="annlee")
+        self.assertEqual(resident.apartment, self.apartments[0])
+        self.assertEqual(resident.condominium, self.current_condominium)
+        self.assertTrue(resident.in_group("resident"))
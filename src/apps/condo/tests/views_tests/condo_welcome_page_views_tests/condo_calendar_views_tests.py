@@ -0,0 +1,91 @@
+from datetime import date, time
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.reservation.models import CommonAreaSlot
+from apps.reservation.tests.base_test_reservation import ReservationTestBase
+
+
+class CommonAreasCalendarViewTest(ReservationTestBase):
+    grill_closes_at = time(20, 0)
+
+    def setUp(self) -> None:
+        super().setUp()
+        get_user_model().objects.create_user(
+            first_name="John",
+            last_name="Doe",
+            email="johndoe@dummy.com",
+            username="johndoe",
+            password="P@ssw0rd",
+            condominium=self.condominium,
+        )
+        self.client.login(username="johndoe", password="P@ssw0rd")
+        self.party_room = self.create_party_room()
+        self.url = reverse("condo:common_areas_calendar", args=(2025, 3))
+
+    def test_calendar_returns_daily_occupancy_of_every_common_area(self):
+        self.reserve(time(10, 0), time(12, 0), day=date(2025, 3, 10))
+        self.reserve(time(14, 0), time(17, 0), day=date(2025, 3, 10))
+        self.reserve(None, None, self.party_room, date(2025, 3, 15))
+        # another month, must not be reported
+        self.reserve(time(10, 0), time(11, 0), day=date(2025, 4, 1))
+
+        data = self.client.get(self.url).json()
+        grill, party_room = data["common_areas"]
+
+        self.assertEqual(data["last_day"], "2025-03-31")
+        self.assertEqual(
+            grill["days"],
+            {
+                "2025-03-10": {
+                    "booked_minutes": 300,
+                    "occupancy": 0.5,
+                }
+            },
+        )
+        self.assertEqual(party_room["days"]["2025-03-15"]["occupancy"], 1)
+
+    def test_calendar_query_count_does_not_depend_on_areas_or_days(self):
+        for day in range(1, 29):
+            self.reserve(None, None, self.party_room, date(2025, 3, day))
+        self.client.get(self.url)  # warm up session and user
+        # session, user, etag (2 aggregates), common areas and the GROUP BY of
+        # slots and of reservations
+        with self.assertNumQueries(7):
+            self.client.get(self.url)
+
+    def test_calendar_reads_the_booked_counters_of_the_slot_grid(self):
+        today = timezone.localdate()
+        url = reverse("condo:common_areas_calendar", args=(today.year, today.month))
+        self.reserve(time(10, 0), time(12, 0), day=today)
+        self.assertEqual(
+            self.client.get(url).json()["common_areas"][0]["days"],
+            {today.isoformat(): {"booked_minutes": 120, "occupancy": 0.2}},
+        )
+
+        call_command("build_slot_grid", days=1, stdout=StringIO())
+        # counters are the source of the days of the grid
+        CommonAreaSlot.objects.filter(
+            common_area=self.grill, starts_at=time(12, 0)
+        ).update(booked=1)
+        self.assertEqual(
+            self.client.get(url).json()["common_areas"][0]["days"],
+            {today.isoformat(): {"booked_minutes": 180, "occupancy": 0.3}},
+        )
+
+    def test_calendar_answers_not_modified_until_a_reservation_changes(self):
+        etag = self.client.get(self.url)["ETag"]
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.reserve(time(10, 0), time(12, 0), day=date(2025, 3, 10))
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_calendar_raises_404_for_invalid_month(self):
+        url = reverse("condo:common_areas_calendar", args=(2025, 13))
+        self.assertEqual(self.client.get(url).status_code, 404)
@@ -14,6 +14,11 @@ urlpatterns = [
         name="user_profile_settings",
     ),
     path("common_areas/", condo_base_views.common_areas, name="common_areas"),
+    path(
+        "common_areas/calendar/<int:year>/<int:month>/",
+        condo_base_views.common_areas_calendar,
+        name="common_areas_calendar",
+    ),
     # CONDO SETUP (only 'manager' group users have access to condo setup)
     path(
         "condo-setup/home/",
@@ -70,6 +75,11 @@ urlpatterns = [
         condo_setup_views.setup_apartment_views.SetupApartmentMultipleCreateView.as_view(),
         name="condo_setup_apartment_multiple_create",
     ),
+    path(
+        "condo-setup/apartments/import/",
+        condo_setup_views.setup_apartment_views.SetupApartmentImportView.as_view(),
+        name="condo_setup_apartment_import",
+    ),
     path(
         "condo-setup/apartments/<uuid:apartment_id>/edit/",
         condo_setup_views.setup_apartment_views.SetupApartmentEditView.as_view(),
@@ -101,4 +111,10 @@ urlpatterns = [
         condo_setup_views.setup_common_area_views.SetupCommonAreaDeleteView.as_view(),
         name="condo_setup_common_area_delete",
     ),
+    ########### RESIDENT ###########
+    path(
+        "condo-setup/residents/invite/",
+        condo_setup_views.setup_resident_views.SetupResidentInviteView.as_view(),
+        name="condo_setup_resident_invite",
+    ),
 ]
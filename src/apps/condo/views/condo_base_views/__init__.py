@@ -1,2 +1,8 @@
 # flake8: noqa
-from .condo_base_views import common_areas, condominium, home, user_profile_settings
+from .condo_base_views import (
+    common_areas,
+    common_areas_calendar,
+    condominium,
+    home,
+    user_profile_settings,
+)
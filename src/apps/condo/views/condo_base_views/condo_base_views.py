@@ -1,5 +1,15 @@
+import calendar
+from datetime import date
+
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Exists, F, Max, OuterRef, Q, Sum
+from django.http import Http404, JsonResponse
 from django.shortcuts import render
+from django.views.decorators.http import condition
+
+from apps.condo.models import CommonArea
+from apps.reservation import availability
+from apps.reservation.models import CommonAreaSlot, Reservation
 
 
 @login_required(redirect_field_name="redirect_to", login_url="/condo_people/login")
@@ -30,6 +40,145 @@ def common_areas(request):
     return render(request, "condo/pages/home_pages/common_areas.html")
 
 
+def _month_bounds(year, month):
+    """Returns the first and last dates of a month, 404 if it does not exist"""
+    if not 1 <= month <= 12 or not date.min.year <= year <= date.max.year:
+        raise Http404("Invalid month.")
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _month_reservations(request, year, month):
+    first_day, last_day = _month_bounds(year, month)
+    return Reservation.objects.filter(
+        condominium=request.user.condominium_id, date__range=(first_day, last_day)
+    )
+
+
+def _common_areas(request):
+    return CommonArea.objects.filter(condominium=request.user.condominium_id)
+
+
+def _common_areas_calendar_etag(request, year, month):
+    """
+    Reservations are the only data of the month changing often, so the ETag is
+    built from their count (deletions) and latest update. Common area changes
+    are covered by their own latest update.
+    """
+    if not request.user.is_authenticated or not request.user.condominium_id:
+        return None
+    reservations = _month_reservations(request, year, month).aggregate(
+        total=Count("pk"), last_update=Max("updated_at")
+    )
+    areas_update = _common_areas(request).aggregate(last_update=Max("updated_at"))[
+        "last_update"
+    ]
+    return "-".join(
+        str(value)
+        for value in (
+            request.user.condominium_id,
+            year,
+            month,
+            reservations["total"],
+            reservations["last_update"] and reservations["last_update"].timestamp(),
+            areas_update and areas_update.timestamp(),
+        )
+    )
+
+
+def _opening_minutes(area) -> int:
+    opens_at, closes_at = availability.reservation_bounds(area.opens_at, area.closes_at)
+    return max(closes_at - opens_at, 1)
+
+
+def _booked_minutes(area, booked_time) -> int:
+    """Booked minutes of a day from the sum of booked durations (None = whole day)"""
+    if area.whole_day or booked_time is None:
+        return _opening_minutes(area)
+    return int(booked_time.total_seconds() // 60)
+
+
+@login_required(redirect_field_name="redirect_to", login_url="/condo_people/login")
+@condition(etag_func=_common_areas_calendar_etag)
+def common_areas_calendar(request, year, month):
+    """
+    Month calendar of the condominium common areas as JSON, days without
+    reservations omitted. Days of the slot grid (see CommonAreaSlot) are read
+    from the booked counters of their slots with one "GROUP BY common_area,
+    date" range scan; the other days (past ones, beyond the grid window or of
+    areas created since the grid was built) are aggregated from reservations
+    with a second one.
+    """
+    first_day, last_day = _month_bounds(year, month)
+    common_areas = {}
+    if request.user.condominium_id:
+        common_areas = {
+            area.pk: area for area in _common_areas(request).order_by("name")
+        }
+
+    booked = {}
+    slot_rows = (
+        CommonAreaSlot.objects.filter(
+            common_area__in=list(common_areas), date__range=(first_day, last_day)
+        )
+        .order_by()
+        .values("common_area", "date")
+        .annotate(
+            booked_time=Sum(F("ends_at") - F("starts_at"), filter=Q(booked__gt=0))
+        )
+        .filter(booked_time__isnull=False)
+    )
+    for row in slot_rows:
+        area = common_areas[row["common_area"]]
+        booked[area.pk, row["date"]] = _booked_minutes(area, row["booked_time"])
+
+    reservation_rows = (
+        _month_reservations(request, year, month)
+        .exclude(
+            Exists(
+                CommonAreaSlot.objects.filter(
+                    common_area=OuterRef("common_area"), date=OuterRef("date")
+                )
+            )
+        )
+        .order_by()
+        .values("common_area", "date")
+        .annotate(booked_time=Sum(F("end_time") - F("start_time")))
+    )
+    for row in reservation_rows:
+        area = common_areas.get(row["common_area"])
+        if area is not None:
+            booked[area.pk, row["date"]] = _booked_minutes(area, row["booked_time"])
+
+    occupancy = {pk: {} for pk in common_areas}
+    for (area_pk, day), booked_minutes in sorted(booked.items()):
+        opening_minutes = _opening_minutes(common_areas[area_pk])
+        occupancy[area_pk][day.isoformat()] = {
+            "booked_minutes": booked_minutes,
+            # shared reservations may overlap, so never report more than 100%
+            "occupancy": round(min(booked_minutes / opening_minutes, 1), 2),
+        }
+
+    return JsonResponse(
+        {
+            "year": year,
+            "month": month,
+            "first_day": first_day.isoformat(),
+            "last_day": last_day.isoformat(),
+            "common_areas": [
+                {
+                    "id": str(area.pk),
+                    "name": area.name,
+                    "whole_day": area.whole_day,
+                    "opens_at": area.opens_at.strftime("%H:%M"),
+                    "closes_at": area.closes_at.strftime("%H:%M"),
+                    "days": occupancy[area.pk],
+                }
+                for area in common_areas.values()
+            ],
+        }
+    )
+
+
 @login_required(redirect_field_name="redirect_to", login_url="/condo_people/login")
 def user_profile_settings(request):
     return render(request, "condo/pages/home_pages/user_profile.html")
@@ -1,5 +1,7 @@
 # flake8: noqa
 from .base import (
+    KeysetPaginationMixin,
+    ScopedObjectMixin,
     SetupAreaView,
     SetupProgressMixin,
     SetupViewsWithDecors,
@@ -9,6 +11,7 @@ from .setup_apartment_views import (
     SetupApartmentCreateView,
     SetupApartmentDeleteView,
     SetupApartmentEditView,
+    SetupApartmentImportView,
     SetupApartmentMultipleCreateView,
     SetupApartmentsByBlockListView,
 )
@@ -20,3 +23,4 @@ from .setup_block_views import (
 )
 from .setup_common_area_views import SetupCommonAreaCreateView, SetupCommonAreaListView
 from .setup_condominium_views import SetupCondominiumView
+from .setup_resident_views import SetupResidentInviteView
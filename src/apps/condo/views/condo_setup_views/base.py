@@ -1,7 +1,15 @@
+import uuid
+
 from apps.condo.models import SetupProgress
+from django.contrib import messages
 from django.contrib.auth.decorators import login_required, user_passes_test
-from django.core.exceptions import PermissionDenied
-from django.shortcuts import render
+from django.core import signing
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db.models import Field, Func, Value
+from django.db.models.lookups import GreaterThan
+from django.http import Http404, JsonResponse
+from django.shortcuts import redirect, render
+from django.template.loader import render_to_string
 from django.utils.decorators import method_decorator
 from django.views import View
 
@@ -14,7 +22,8 @@ def manager_group_required(view_func):
     """
 
     def check_group(user):
-        if user.groups.filter(name="manager").exists():
+        # group names are loaded once per request (see User.group_names)
+        if user.is_authenticated and user.in_group("manager"):
             return True
         raise PermissionDenied("You do not have the required permissions")
 
@@ -46,23 +55,164 @@ class SetupViewsWithDecors(View):
         return super().dispatch(request, *args, **kwargs)
 
 
+class ScopedObjectMixin:
+    """
+    Resolves the block, apartment or common area addressed by the URL once
+    per request, in dispatch: one query, limited to the user's condominium and
+    joined with select_related. The row is kept in self.scoped_object (and
+    returned by get_object() in detail views), so the rest of the request
+    reads it without querying it again. When it does not exist, the user is
+    redirected to scoped_missing_url with scoped_missing_message.
+
+    Must come after SetupViewsWithDecors, so users are authenticated first.
+    """
+
+    scoped_model = None
+    scoped_url_kwarg = None
+    scoped_related = ("condominium",)
+    scoped_missing_message = ""
+    scoped_missing_url = "condo:condo_setup_home"
+
+    def dispatch(self, request, *args, **kwargs):
+        self.scoped_object = (
+            self.scoped_model.objects.filter(condominium=request.user.condominium)
+            .select_related(*self.scoped_related)
+            .filter(pk=kwargs.get(self.scoped_url_kwarg))
+            .first()
+        )
+        if self.scoped_object is None:
+            messages.error(request, self.scoped_missing_message)
+            return redirect(self.scoped_missing_url)
+        return super().dispatch(request, *args, **kwargs)
+
+    def get_object(self, queryset=None):
+        return self.scoped_object
+
+
+def get_setup_progress(condominium):
+    """
+    Returns the setup progress of condominium. Progress is kept up to date by
+    model events, so this is a single row lookup; only condominiums created
+    before progress tracking get their row built here, once.
+    """
+    setup_progress = SetupProgress.objects.filter(condominium=condominium).first()
+    if setup_progress is None:
+        setup_progress, _ = SetupProgress.objects.get_or_create(condominium=condominium)
+        setup_progress.update_status()
+    return setup_progress
+
+
 class SetupProgressMixin:
     """
-    Mixin to easily access and update condominium setup progress in views
+    Mixin to easily access condominium setup progress in views. Progress is
+    updated by model events (see apps/condo/signals.py), not by views.
     """
 
     def get_setup_progress(self):
-        if not hasattr(self.request.user, "condominium"):
+        if not getattr(self.request.user, "condominium", None):
             return None
+        return get_setup_progress(self.request.user.condominium)
+
+
+class Row(Func):
+    """SQL row value "(a, b, ...)", compared column by column"""
 
-        return SetupProgress.objects.get_or_create(
-            condominium=self.request.user.condominium
-        )[0]
+    template = "(%(expressions)s)"
+    output_field = Field()
 
-    def update_setup_progress(self):
-        setup_progress = self.get_setup_progress()
-        if setup_progress is not None:
-            setup_progress.update_status()
+
+def keyset_after(model, fields, values) -> GreaterThan:
+    """
+    Condition selecting the rows that come after "values" when sorted by
+    "fields" in ascending order. It is a single row value comparison, (a, b,
+    id) > (x, y, z), which PostgreSQL uses as the start of an index range scan
+    when an index ends with these fields. Fields must not be NULL and the last
+    one must be unique.
+    """
+    return GreaterThan(
+        Row(*fields),
+        Row(
+            *(
+                Value(value, output_field=model._meta.get_field(field))
+                for field, value in zip(fields, values)
+            )
+        ),
+    )
+
+
+class KeysetPaginationMixin:
+    """
+    Paginates a ListView by keyset instead of OFFSET: the next page starts
+    after the last row shown, so each page is one index scan whatever its
+    position. Pages are linked by an opaque "cursor" query parameter and
+    ?format=json returns the rows of a page rendered by rows_template, with
+    the URL of the next one (used by global/js/infinite_scroll.js).
+    """
+
+    page_size = 48
+    # not NULL sort fields of the queryset, ending with a unique one; an index
+    # on the filtered fields followed by them keeps every page one range scan
+    keyset = ("id",)
+    rows_template = None
+    cursor_salt = "condo.setup.keyset"
+
+    def get_keyset_page(self, queryset) -> tuple[list, str | None]:
+        """Returns the rows of the requested page and the cursor of the next one"""
+        queryset = queryset.order_by(*self.keyset)
+        cursor = self.request.GET.get("cursor")
+        if cursor:
+            values = self.read_cursor(queryset.model, cursor)
+            queryset = queryset.filter(
+                keyset_after(queryset.model, self.keyset, values)
+            )
+        rows = list(queryset[: self.page_size + 1])
+        if len(rows) <= self.page_size:
+            return rows, None
+        rows = rows[: self.page_size]
+        values = [getattr(rows[-1], field) for field in self.keyset]
+        values = [
+            str(value) if isinstance(value, uuid.UUID) else value for value in values
+        ]
+        return rows, signing.dumps(values, salt=self.get_cursor_salt())
+
+    def get_cursor_salt(self) -> str:
+        # cursors of a list are only accepted by the same list and keyset
+        return f"{self.cursor_salt}:{type(self).__name__}:{','.join(self.keyset)}"
+
+    def read_cursor(self, model, cursor) -> list:
+        """Keyset values of a cursor; Http404 if it was not made by this view"""
+        try:
+            values = signing.loads(cursor, salt=self.get_cursor_salt())
+            if not isinstance(values, list) or len(values) != len(self.keyset):
+                raise ValueError("Wrong number of keyset values.")
+            return [
+                model._meta.get_field(field).to_python(value)
+                for field, value in zip(self.keyset, values)
+            ]
+        except (signing.BadSignature, TypeError, ValueError, ValidationError):
+            raise Http404("Invalid page.")
+
+    def get_context_data(self, **kwargs):
+        rows, next_cursor = self.get_keyset_page(self.object_list)
+        context = super().get_context_data(object_list=rows, **kwargs)
+        next_page_url = None
+        if next_cursor:
+            params = self.request.GET.copy()
+            # the JSON variant is only asked for by infinite_scroll.js
+            params.pop("format", None)
+            params["cursor"] = next_cursor
+            next_page_url = f"{self.request.path}?{params.urlencode()}"
+        context["next_page_url"] = next_page_url
+        return context
+
+    def get_rows_template(self):
+        return self.rows_template
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.request.GET.get("format") == "json":
+            html = render_to_string(self.get_rows_template(), context, self.request)
+            return JsonResponse({"html": html, "next": context["next_page_url"]})
+        return super().render_to_response(context, **response_kwargs)
 
 
 class SetupAreaView(SetupViewsWithDecors):
@@ -92,11 +242,8 @@ class SetupAreaView(SetupViewsWithDecors):
                 }
             )
         else:
-            # first, we get or create the "SetupProgress" object
-            setup_progress, true_or_false = SetupProgress.objects.get_or_create(
-                condominium=request.user.condominium
-            )
-            setup_progress.update_status()
+            # read-only: progress is kept up to date by model events
+            setup_progress = get_setup_progress(condominium)
             # then we add context variables to be sent to template
             context.update(
                 {
@@ -104,9 +251,9 @@ class SetupAreaView(SetupViewsWithDecors):
                     "condo_cover": (
                         condominium.cover.name if condominium.cover else None
                     ),  # condominium cover url
-                    "block_exists": condominium.blocks.exists(),
-                    "apartment_exists": condominium.apartments.exists(),
-                    "common_area_exists": condominium.common_areas.exists(),
+                    "block_exists": condominium.num_of_blocks() > 0,
+                    "apartment_exists": condominium.num_of_apartments() > 0,
+                    "common_area_exists": condominium.has_common_areas(),
                     "setup_percentage": setup_progress.setup_percentage,
                     "next_step": setup_progress.next_step,
                     "is_setup_complete": setup_progress.setup_percentage == 100,
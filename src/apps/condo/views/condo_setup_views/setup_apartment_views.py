@@ -1,18 +1,34 @@
 from django.contrib import messages
-from django.db.models import Case, IntegerField, Value, When
-from django.db.models.functions import Cast
+from django.db import IntegrityError, transaction
 from django.http import HttpResponseRedirect
-from django.shortcuts import get_object_or_404, redirect, render
+from django.shortcuts import redirect, render
 from django.urls import reverse
-from django.views.generic import CreateView, DeleteView, ListView, UpdateView
-
-from apps.condo.forms import ApartmentMultipleSetupForm, ApartmentSetupForm
-from apps.condo.models import Apartment, Block
-
-from .base import SetupProgressMixin, SetupViewsWithDecors
-
-
-class SetupApartmentCreateView(SetupViewsWithDecors, CreateView):
+from django.views.generic import CreateView, DeleteView, ListView, UpdateView, View
+
+from apps.condo.forms import (
+    ApartmentImportForm,
+    ApartmentMultipleSetupForm,
+    ApartmentSetupForm,
+)
+from apps.condo.imports import import_apartments
+from apps.condo.models import (
+    APARTMENT_NAME_CONSTRAINT,
+    APARTMENT_NAME_MESSAGE,
+    Apartment,
+    Block,
+    is_unique_violation,
+    same_name,
+)
+
+from .base import (
+    KeysetPaginationMixin,
+    ScopedObjectMixin,
+    SetupProgressMixin,
+    SetupViewsWithDecors,
+)
+
+
+class SetupApartmentCreateView(SetupViewsWithDecors, ScopedObjectMixin, CreateView):
     """
     A view for creating new apartments within a specific block during condo setup.
     This view handles the creation of individual apartments within a condominium block.
@@ -26,7 +42,8 @@ class SetupApartmentCreateView(SetupViewsWithDecors, CreateView):
         pk_url_kwarg (str): URL parameter name for the apartment ID
         template_name (str): Path to the template for apartment creation
     Methods:
-        dispatch: Validates block existence before proceeding with the request
+        dispatch: Validates condominium existence before proceeding with the request
+            (the block is resolved once by ScopedObjectMixin)
         get_context_data: Adds the current block to the template context
         get_success_url: Returns the URL to redirect after successful creation
         get_form_kwargs: Provides condominium and block context to the form
@@ -39,35 +56,26 @@ class SetupApartmentCreateView(SetupViewsWithDecors, CreateView):
     http_method_names = ["get", "post"]
     pk_url_kwarg = "apartment_id"
     template_name = "condo/pages/setup_pages/apartment/condo_setup_apartments_create_one_by_one.html"
+    scoped_model = Block
+    scoped_url_kwarg = "block_id"
+    scoped_missing_message = (
+        "You are trying to create apartments in a block that does not exist"
+    )
+    scoped_missing_url = "condo:condo_setup_blocks_to_apartments"
 
     def dispatch(self, request, *args, **kwargs):
-        # first, let's check if condominium exists
+        # first, let's check if condominium exists (the block is checked next)
         if not request.user.condominium:
             messages.error(
                 request,
                 "In order to create apartments, you must create a condominium first.",
             )
             return redirect(reverse("condo:condo_setup_condominium"))
-
-        # now, let's check if block exists
-        block_id = self.kwargs.get("block_id")
-        block_queryset = Block.objects.filter(
-            condominium=self.request.user.condominium, pk=block_id
-        )
-        if not block_queryset.exists():
-            messages.error(
-                request,
-                "You are trying to create apartments in a block that does not exist",
-            )
-            return redirect(reverse("condo:condo_setup_blocks_to_apartments"))
         return super().dispatch(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        current_block = Block.objects.get(
-            condominium=self.request.user.condominium, pk=self.kwargs.get("block_id")
-        )
-        context["current_block"] = current_block
+        context["current_block"] = self.scoped_object
         return context
 
     def get_success_url(self) -> str:
@@ -79,26 +87,26 @@ class SetupApartmentCreateView(SetupViewsWithDecors, CreateView):
     def get_form_kwargs(self) -> dict:
         form_kwargs = super().get_form_kwargs()
         form_kwargs["condominium"] = self.request.user.condominium
-        form_kwargs["block"] = Block.objects.get(
-            condominium=self.request.user.condominium, pk=self.kwargs.get("block_id")
-        )
+        form_kwargs["block"] = self.scoped_object
         return form_kwargs
 
     def form_valid(self, form):
         self.object = form.save(commit=False)
-        block = get_object_or_404(
-            Block,
-            condominium=self.request.user.condominium,
-            pk=self.kwargs.get("block_id"),
-        )
         self.object.condominium = self.request.user.condominium
-        self.object.block = block
-        self.object.save()
+        self.object.block = self.scoped_object
+        try:
+            self.object.save()
+        except IntegrityError as error:
+            # the same number was saved concurrently, after the form checked it
+            if not is_unique_violation(error, APARTMENT_NAME_CONSTRAINT):
+                raise
+            form.add_error("number_or_name", APARTMENT_NAME_MESSAGE)
+            return self.form_invalid(form)
         messages.success(self.request, "Apartment has been created successfully.")
         return HttpResponseRedirect(self.get_success_url())
 
 
-class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
+class SetupApartmentMultipleCreateView(SetupViewsWithDecors, ScopedObjectMixin, View):
     """
     View for setting up and creating multiple apartments at once within a block.
     This view handles the workflow for bulk creating apartments, including:
@@ -109,7 +117,8 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
     The view verifies prerequisites such as:
     - Existence of a condominium
     - Existence of the specified block
-    - Prevention of duplicate apartment numbers
+    - Prevention of duplicate apartment numbers: the whole operation is canceled
+      on "Confirm", existing apartments are left out on "SkipExisting"
     Flow:
     - GET: Displays the initial form for apartment generation parameters
     - POST: Processes the form and either shows confirmation or creates apartments
@@ -117,13 +126,23 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
     URL parameters:
         block_id: ID of the block where apartments will be created
     Session data:
-        apartments_to_create: List of apartment numbers generated for confirmation
+        apartments_to_generate: form data (floors and apartments per floor) the
+        apartment numbers are generated from again on confirmation
     """
 
     form_template = (
         "condo/pages/setup_pages/apartment/condo_setup_apartments_create_multiple.html"
     )
     confirmation_template = "condo/pages/setup_pages/apartment/condo_setup_apartments_confirm_create_multiple.html"
+    scoped_model = Block
+    scoped_url_kwarg = "block_id"
+    scoped_missing_message = (
+        "You are trying to create apartments in a block that does not exist"
+    )
+    scoped_missing_url = "condo:condo_setup_blocks_to_apartments"
+    session_key = "apartments_to_generate"
+    # apartments inserted by each INSERT statement
+    batch_size = 500
 
     def dispatch(self, request, *args, **kwargs):
         """
@@ -131,6 +150,7 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
         This method performs the following validations before proceeding:
         1. Checks if the user has a condominium associated with their account
         2. Verifies if the specified block exists within the user's condominium
+           (ScopedObjectMixin loads it once, as self.scoped_object)
         Parameters:
             request (HttpRequest): The HTTP request
             *args: Variable length argument list
@@ -147,17 +167,6 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
                 "In order to create apartments, you must create a condominium first.",
             )
             return redirect(reverse("condo:condo_setup_condominium"))
-
-        # verify if block exists
-        block_id = self.kwargs.get("block_id")
-        if not Block.objects.filter(
-            condominium=request.user.condominium, pk=block_id
-        ).exists():
-            messages.error(
-                request,
-                "You are trying to create apartments in a block that does not exist",
-            )
-            return redirect(reverse("condo:condo_setup_blocks_to_apartments"))
         return super().dispatch(request, *args, **kwargs)
 
     def get(self, request, *args, **kwargs):
@@ -176,10 +185,7 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
         form = ApartmentMultipleSetupForm()
         context = {
             "form": form,
-            "current_block": Block.objects.get(
-                condominium=self.request.user.condominium,
-                pk=self.kwargs.get("block_id"),
-            ),
+            "current_block": self.scoped_object,
         }
         return render(request, self.form_template, context=context)
 
@@ -197,7 +203,7 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
                          initial form processing response
         """
         # verify if last confirmation step
-        if "Confirm" in request.POST:
+        if "Confirm" in request.POST or "SkipExisting" in request.POST:
             return self._bulk_create(request)
         else:
             # process initial form
@@ -208,8 +214,8 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
         Process the initial form submission for setting up multiple apartments.
         This method validates the form data from the request. If the form is not valid,
         it re-renders the form template with error messages. If valid, it generates
-        apartment numbers based on the form data, stores them in the session, and
-        renders a confirmation template.
+        apartment numbers based on the form data, stores the form data in the
+        session, and renders a confirmation template listing the apartments.
         Parameters:
         ----------
         request : HttpRequest
@@ -228,10 +234,7 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
                 self.form_template,
                 {
                     "form": form,
-                    "current_block": Block.objects.get(
-                        condominium=request.user.condominium,
-                        pk=self.kwargs.get("block_id"),
-                    ),
+                    "current_block": self.scoped_object,
                 },
             )
 
@@ -239,18 +242,18 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
         form_data = form.cleaned_data
 
         # apply logic to create multiple apartments
-        apartments_to_create = self._generate_apt_numbers(form_data)
+        apartments_to_create = list(self._generate_apt_numbers(form_data))
 
-        # save created items in session in order to be used on confirmation step
-        request.session["apartments_to_create"] = apartments_to_create
+        # save the form data (not the apartments, which can be thousands) in
+        # session in order to be used on confirmation step
+        request.session[self.session_key] = form_data
 
         # generate context to be sent to confirmation template
         context = {
-            "current_block": Block.objects.get(
-                condominium=self.request.user.condominium,
-                pk=self.kwargs.get("block_id"),
-            ),
+            "current_block": self.scoped_object,
             "total_created_apartments": str(len(apartments_to_create)),
+            "apartments_to_create": apartments_to_create,
+            "existing_apartments": self._existing_apt_numbers(apartments_to_create),
         }
         return render(request, self.confirmation_template, context=context)
 
@@ -265,115 +268,179 @@ class SetupApartmentMultipleCreateView(SetupViewsWithDecors):
                 - first_floor (int): The starting floor number
                 - last_floor (int): The ending floor number (inclusive)
                 - apartments_per_floor (int): Number of apartments on each floor
-        Returns:
-            list: A list of strings representing apartment numbers
+        Yields:
+            str: The apartment numbers, floor by floor
         """
 
         first_floor = form_data["first_floor"]
         last_floor = form_data["last_floor"]
         apartments_per_floor = form_data["apartments_per_floor"]
 
-        apartments_to_create = []
-
-        floors = list(range(first_floor, last_floor + 1))
-
-        for floor in floors:
+        for floor in range(first_floor, last_floor + 1):
             for n in range(apartments_per_floor):
-                apartments_to_create.append(str(floor * 10 + (n + 1)))
-        return apartments_to_create
+                yield str(floor * 10 + (n + 1))
+
+    def _existing_apt_numbers(self, apartments_to_create):
+        """
+        Returns the set of apartment numbers of apartments_to_create that already
+        exist in the current block, with a single query on the names only.
+        """
+        return set(
+            Apartment.objects.filter(
+                block=self.scoped_object, number_or_name__in=apartments_to_create
+            ).values_list("number_or_name", flat=True)
+        )
 
     def _bulk_create(self, request):
         """
-        Bulk creates multiple Apartment objects using data stored in the session.
-        This method extracts apartment data from the session, checks for potential duplicates,
-        and creates multiple apartments in a single database operation if validation passes.
+        Bulk creates multiple Apartment objects from the form data stored in the session.
+        The apartment numbers are generated again, the existing ones are looked up
+        with a single query and the new apartments are inserted in batches, in one
+        transaction.
         Args:
-            request: The HTTP request object containing session data with apartments to create
+            request: The HTTP request object containing session data with the form data
         Returns:
             HttpResponseRedirect: Redirects to either the apartment list view on success or
             back to the creation form on failure
         Process:
-            1. Retrieves apartment names/numbers from session
+            1. Generates apartment names/numbers from the form data in session
             2. Checks for existing apartments with the same names in the same block
-            3. If duplicates exist, cancels the operation and shows error message
+            3. If duplicates exist, cancels the operation and shows error message,
+               unless "SkipExisting" was submitted: then only the new ones are created
             4. Otherwise, creates all apartments in bulk and redirects to list view
             5. Shows appropriate messages indicating success or failure
         """
-        apartments_to_create = request.session.get("apartments_to_create")
-        if apartments_to_create:
-            # check if apartments_to_create already exists in db
-            existing_apartments = [
-                apartment.number_or_name
-                for apartment in Apartment.objects.filter(
-                    condominium=request.user.condominium,
-                    block__id=self.kwargs.get("block_id"),
-                )
-            ]
-            duplicated_apartments = []
-            for apto in apartments_to_create:
-                if apto in existing_apartments:
-                    duplicated_apartments.append(apto)
-            if duplicated_apartments:
-                current_block = Block.objects.get(
-                    condominium=request.user.condominium, pk=self.kwargs.get("block_id")
-                )
-                messages.error(
-                    request,
-                    f"The whole operation was canceled because the following apartments already exist in {current_block.number_or_name}: {', '.join(duplicated_apartments)}. Please, consider creating manually (one by one) the apartments of this floor.",
-                )
-                return redirect(
-                    reverse(
-                        "condo:condo_setup_apartment_multiple_create",
-                        kwargs={"block_id": self.kwargs.get("block_id")},
-                    )
-                )
+        form_data = request.session.get(self.session_key)
+        if not form_data:
+            messages.error(
+                request,
+                "Please, fill in the blanks in order to create multiple apartments",
+            )
+            return redirect(
+                "condo:condo_setup_apartment_multiple_create",
+                block_id=self.kwargs.get("block_id"),
+            )
 
-            # get block
-            block = Block.objects.get(
-                condominium=request.user.condominium,
-                pk=self.kwargs.get("block_id"),
+        block = self.scoped_object
+        skip_existing = "SkipExisting" in request.POST
+        apartments_to_create = list(self._generate_apt_numbers(form_data))
+        existing_apartments = self._existing_apt_numbers(apartments_to_create)
+        duplicated_apartments = [
+            apto for apto in apartments_to_create if apto in existing_apartments
+        ]
+        if duplicated_apartments and not skip_existing:
+            messages.error(
+                request,
+                f"The whole operation was canceled because the following apartments already exist in {block.number_or_name}: {', '.join(duplicated_apartments)}. Please, consider creating manually (one by one) the apartments of this floor.",
             )
-            # prepare list of apartment objects to be bulk created
-            apartment_objects = [
-                Apartment(
-                    condominium=request.user.condominium,
-                    block=block,
-                    number_or_name=num_or_name,
+            return redirect(
+                "condo:condo_setup_apartment_multiple_create", block_id=block.id
+            )
+
+        new_apartments = [
+            apto for apto in apartments_to_create if apto not in existing_apartments
+        ]
+        try:
+            with transaction.atomic():
+                # apartments created meanwhile by someone else are also skipped
+                Apartment.objects.bulk_create(
+                    (
+                        Apartment(
+                            condominium=request.user.condominium,
+                            block=block,
+                            number_or_name=num_or_name,
+                        )
+                        for num_or_name in new_apartments
+                    ),
+                    batch_size=self.batch_size,
+                    ignore_conflicts=skip_existing,
                 )
-                for num_or_name in apartments_to_create
-            ]
-            # bulk_create objects in a single SQL operation
-            Apartment.objects.bulk_create(apartment_objects)
+        except IntegrityError as error:
+            if not is_unique_violation(error, APARTMENT_NAME_CONSTRAINT):
+                raise
+            messages.error(
+                request,
+                f"The whole operation was canceled because some of these apartments were just created in {block.number_or_name}. Please, try again.",
+            )
+            return redirect(
+                "condo:condo_setup_apartment_multiple_create", block_id=block.id
+            )
 
-            # delete session
-            del request.session["apartments_to_create"]
+        # delete session
+        del request.session[self.session_key]
 
+        if new_apartments:
             messages.success(
                 request,
-                f"Apartments {', '.join(str(apt) for apt in apartments_to_create)} have been created successfully",
+                f"Apartments {', '.join(new_apartments)} have been created successfully",
             )
-            return redirect(
-                "condo:condo_setup_apartment_list_by_block", block_id=block.id
+        if duplicated_apartments:
+            messages.info(
+                request,
+                f"Apartments {', '.join(duplicated_apartments)} already existed and have been skipped",
             )
+        return redirect("condo:condo_setup_apartment_list_by_block", block_id=block.id)
+
+
+class SetupApartmentImportView(SetupViewsWithDecors):
+    """
+    Creates the blocks and apartments listed in a CSV file (see
+    apps/condo/imports.py), for buildings whose numbering does not fit the
+    floor generator of SetupApartmentMultipleCreateView. If any line is
+    invalid, nothing is created and the errors of every line are shown.
+    """
+
+    template_name = (
+        "condo/pages/setup_pages/apartment/condo_setup_apartments_import.html"
+    )
+
+    def get(self, request, *args, **kwargs):
+        if not request.user.condominium:
+            return self._condominium_required(request)
+        return render(request, self.template_name, {"form": ApartmentImportForm()})
+
+    def post(self, request, *args, **kwargs):
+        condominium = request.user.condominium
+        if not condominium:
+            return self._condominium_required(request)
+
+        form = ApartmentImportForm(request.POST, request.FILES)
+        errors = []
+        if form.is_valid():
+            result = import_apartments(form.cleaned_data["csv_file"], condominium)
+            errors = result.errors
+            if result.hidden_errors:
+                errors.append(f"... and {result.hidden_errors} more errors.")
+            if not errors:
+                messages.success(
+                    request,
+                    f"{result.blocks_created} blocks and "
+                    f"{result.apartments_created} apartments have been created "
+                    "successfully.",
+                )
+                return redirect(reverse("condo:condo_setup_blocks_to_apartments"))
+
+        return render(request, self.template_name, {"form": form, "csv_errors": errors})
 
+    def _condominium_required(self, request):
         messages.error(
-            request, "Please, fill in the blanks in order to create multiple apartments"
-        )
-        return redirect(
-            reverse(
-                "condo:condo_setup_apartment_multiple_create",
-                kwargs={"block_id": self.kwargs.get("block_id")},
-            )
+            request,
+            "In order to create apartments, you must create a condominium first.",
         )
+        return redirect(reverse("condo:condo_setup_condominium"))
 
 
-class SetupApartmentsByBlockListView(SetupViewsWithDecors, ListView):
+class SetupApartmentsByBlockListView(
+    SetupViewsWithDecors, ScopedObjectMixin, KeysetPaginationMixin, ListView
+):
     """
     List view for displaying and managing apartments within a specific block during condominium setup.
     This view allows users to manage apartments for a selected block in their condominium.
     It provides the list of existing apartments and context for creating new ones.
     Inherits from:
         SetupViewsWithDecors: Base class for setup views with decorators
+        ScopedObjectMixin: Loads the requested block of user's condominium once
+        KeysetPaginationMixin: Paginates apartments by their sort key
         ListView: Django generic list view
     Attributes:
         model (Model): Apartment model
@@ -381,9 +448,6 @@ class SetupApartmentsByBlockListView(SetupViewsWithDecors, ListView):
         template_name (str): Path to template for rendering the view
         context_object_name (str): Name of the context variable to store apartments list
     Methods:
-        dispatch(request, *args, **kwargs):
-            Validates if the requested block exists and belongs to user's condominium.
-            Returns: HTTP response (redirect or super dispatch)
         get_queryset():
             Filters apartments by condominium and block.
             Returns: QuerySet of Apartment objects
@@ -398,84 +462,38 @@ class SetupApartmentsByBlockListView(SetupViewsWithDecors, ListView):
         "condo/pages/setup_pages/apartment/condo_setup_apartments_by_block.html"
     )
     context_object_name = "apartments_in_block"
-
-    def dispatch(self, request, *args, **kwargs):
-        """
-        Override dispatch method to validate block access before proceeding.
-        This method checks if the requested block exists and belongs to the user's condominium.
-        If validation fails, redirects user back to block setup page with error message.
-        Args:
-            request: The HTTP request object
-            *args: Variable length argument list
-            **kwargs: Arbitrary keyword arguments. Must contain 'block_id'
-        Returns:
-            HttpResponseRedirect: Redirects to block setup page if validation fails
-            super().dispatch: Proceeds with normal dispatch if validation passes
-        Raises:
-            None
-        """
-
-        block_id = kwargs.get("block_id")
-        if not Block.objects.filter(
-            condominium=request.user.condominium, pk=block_id
-        ).exists():
-            messages.error(
-                self.request,
-                "The requested block does not exist or does not belong to your condominium.",
-            )
-            return redirect(reverse("condo:condo_setup_blocks_to_apartments"))
-        return super().dispatch(request, *args, **kwargs)
+    page_size = 100
+    keyset = ("sort_number", "sort_text", "id")
+    rows_template = (
+        "condo/partials/setup_pages/apartment/condo_setup_apartment_rows.html"
+    )
+    scoped_model = Block
+    scoped_url_kwarg = "block_id"
+    scoped_missing_message = (
+        "The requested block does not exist or does not belong to your condominium."
+    )
+    scoped_missing_url = "condo:condo_setup_blocks_to_apartments"
 
     def get_queryset(self):
-        block_id = self.kwargs.get("block_id")
-        # return apartments in order (lowest to higher)
-        return (
-            Apartment.objects.filter(
-                condominium=self.request.user.condominium,
-                # Apartment has "block" attribute. Django creates "block_id" automatically
-                block_id=block_id,
-            ).annotate(
-                # 0 for numeric values, 1 for non numeric (group numbers first)
-                is_numeric=Case(
-                    When(number_or_name__regex=r"^\d+$", then=Value(0)),
-                    default=Value(1),
-                    output_field=IntegerField(),
-                ),
-                # convert num to int, uses 0 when text
-                numeric_val=Case(
-                    When(
-                        number_or_name__regex=r"^\d+$",
-                        then=Cast("number_or_name", IntegerField()),
-                    ),
-                    default=Value(0),
-                    output_field=IntegerField(),
-                ),
-            )
-            # group by type (numbers first, text after)
-            .order_by(
-                "is_numeric",
-                # For numbers, num asc sort
-                "numeric_val",
-                # For text, uses alphabetic sort
-                "number_or_name",
-            )
-        )
+        # natural order (101, 102... 1001, then names) read from the
+        # (block, sort_number, sort_text, id) index, one page at a time
+        return Apartment.objects.filter(block=self.scoped_object)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        block_id = self.kwargs.get("block_id")
-        context["current_block"] = Block.objects.get(
-            condominium=self.request.user.condominium, pk=block_id
-        )
+        context["current_block"] = self.scoped_object
         return context
 
 
-class SetupApartmentEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixin):
+class SetupApartmentEditView(
+    SetupViewsWithDecors, ScopedObjectMixin, UpdateView, SetupProgressMixin
+):
     """
     View for editing an apartment in the condo setup process.
     This class handles the update operations for an Apartment object, providing both
     GET requests for displaying the edit form and POST requests for processing form submissions.
-    It ensures that only users with access to the condominium can edit its apartments.
+    It ensures that only users with access to the condominium can edit its apartments:
+    the apartment is loaded from the user's condominium by ScopedObjectMixin.
     Attributes:
         http_method_names (list): Allowed HTTP methods (POST and GET)
         context_object_name (str): Name used for the apartment object in the template context
@@ -484,8 +502,6 @@ class SetupApartmentEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixi
         pk_url_kwarg (str): URL parameter name for the apartment ID
         template_name (str): Path to the template for rendering the edit form
     Methods:
-        dispatch: Validates user permissions and apartment existence before proceeding
-        get_queryset: Filters apartments to those belonging to the user's condominium
         get_context_data: Adds the block_id to the context for template rendering
         get_success_url: Determines the redirect URL after successful form submission
         form_valid: Handles form validation including checking for duplicate apartment names
@@ -498,92 +514,57 @@ class SetupApartmentEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixi
     model = Apartment
     pk_url_kwarg = "apartment_id"
     template_name = "condo/pages/setup_pages/apartment/condo_setup_apartments_edit.html"
-
-    def dispatch(self, request, *args, **kwargs):
-        """
-        Override dispatch method to verify that the requested apartment exists and
-        belongs to the user's condominium before proceeding with the view execution.
-        If the apartment doesn't exist or doesn't belong to the user's condominium,
-        an error message is shown and the user is redirected to the blocks-to-apartments setup page.
-        Args:
-            request: The HTTP request.
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments, including apartment_id.
-        Returns:
-            HttpResponse: Either a redirect response if validation fails or the result of the parent's dispatch method.
-        """
-
-        apartment_queryset = Apartment.objects.filter(
-            condominium=request.user.condominium,
-            pk=self.kwargs.get("apartment_id"),
-        )
-
-        if not apartment_queryset.exists():
-            messages.error(
-                request,
-                "The apartment you are trying to edit does not exist "
-                "or you do not have permissions to do so.",
-            )
-            return redirect(
-                reverse(
-                    "condo:condo_setup_blocks_to_apartments",
-                )
-            )
-        return super().dispatch(request, *args, **kwargs)
-
-    def get_queryset(self):
-        """
-        Retrieves apartments belonging to the user's condominium as a security measure.
-
-        This method ensures that users can only access apartment data from their own condominium,
-        implementing a security boundary that prevents unauthorized access to other condominiums' data.
-
-            QuerySet: Filtered apartment objects belonging to the authenticated user's condominium.
-        """
-
-        return Apartment.objects.filter(
-            condominium=self.request.user.condominium,
-        )
+    scoped_model = Apartment
+    scoped_url_kwarg = "apartment_id"
+    scoped_related = ("condominium", "block")
+    scoped_missing_message = (
+        "The apartment you are trying to edit does not exist "
+        "or you do not have permissions to do so."
+    )
+    scoped_missing_url = "condo:condo_setup_blocks_to_apartments"
 
     def get_context_data(self, **kwargs) -> dict:
         context = super().get_context_data(**kwargs)
-        context["block_id"] = self.object.block.id
+        context["block_id"] = self.object.block_id
         return context
 
     def get_success_url(self) -> str:
         return reverse(
             "condo:condo_setup_apartment_list_by_block",
-            kwargs={"block_id": self.object.block.id},
+            kwargs={"block_id": self.object.block_id},
         )
 
     def form_valid(self, form):
         # get form without saving it
         self.object = form.save(commit=False)
 
-        # verify if apartment number already exists in block
+        # verify if apartment number already exists in block (index lookup)
         if (
             Apartment.objects.filter(
+                same_name("number_or_name", self.object.number_or_name),
                 condominium=self.request.user.condominium,
                 block=self.object.block,
-                number_or_name__iexact=self.object.number_or_name,
             )
             .exclude(pk=self.object.pk)
             .exists()
         ):
-            form.add_error(
-                "number_or_name",
-                "Apartment number (or name) already exists in this block. Please, choose a different one.",
-            )
+            form.add_error("number_or_name", APARTMENT_NAME_MESSAGE)
             return self.form_invalid(form)
 
         # save updated apartment
-        self.object.save()
+        try:
+            self.object.save()
+        except IntegrityError as error:
+            if not is_unique_violation(error, APARTMENT_NAME_CONSTRAINT):
+                raise
+            form.add_error("number_or_name", APARTMENT_NAME_MESSAGE)
+            return self.form_invalid(form)
 
         messages.success(self.request, "Apartment has been updated successfully.")
         return HttpResponseRedirect(self.get_success_url())
 
 
-class SetupApartmentDeleteView(SetupViewsWithDecors, DeleteView):
+class SetupApartmentDeleteView(SetupViewsWithDecors, ScopedObjectMixin, DeleteView):
     """
     A view for deleting apartment entries in the condo setup process.
     This view handles the deletion of Apartment model instances and provides
@@ -609,34 +590,10 @@ class SetupApartmentDeleteView(SetupViewsWithDecors, DeleteView):
         "condo/pages/setup_pages/apartment/condo_setup_apartments_confirm_deletion.html"
     )
     pk_url_kwarg = "apartment_id"
-
-    def dispatch(self, request, *args, **kwargs):
-        """
-        Overridden dispatch method to check if the user has permission to access the apartment.
-        This method verifies that:
-        1. The apartment with the given ID exists in the user's condominium
-        2. The user has appropriate permissions to access/modify it
-        If the apartment does not exist or the user doesn't have permission, it shows
-        an error message and continues with the standard dispatch behavior.
-        Parameters:
-            request (HttpRequest): The HTTP request object containing user information
-            *args: Variable length argument list
-            **kwargs: Arbitrary keyword arguments, including 'apartment_id'
-        Returns:
-            HttpResponse: The result of the parent class's dispatch method
-        """
-
-        if not Apartment.objects.filter(
-            condominium=request.user.condominium, pk=self.kwargs.get("apartment_id")
-        ).exists():
-            messages.error(
-                request,
-                "The apartment you're trying to delete either doesn't exist or you don't have permission to delete it.",
-            )
-            return redirect(
-                "condo:condo_setup_home",
-            )
-        return super().dispatch(request, *args, **kwargs)
+    scoped_model = Apartment
+    scoped_url_kwarg = "apartment_id"
+    scoped_related = ("condominium", "block")
+    scoped_missing_message = "The apartment you're trying to delete either doesn't exist or you don't have permission to delete it."
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -648,7 +605,7 @@ class SetupApartmentDeleteView(SetupViewsWithDecors, DeleteView):
     def get_success_url(self) -> str:
         return reverse(
             "condo:condo_setup_apartment_list_by_block",
-            kwargs={"block_id": self.object.block.id},
+            kwargs={"block_id": self.object.block_id},
         )
 
     def form_valid(self, form):
@@ -1,21 +1,34 @@
 from django.contrib import messages
+from django.db import IntegrityError
 from django.http import HttpResponseRedirect
 from django.shortcuts import redirect
-from django.urls import reverse, reverse_lazy
+from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from apps.condo.forms import BlockSetupForm
-from apps.condo.models import Block
-
-from .base import SetupProgressMixin, SetupViewsWithDecors
-
-
-class SetupBlockListView(SetupViewsWithDecors, ListView):
+from apps.condo.models import (
+    BLOCK_NAME_CONSTRAINT,
+    BLOCK_NAME_MESSAGE,
+    Block,
+    is_unique_violation,
+    same_name,
+)
+
+from .base import (
+    KeysetPaginationMixin,
+    ScopedObjectMixin,
+    SetupProgressMixin,
+    SetupViewsWithDecors,
+)
+
+
+class SetupBlockListView(SetupViewsWithDecors, KeysetPaginationMixin, ListView):
     """
     A view for displaying a list of Block objects in a condominium setup context.
     This view extends SetupViewsWithDecors and Django's ListView to display blocks
     that belong to the current user's condominium. It supports different template
-    rendering modes based on the template_purpose attribute.
+    rendering modes based on the template_purpose attribute. Blocks are paginated
+    by keyset (see KeysetPaginationMixin).
     Attributes:
         model (Model): The Django model class (Block) this view will query
         http_method_names (list): Restricts the view to only handle GET requests
@@ -28,21 +41,30 @@ class SetupBlockListView(SetupViewsWithDecors, ListView):
 
     model = Block
     http_method_names = ["get"]
+    context_object_name = "block_list"
+    keyset = ("number_or_name", "id")
     template_purpose = "default"
     templates = {
         "default": "condo/pages/setup_pages/block/condo_setup_blocks.html",
         "apartments": "condo/pages/setup_pages/apartment/condo_setup_blocks_to_apartments.html",
     }
+    rows_templates = {
+        "default": "condo/partials/setup_pages/block/condo_setup_block_cards.html",
+        "apartments": "condo/partials/setup_pages/apartment/condo_setup_block_to_apartments_cards.html",
+    }
 
     def get_queryset(self):
-        return Block.objects.filter(condominium=self.request.user.condominium).order_by(
-            "number_or_name"
-        )
+        return Block.objects.filter(condominium=self.request.user.condominium)
 
     def get_template_names(self):
         template = self.templates.get(self.template_purpose, self.templates["default"])
         return template
 
+    def get_rows_template(self):
+        return self.rows_templates.get(
+            self.template_purpose, self.rows_templates["default"]
+        )
+
 
 class SetupBlockCreateView(SetupViewsWithDecors, CreateView, SetupProgressMixin):
     """
@@ -60,7 +82,7 @@ class SetupBlockCreateView(SetupViewsWithDecors, CreateView, SetupProgressMixin)
     Methods:
         dispatch: Validates that user has a condominium before proceeding
         form_valid: Handles form submission, validates block name uniqueness,
-                   associates block with condominium and updates setup progress
+                   and associates block with condominium
     Inherits from:
         SetupViewsWithDecors
         CreateView
@@ -87,40 +109,43 @@ class SetupBlockCreateView(SetupViewsWithDecors, CreateView, SetupProgressMixin)
         # get form instance without saving it
         self.object = form.save(commit=False)
 
-        # Check if block name already exists in condominium
+        # Check if block name already exists in condominium (index lookup)
         if (
             Block.objects.filter(
+                same_name("number_or_name", self.object.number_or_name),
                 condominium=self.request.user.condominium,
-                number_or_name__iexact=self.object.number_or_name,
             )
             .exclude(pk=self.object.pk)
             .exists()
         ):
-            form.add_error(
-                "number_or_name",
-                "Block number (or name) already exists in this condominium. Please, "
-                "choose a different one.",
-            )
+            form.add_error("number_or_name", BLOCK_NAME_MESSAGE)
             return self.form_invalid(form)
 
         # associate user's condominium with block being created
         self.object.condominium = self.request.user.condominium
 
         # save new block
-        self.object.save()
-
-        # update setup progress bar
-        self.update_setup_progress()
+        try:
+            self.object.save()
+        except IntegrityError as error:
+            # the same name was saved concurrently, after the check above
+            if not is_unique_violation(error, BLOCK_NAME_CONSTRAINT):
+                raise
+            form.add_error("number_or_name", BLOCK_NAME_MESSAGE)
+            return self.form_invalid(form)
 
         messages.success(self.request, "Block has been created successfully.")
         return HttpResponseRedirect(self.get_success_url())
 
 
-class SetupBlockEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixin):
+class SetupBlockEditView(
+    SetupViewsWithDecors, ScopedObjectMixin, UpdateView, SetupProgressMixin
+):
     """
     Class responsible for editing an existing condominium block.
     This view inherits from SetupViewsWithDecors, UpdateView and SetupProgressMixin to handle
     block editing functionality while ensuring proper setup progress tracking and decorators.
+    The block is loaded once, from the user's condominium, by ScopedObjectMixin.
     Attributes:
         http_method_names (list): Allowed HTTP methods ('get' and 'post')
         context_object_name (str): Name used for the block object in templates
@@ -130,7 +155,6 @@ class SetupBlockEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixin):
         success_url: URL to redirect after successful edit
         template_name (str): Template used for rendering the edit form
     Methods:
-        dispatch: Validates if user has a condominium and if block exists before processing
         get_context_data: Adds block_id to template context
         form_valid: Validates and processes the form submission, checking for duplicate block names
     Raises:
@@ -147,17 +171,10 @@ class SetupBlockEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixin):
     pk_url_kwarg = "block_id"
     success_url = reverse_lazy("condo:condo_setup_block_list")
     template_name = "condo/pages/setup_pages/block/condo_setup_block_edit.html"
-
-    def dispatch(self, request, *args, **kwargs):
-        if not Block.objects.filter(
-            condominium=request.user.condominium, pk=self.kwargs.get("block_id")
-        ).exists():
-            messages.error(
-                request,
-                "The Block you're trying to edit either doesn't exist or you don't have permission to edit it.",
-            )
-            return redirect(reverse("condo:condo_setup_block_list"))
-        return super().dispatch(request, *args, **kwargs)
+    scoped_model = Block
+    scoped_url_kwarg = "block_id"
+    scoped_missing_message = "The Block you're trying to edit either doesn't exist or you don't have permission to edit it."
+    scoped_missing_url = "condo:condo_setup_block_list"
 
     def form_valid(self, form):
         # get form instance without saving it
@@ -166,29 +183,31 @@ class SetupBlockEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixin):
         # verify if block number_or_name already exists in condominium
         if (
             Block.objects.filter(
+                same_name("number_or_name", self.object.number_or_name),
                 condominium=self.request.user.condominium,
-                number_or_name__iexact=self.object.number_or_name,
             )
             .exclude(pk=self.object.pk)
             .exists()
         ):
-            form.add_error(
-                "number_or_name",
-                "Block number (or name) already exists in this condominium. Please, choose a different one.",
-            )
+            form.add_error("number_or_name", BLOCK_NAME_MESSAGE)
             return self.form_invalid(form)
 
         # save updated block
-        self.object.save()
-
-        # update setup progress bar
-        self.update_setup_progress()
+        try:
+            self.object.save()
+        except IntegrityError as error:
+            if not is_unique_violation(error, BLOCK_NAME_CONSTRAINT):
+                raise
+            form.add_error("number_or_name", BLOCK_NAME_MESSAGE)
+            return self.form_invalid(form)
 
         messages.success(self.request, "Block has been updated successfully.")
         return HttpResponseRedirect(self.get_success_url())
 
 
-class SetupBlockDeleteView(SetupViewsWithDecors, DeleteView, SetupProgressMixin):
+class SetupBlockDeleteView(
+    SetupViewsWithDecors, ScopedObjectMixin, DeleteView, SetupProgressMixin
+):
     """
     Class-based view for deleting Block instances in the condo setup process.
     This view provides functionality to delete a Block instance while maintaining setup progress tracking.
@@ -201,6 +220,8 @@ class SetupBlockDeleteView(SetupViewsWithDecors, DeleteView, SetupProgressMixin)
         pk_url_kwarg (str): URL parameter name for the block's primary key
     Inherits From:
         SetupViewsWithDecors: Provides setup-specific decorators
+        ScopedObjectMixin: Loads the block of the user's condominium once (or redirects
+                           to the block list if it does not exist)
         DeleteView: Django's generic view for deletion operations
         SetupProgressMixin: Handles setup progress tracking
     Usage:
@@ -213,32 +234,10 @@ class SetupBlockDeleteView(SetupViewsWithDecors, DeleteView, SetupProgressMixin)
     success_url = reverse_lazy("condo:condo_setup_block_list")
     pk_url_kwarg = "block_id"
     context_object_name = "current_block"
-
-    def dispatch(self, request, *args, **kwargs):
-        """
-        Overrides the dispatch method to handle the request before it is passed to the appropriate HTTP method (GET, POST, etc.).
-        This method checks if the Block identified by 'block_id' exists in the user's condominium.
-        If the Block does not exist or the user does not have permission to access it,
-        an error message is displayed and the user is redirected to the block list page.
-        Args:
-            request (HttpRequest): The HTTP request object.
-            *args: Variable length argument list.
-            **kwargs: Arbitrary keyword arguments including 'block_id'.
-        Returns:
-            HttpResponse: Either a redirect response to the block list page if the permission check fails,
-                          or the result of the parent class's dispatch method.
-        """
-
-        if not Block.objects.filter(
-            condominium=request.user.condominium, pk=self.kwargs.get("block_id")
-        ).exists():
-            messages.error(
-                request,
-                "The Block you're trying to delete either doesn't\
-                            exist or you don't have permission to delete it.",
-            )
-            return redirect("condo:condo_setup_block_list")
-        return super().dispatch(request, *args, **kwargs)
+    scoped_model = Block
+    scoped_url_kwarg = "block_id"
+    scoped_missing_message = "The Block you're trying to delete either doesn't exist or you don't have permission to delete it."
+    scoped_missing_url = "condo:condo_setup_block_list"
 
     def form_valid(self, form):
         """
@@ -1,21 +1,34 @@
 from django.contrib import messages
+from django.db import IntegrityError
 from django.http import HttpResponseRedirect
 from django.shortcuts import redirect
-from django.urls import reverse, reverse_lazy
+from django.urls import reverse_lazy
 from django.views.generic import CreateView, DeleteView, ListView, UpdateView
 
 from apps.condo.forms import CommonAreaSetupForm
-from apps.condo.models import CommonArea
-
-from .base import SetupProgressMixin, SetupViewsWithDecors
-
-
-class SetupCommonAreaListView(SetupViewsWithDecors, ListView):
+from apps.condo.models import (
+    COMMON_AREA_NAME_CONSTRAINT,
+    COMMON_AREA_NAME_MESSAGE,
+    CommonArea,
+    is_unique_violation,
+    same_name,
+)
+
+from .base import (
+    KeysetPaginationMixin,
+    ScopedObjectMixin,
+    SetupProgressMixin,
+    SetupViewsWithDecors,
+)
+
+
+class SetupCommonAreaListView(SetupViewsWithDecors, KeysetPaginationMixin, ListView):
     """
     A view that displays a list of common areas for a condominium setup.
     This view inherits from SetupViewsWithDecors and ListView to display all common areas
     associated with the current user's condominium. It handles only GET requests and renders
-    the data using the specified template.
+    the data using the specified template, paginated by keyset (see
+    KeysetPaginationMixin).
     Attributes:
         model (Model): The CommonArea model to use for the view.
         http_method_names (list): List of HTTP methods the view accepts. Only GET is allowed.
@@ -31,6 +44,10 @@ class SetupCommonAreaListView(SetupViewsWithDecors, ListView):
         "condo/pages/setup_pages/common_area/condo_setup_common_area_list.html"
     )
     context_object_name = "common_area_list"
+    keyset = ("name", "id")
+    rows_template = (
+        "condo/partials/setup_pages/common_area/condo_setup_common_area_cards.html"
+    )
 
     def get_queryset(self):
         return CommonArea.objects.filter(
@@ -55,9 +72,8 @@ class SetupCommonAreaCreateView(SetupViewsWithDecors, CreateView, SetupProgressM
         template_name (str): Template used for rendering the view
     Methods:
         dispatch: Ensures a condominium exists before proceeding
-        form_valid: Validates the form, checks for name uniqueness, associates
-                    the common area with the user's condominium, and updates
-                    the setup progress
+        form_valid: Validates the form, checks for name uniqueness and associates
+                    the common area with the user's condominium
     """
 
     http_method_names = ["get", "post"]
@@ -96,34 +112,37 @@ class SetupCommonAreaCreateView(SetupViewsWithDecors, CreateView, SetupProgressM
         # get form instance without saving it
         self.object = form.save(commit=False)
 
-        # check if Common Area name already exists in condominium
+        # check if Common Area name already exists in condominium (index lookup)
         if (
             CommonArea.objects.filter(
-                condominium=self.request.user.condominium, name__iexact=self.object.name
+                same_name("name", self.object.name),
+                condominium=self.request.user.condominium,
             )
             .exclude(pk=self.object.pk)
             .exists()
         ):
-            form.add_error(
-                "name",
-                "Common Area name already exists in this condominium. Please, "
-                "choose a different one.",
-            )
+            form.add_error("name", COMMON_AREA_NAME_MESSAGE)
             return self.form_invalid(form)
 
         # associate user's condominium with common area being created
         self.object.condominium = self.request.user.condominium
-        self.object.save()
-
-        # update setup progress bar
-        self.update_setup_progress()
+        try:
+            self.object.save()
+        except IntegrityError as error:
+            # the same name was saved concurrently, after the check above
+            if not is_unique_violation(error, COMMON_AREA_NAME_CONSTRAINT):
+                raise
+            form.add_error("name", COMMON_AREA_NAME_MESSAGE)
+            return self.form_invalid(form)
 
         messages.success(self.request, "Common Area has been created successfully.")
 
         return HttpResponseRedirect(self.get_success_url())
 
 
-class SetupCommonAreaEditView(SetupViewsWithDecors, UpdateView, SetupProgressMixin):
+class SetupCommonAreaEditView(
+    SetupViewsWithDecors, ScopedObjectMixin, UpdateView, SetupProgressMixin
+):
     context_object_name = "current_common_area"
     form_class = CommonAreaSetupForm
     http_method_names = ["post", "get"]
@@ -133,18 +152,10 @@ class SetupCommonAreaEditView(SetupViewsWithDecors, UpdateView, SetupProgressMix
     template_name = (
         "condo/pages/setup_pages/common_area/condo_setup_common_area_edit.html"
     )
-
-    def dispatch(self, request, *args, **kwargs):
-        if not CommonArea.objects.filter(
-            condominium=request.user.condominium,
-            pk=self.kwargs.get("common_area_id"),
-        ).exists():
-            messages.error(
-                self.request,
-                "The Common Area you're trying to edit either doesn't exist or you don't have permission to edit it.",
-            )
-            return redirect(reverse("condo:condo_setup_common_area_list"))
-        return super().dispatch(request, *args, **kwargs)
+    scoped_model = CommonArea
+    scoped_url_kwarg = "common_area_id"
+    scoped_missing_message = "The Common Area you're trying to edit either doesn't exist or you don't have permission to edit it."
+    scoped_missing_url = "condo:condo_setup_common_area_list"
 
     def form_valid(self, form):
         # get form instance without saving it
@@ -153,28 +164,29 @@ class SetupCommonAreaEditView(SetupViewsWithDecors, UpdateView, SetupProgressMix
         # verify if updated common area new name already exists in user condominium
         if (
             CommonArea.objects.filter(
-                name__iexact=self.object.name, condominium=self.request.user.condominium
+                same_name("name", self.object.name),
+                condominium=self.request.user.condominium,
             )
             .exclude(pk=self.object.pk)
             .exists()
         ):
-            form.add_error(
-                "name",
-                "Common Area name already exists in this condominium. Please, choose a different one",
-            )
+            form.add_error("name", COMMON_AREA_NAME_MESSAGE)
             return self.form_invalid(form)
 
         # save updated common area in db
-        self.object.save()
-
-        # update setup progress bar
-        self.update_setup_progress()
+        try:
+            self.object.save()
+        except IntegrityError as error:
+            if not is_unique_violation(error, COMMON_AREA_NAME_CONSTRAINT):
+                raise
+            form.add_error("name", COMMON_AREA_NAME_MESSAGE)
+            return self.form_invalid(form)
 
         messages.success(self.request, "Common Area has been updated successfully.")
         return HttpResponseRedirect(self.get_success_url())
 
 
-class SetupCommonAreaDeleteView(SetupViewsWithDecors, DeleteView):
+class SetupCommonAreaDeleteView(SetupViewsWithDecors, ScopedObjectMixin, DeleteView):
     context_object_name = "current_common_area"
     http_method_names = ["get", "post"]
     model = CommonArea
@@ -183,30 +195,10 @@ class SetupCommonAreaDeleteView(SetupViewsWithDecors, DeleteView):
     template_name = (
         "condo/pages/setup_pages/common_area/condo_setup_common_area_delete.html"
     )
-
-    def dispatch(self, request, *args, **kwargs):
-        """
-        Handles request dispatching for the common area delete view.
-        Checks if the common area with the given ID exists and belongs to the user's condominium.
-        If not, displays an error message and redirects to the common area list page.
-        Args:
-            request: The HTTP request object
-            *args: Additional positional arguments
-            **kwargs: Additional keyword arguments, including 'common_area_id'
-        Returns:
-            HttpResponse: Redirect to common area list if validation fails,
-                          otherwise proceeds with normal dispatch flow
-        """
-
-        if not CommonArea.objects.filter(
-            condominium=request.user.condominium, pk=self.kwargs.get("common_area_id")
-        ).exists():
-            messages.error(
-                request,
-                "The Common Area you're trying to delete either doesn't exist or you don't have permission to delete it.",
-            )
-            return redirect(reverse("condo:condo_setup_common_area_list"))
-        return super().dispatch(request, *args, **kwargs)
+    scoped_model = CommonArea
+    scoped_url_kwarg = "common_area_id"
+    scoped_missing_message = "The Common Area you're trying to delete either doesn't exist or you don't have permission to delete it."
+    scoped_missing_url = "condo:condo_setup_common_area_list"
 
     def delete(self, request, *args, **kwargs):
         """
@@ -18,7 +18,6 @@ class SetupCondominiumView(SetupViewsWithDecors, UpdateView, SetupProgressMixin)
     - Makes form fields readonly when editing existing condominiums
     - Provides context data about the existence of related objects
     - Associates newly created condominiums with the current user
-    - Updates setup progress tracking
     - Handles success messages
     Attributes:
         model: The Condominium model class
@@ -96,8 +95,8 @@ class SetupCondominiumView(SetupViewsWithDecors, UpdateView, SetupProgressMixin)
     def form_valid(self, form):
         """
         Called when a valid form data has been POSTed.
-        Associates the condominium with the current user, creates initial setup
-        progress and saves everything.
+        Associates the condominium with the current user and saves everything.
+        Setup progress is created and updated by model events.
         """
         # If there is not a condominium object in form (new condominium)
         it_is_new_condo = not self.object
@@ -123,5 +122,4 @@ class SetupCondominiumView(SetupViewsWithDecors, UpdateView, SetupProgressMixin)
             else "Condominium has been edited successfully"
         )
         messages.success(self.request, message)
-        self.update_setup_progress()
         return success_redirect
@@ -0,0 +1,57 @@
+from django.contrib import messages
+from django.shortcuts import redirect, render
+from django.urls import reverse
+
+from apps.condo.forms import ResidentInvitationsForm
+from apps.purchase.invitations import create_invitations, read_invitations
+
+from .base import SetupViewsWithDecors
+
+
+class SetupResidentInviteView(SetupViewsWithDecors):
+    """
+    Invites every resident listed in a CSV file (see apps/purchase/invitations.py).
+    The file is validated as a whole: if any line is invalid, nobody is invited
+    and the errors of every line are shown, so the manager can fix the file and
+    upload it again.
+    """
+
+    template_name = "condo/pages/setup_pages/resident/condo_setup_resident_invite.html"
+
+    def get(self, request, *args, **kwargs):
+        if not request.user.condominium:
+            return self._condominium_required(request)
+        return render(request, self.template_name, {"form": ResidentInvitationsForm()})
+
+    def post(self, request, *args, **kwargs):
+        condominium = request.user.condominium
+        if not condominium:
+            return self._condominium_required(request)
+
+        form = ResidentInvitationsForm(request.POST, request.FILES)
+        errors = []
+        if form.is_valid():
+            invitations, errors = read_invitations(
+                form.cleaned_data["csv_file"], condominium
+            )
+            if not invitations and not errors:
+                errors = ["There are no residents in this file."]
+            if not errors:
+                create_invitations(
+                    invitations, condominium, request.build_absolute_uri("/")
+                )
+                messages.success(
+                    request,
+                    f"{len(invitations)} residents invited. They will receive their "
+                    "registration links by e-mail shortly.",
+                )
+                return redirect(reverse("condo:condo_setup_resident_invite"))
+
+        return render(request, self.template_name, {"form": form, "csv_errors": errors})
+
+    def _condominium_required(self, request):
+        messages.error(
+            request,
+            "In order to invite residents, you must create a condominium first.",
+        )
+        return redirect(reverse("condo:condo_setup_condominium"))
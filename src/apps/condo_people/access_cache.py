@@ -0,0 +1,76 @@
+"""
+Cross-request cache of user groups and permissions.
+
+Group membership and permissions change almost never (registration and admin
+edits), but are checked on every request. Group names and "app_label.codename"
+permissions are stored through Django's cache framework as frozensets keyed by
+user id, and invalidated by the signals in signals.py whenever users, groups,
+permissions or their relations change. Permissions are served to has_perm()
+and friends by backends.AccessCacheBackend.
+
+Invalidation must reach every process, so nothing is cached unless the cache
+is shared (REDIS_URL): with the default local memory cache, a user removed
+from "manager" would keep setup access in the other gunicorn workers. Group
+names and permissions are then read once per request (see User.group_names
+and ModelBackend's per-instance caches).
+"""
+
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+
+from project.caches import is_shared
+
+ACCESS_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def _access_key(user_id) -> str:
+    return f"condo_people:access:{user_id}"
+
+
+def _permission_names(permissions) -> frozenset:
+    return frozenset(
+        f"{app_label}.{codename}"
+        for app_label, codename in permissions.values_list(
+            "content_type__app_label", "codename"
+        ).distinct()
+    )
+
+
+def load_group_names(user) -> frozenset:
+    return frozenset(user.groups.values_list("name", flat=True))
+
+
+def load_access(user) -> dict:
+    """Reads group names, user and group permissions from database"""
+    return {
+        "groups": load_group_names(user),
+        "user_permissions": _permission_names(Permission.objects.filter(user=user)),
+        "group_permissions": _permission_names(
+            Permission.objects.filter(group__user=user)
+        ),
+    }
+
+
+def get_access(user) -> dict:
+    """
+    Cached access of a user. Only call it when the cache is shared (see
+    is_shared()): a local memory cache would serve stale entries.
+    """
+    key = _access_key(user.pk)
+    access = cache.get(key)
+    if access is None:
+        access = load_access(user)
+        cache.set(key, access, ACCESS_CACHE_TIMEOUT)
+    return access
+
+
+def get_group_names(user) -> frozenset:
+    if not is_shared():
+        return load_group_names(user)
+    return get_access(user)["groups"]
+
+
+def invalidate(*user_ids) -> None:
+    keys = [_access_key(user_id) for user_id in user_ids if user_id is not None]
+    if keys:
+        cache.delete_many(keys)
@@ -0,0 +1,31 @@
+from django.contrib.auth.backends import ModelBackend
+
+from apps.condo_people import access_cache
+
+
+class AccessCacheBackend(ModelBackend):
+    """
+    ModelBackend reading the permissions of active users from the access
+    cache (see access_cache.py), so has_perm() does not query the database on
+    every request. Superusers (every permission) and object permissions are
+    left to ModelBackend, as well as everything when the cache is not shared.
+    """
+
+    def _uses_cache(self, user_obj, obj) -> bool:
+        return (
+            obj is None
+            and user_obj.is_active
+            and not user_obj.is_anonymous
+            and not user_obj.is_superuser
+            and access_cache.is_shared()
+        )
+
+    def get_user_permissions(self, user_obj, obj=None):
+        if not self._uses_cache(user_obj, obj):
+            return super().get_user_permissions(user_obj, obj)
+        return set(access_cache.get_access(user_obj)["user_permissions"])
+
+    def get_group_permissions(self, user_obj, obj=None):
+        if not self._uses_cache(user_obj, obj):
+            return super().get_group_permissions(user_obj, obj)
+        return set(access_cache.get_access(user_obj)["group_permissions"])
@@ -1,18 +1,15 @@
 def user_groups(request):
     """
-    Using booleans, this function checks which group a user belongs to
+    Using booleans, this function checks which group a user belongs to.
+    Group names are loaded once per request (see User.group_names)
     """
     if request.user.is_authenticated:
-        is_manager = request.user.groups.filter(name="manager").exists()
-        is_caretaker = request.user.groups.filter(name="caretaker").exists()
-        is_resident = request.user.groups.filter(name="resident").exists()
+        group_names = request.user.group_names
     else:
-        is_manager = False
-        is_caretaker = False
-        is_resident = False
+        group_names = frozenset()
 
     return {
-        "is_manager": is_manager,
-        "is_caretaker": is_caretaker,
-        "is_resident": is_resident,
+        "is_manager": "manager" in group_names,
+        "is_caretaker": "caretaker" in group_names,
+        "is_resident": "resident" in group_names,
     }
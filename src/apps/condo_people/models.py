@@ -1,10 +1,12 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils.functional import cached_property
 
-from apps.condo.models import Apartment, Condominium
+from apps.condo.models import Apartment, Condominium, CoverMixin
+from apps.condo_people import access_cache
 
 
-class User(AbstractUser):
+class User(CoverMixin, AbstractUser):
     first_name = models.CharField(
         verbose_name="first name", max_length=150, blank=False
     )
@@ -29,5 +31,17 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
 
+    @cached_property
+    def group_names(self) -> frozenset:
+        """
+        Names of the groups the user belongs to. They come from the access cache
+        (see access_cache.py) and are kept on the instance, so they are read at
+        most once per request (reset by signals.py when groups change).
+        """
+        return access_cache.get_group_names(self)
+
+    def in_group(self, name: str) -> bool:
+        return name in self.group_names
+
     class Meta:
         app_label = "condo_people"
@@ -1,10 +1,18 @@
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.models import ContentType
-from django.db.models.signals import post_migrate
+from django.db.models import Q
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
 from django.dispatch import receiver
 
 from apps.condo.models import Apartment, Block, CommonArea, Condominium
+from apps.condo_people import access_cache
 from apps.reservation.models import Reservation
 
 
@@ -74,3 +82,103 @@ def create_user_groups(sender, **kwargs):
                 codename=codename, content_type=content_type
             )
             group.permissions.add(permission)
+
+
+# request-scoped copies kept on user instances (User.group_names and the
+# permission caches of ModelBackend)
+INSTANCE_CACHES = (
+    "group_names",
+    "_perm_cache",
+    "_user_perm_cache",
+    "_group_perm_cache",
+)
+
+
+def _forget_access(*users) -> None:
+    """Invalidates the cached group names and permissions of users (instances or ids)"""
+    user_ids = []
+    for user in users:
+        if isinstance(user, get_user_model()):
+            for name in INSTANCE_CACHES:
+                user.__dict__.pop(name, None)
+            user = user.pk
+        user_ids.append(user)
+    access_cache.invalidate(*user_ids)
+
+
+def _group_members(group_ids) -> list:
+    return list(
+        get_user_model()
+        .objects.filter(groups__in=group_ids)
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+def _permission_holders(permission_ids) -> list:
+    """Users having the permissions, directly or through one of their groups"""
+    user_model = get_user_model()
+    return list(
+        user_model.objects.filter(
+            Q(user_permissions__in=permission_ids)
+            | Q(groups__permissions__in=permission_ids)
+        )
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+@receiver(m2m_changed, sender=get_user_model().user_permissions.through)
+def forget_access_on_user_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    user.groups / user.user_permissions changes touch one user; the reverse
+    side (group.user_set, permission.user_set) touches the users in pk_set, or
+    every related user on clear.
+    """
+    if not reverse:
+        if action in ("post_add", "post_remove", "post_clear"):
+            _forget_access(instance)
+    elif action in ("post_add", "post_remove"):
+        _forget_access(*pk_set)
+    elif action == "pre_clear":
+        _forget_access(*instance.user_set.values_list("pk", flat=True))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def forget_access_on_group_permissions_change(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Permissions of a group changed: every member of it is affected"""
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+    if not reverse:
+        group_ids = [instance.pk]
+    elif action == "pre_clear":
+        group_ids = list(instance.group_set.values_list("pk", flat=True))
+    else:
+        group_ids = list(pk_set)
+    _forget_access(*_group_members(group_ids))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def forget_access_on_group_change(sender, instance, **kwargs):
+    # renamed or deleted groups change the group names and permissions of
+    # their members
+    if instance.pk is not None:
+        _forget_access(*_group_members([instance.pk]))
+
+
+@receiver(post_save, sender=Permission)
+@receiver(pre_delete, sender=Permission)
+def forget_access_on_permission_change(sender, instance, created=False, **kwargs):
+    # a new permission belongs to nobody yet; a changed codename or a deleted
+    # permission changes the permissions of everyone having it
+    if instance.pk is not None and not created:
+        _forget_access(*_permission_holders([instance.pk]))
+
+
+@receiver(post_delete, sender=get_user_model())
+def forget_access_on_user_delete(sender, instance, **kwargs):
+    _forget_access(instance.pk)
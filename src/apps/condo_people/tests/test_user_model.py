@@ -1,3 +1,11 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group, Permission
+from django.test import RequestFactory
+
+from apps.condo_people.context_processors import user_groups
+
 from .base_test_condo_people import CondoPeopleTestBase
 
 
@@ -5,3 +13,111 @@ class UserModelTest(CondoPeopleTestBase):
     def test_dunder_str_returns_firstname_lastname(self):
         test_user = self.create_test_user()
         self.assertEqual(str(test_user), "Elliot Smith")
+
+    def test_group_names_are_loaded_once_and_reset_when_groups_change(self):
+        test_user = self.create_test_user()
+        with self.assertNumQueries(1):
+            self.assertEqual(test_user.group_names, frozenset())
+            self.assertFalse(test_user.in_group("manager"))
+
+        test_user.groups.add(Group.objects.get(name="manager"))
+        self.assertTrue(test_user.in_group("manager"))
+
+    @mock.patch("apps.condo_people.access_cache.is_shared", return_value=True)
+    def test_group_names_are_shared_between_requests(self, is_shared):
+        test_user = self.create_test_user()
+        test_user.groups.add(Group.objects.get(name="caretaker"))
+        self.assertTrue(test_user.in_group("caretaker"))
+
+        # another request loads another instance of the same user
+        same_user = get_user_model().objects.get(pk=test_user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(same_user.in_group("caretaker"))
+
+        # group members changes reach every member
+        caretaker = Group.objects.get(name="caretaker")
+        caretaker.user_set.remove(same_user)
+        same_user = get_user_model().objects.get(pk=test_user.pk)
+        self.assertFalse(same_user.in_group("caretaker"))
+
+    def test_group_names_are_not_shared_through_a_local_memory_cache(self):
+        test_user = self.create_test_user()
+        test_user.groups.add(Group.objects.get(name="manager"))
+        self.assertTrue(test_user.in_group("manager"))
+
+        # other processes would never see the invalidation: read them again
+        same_user = get_user_model().objects.get(pk=test_user.pk)
+        with self.assertNumQueries(1):
+            self.assertTrue(same_user.in_group("manager"))
+
+    @mock.patch("apps.condo_people.access_cache.is_shared", return_value=True)
+    def test_permissions_are_shared_between_requests(self, is_shared):
+        test_user = self.create_test_user()
+        test_user.groups.add(Group.objects.get(name="caretaker"))
+        self.assertTrue(test_user.has_perm("condo.view_block"))
+
+        same_user = get_user_model().objects.get(pk=test_user.pk)
+        with self.assertNumQueries(0):
+            self.assertTrue(same_user.has_perm("condo.view_block"))
+            self.assertFalse(same_user.has_perm("condo.add_block"))
+            self.assertTrue(same_user.in_group("caretaker"))
+
+    @mock.patch("apps.condo_people.access_cache.is_shared", return_value=True)
+    def test_permission_changes_take_effect_on_the_next_request(self, is_shared):
+        test_user = self.create_test_user()
+        caretaker = Group.objects.get(name="caretaker")
+        test_user.groups.add(caretaker)
+        add_block = Permission.objects.get(codename="add_block")
+        view_block = Permission.objects.get(codename="view_block")
+
+        def next_request_user():
+            user = get_user_model().objects.get(pk=test_user.pk)
+            user.get_all_permissions()  # fill the cache
+            return user
+
+        # permissions of a group, both sides of the relation
+        self.assertFalse(next_request_user().has_perm("condo.add_block"))
+        caretaker.permissions.add(add_block)
+        self.assertTrue(next_request_user().has_perm("condo.add_block"))
+        add_block.group_set.remove(caretaker)
+        self.assertFalse(next_request_user().has_perm("condo.add_block"))
+
+        # permissions of the user, both sides of the relation
+        test_user.user_permissions.add(add_block)
+        self.assertTrue(next_request_user().has_perm("condo.add_block"))
+        add_block.user_set.clear()
+        self.assertFalse(next_request_user().has_perm("condo.add_block"))
+
+        # renamed and deleted permissions
+        self.assertTrue(next_request_user().has_perm("condo.view_block"))
+        view_block.codename = "see_block"
+        view_block.save()
+        self.assertTrue(next_request_user().has_perm("condo.see_block"))
+        view_block.delete()
+        self.assertFalse(next_request_user().has_perm("condo.see_block"))
+
+        # deleted groups
+        self.assertTrue(next_request_user().has_perm("condo.view_commonarea"))
+        caretaker.delete()
+        self.assertFalse(next_request_user().has_perm("condo.view_commonarea"))
+
+    def test_permissions_are_not_shared_through_a_local_memory_cache(self):
+        test_user = self.create_test_user()
+        test_user.groups.add(Group.objects.get(name="caretaker"))
+        self.assertTrue(test_user.has_perm("condo.view_block"))
+
+        same_user = get_user_model().objects.get(pk=test_user.pk)
+        with self.assertNumQueries(2):
+            self.assertTrue(same_user.has_perm("condo.view_block"))
+
+    def test_user_groups_context_processor_reads_cached_group_names(self):
+        test_user = self.create_test_user()
+        test_user.groups.add(Group.objects.get(name="resident"))
+        request = RequestFactory().get("/")
+        request.user = test_user
+
+        with self.assertNumQueries(1):
+            context = user_groups(request)
+        self.assertEqual(
+            context, {"is_manager": False, "is_caretaker": False, "is_resident": True}
+        )
@@ -3,6 +3,7 @@ from django.contrib.auth import authenticate, get_user_model, login, logout
 from django.contrib.auth import views as auth_views
 from django.contrib.auth.decorators import login_required
 from django.contrib.messages.views import SuccessMessageMixin
+from django.db import transaction
 from django.http import Http404
 from django.shortcuts import redirect, render
 from django.urls import reverse
@@ -13,12 +14,8 @@ from .forms import LoginForm, RegisterForm
 
 
 def register_view(request, token):
-    # Check if Token exists
-    try:
-        token_obj = RegistrationToken.objects.get(token=token)
-        if not token_obj.is_valid():
-            return redirect(reverse("condo_people:invalid_token"))
-    except RegistrationToken.DoesNotExist:
+    # Check if Token exists and is still valid (unused and not expired)
+    if not RegistrationToken.objects.valid().filter(token=token).exists():
         # Remove sessions from cookies if token does not exist or invalid.
         request.session.pop("register_form_data", None)
         request.session.pop("token", None)
@@ -49,20 +46,31 @@ def register_create(request):
     form = RegisterForm(request.POST)
 
     if form.is_valid():
-        # For security reasons, manually set password in order to hash it
-        new_user = form.save(commit=False)
-        new_user.set_password(form.cleaned_data["password1"])
-        new_user.save()
-
-        # Assign token as 'used'
-        token = request.session["token"]
-        token = RegistrationToken.objects.get(token__iexact=token)
-        token.not_used_yet = False
-        token.save()
-
-        # set user to corresponding group (manager, caretaker or resident)
-        new_user_group = token.register_group
-        new_user.groups.add(new_user_group)
+        with transaction.atomic():
+            # locked: a token is used by one registration only
+            token = (
+                RegistrationToken.objects.valid()
+                .select_for_update()
+                .filter(token=request.session.get("token"))
+                .first()
+            )
+            if token is None:
+                return redirect(reverse("condo_people:invalid_token"))
+
+            # For security reasons, manually set password in order to hash it
+            new_user = form.save(commit=False)
+            new_user.set_password(form.cleaned_data["password1"])
+            # residents invited by a manager already have their apartment
+            new_user.condominium_id = token.register_condominium_id
+            new_user.apartment_id = token.register_apartment_id
+            new_user.save()
+
+            # Assign token as 'used'
+            token.not_used_yet = False
+            token.save(update_fields=["not_used_yet"])
+
+            # set user to corresponding group (manager, caretaker or resident)
+            new_user.groups.add(token.register_group_id)
 
         request.session.flush()
         # Redirect user to login page.
@@ -0,0 +1,148 @@
+"""
+Bulk invitation of residents from a CSV file.
+
+Rows are read from the uploaded file as a stream and checked one by one; the
+apartments of the condominium, the e-mails already registered and the e-mails
+with a pending invitation (an unused, unexpired token) are loaded with one
+query each. When every row is valid, all tokens are inserted with a
+single bulk_create and the e-mails are sent by background tasks, in chunks,
+over one SMTP connection per chunk (see tasks.send_invitations).
+"""
+
+import csv
+import io
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from apps.condo.models import Apartment
+from apps.purchase.models import RegistrationToken
+from apps.purchase.tasks import send_invitations
+
+CSV_COLUMNS = ("first_name", "last_name", "email", "block", "apartment")
+DAYS_TO_EXPIRE = 30
+# e-mails sent by each background job (one SMTP connection each)
+EMAILS_PER_JOB = 100
+
+
+@dataclass
+class Invitation:
+    first_name: str
+    last_name: str
+    email: str
+    apartment: Apartment
+
+
+def read_invitations(csv_file, condominium) -> tuple[list[Invitation], list[str]]:
+    """
+    Parses an uploaded CSV file (columns in CSV_COLUMNS, with a header line).
+    Returns the invitations and a list of errors, one per invalid line.
+    """
+    apartments = {
+        (apartment.block.number_or_name.lower(), apartment.number_or_name.lower()): (
+            apartment
+        )
+        for apartment in Apartment.objects.filter(
+            condominium=condominium
+        ).select_related("block")
+    }
+    invitations, errors, seen_emails = [], [], {}
+
+    reader = csv.DictReader(io.TextIOWrapper(csv_file, encoding="utf-8-sig"))
+    try:
+        missing = set(CSV_COLUMNS) - set(reader.fieldnames or ())
+        if missing:
+            return [], [f"Missing columns: {', '.join(sorted(missing))}."]
+
+        for row in reader:
+            try:
+                invitation = _read_row(row, apartments)
+                email = invitation.email
+                if email in seen_emails:
+                    raise ValidationError(
+                        f"{email} is already invited on line {seen_emails[email]}."
+                    )
+            except ValidationError as error:
+                errors.append(f"Line {reader.line_num}: {' '.join(error.messages)}")
+                continue
+            seen_emails[email] = reader.line_num
+            invitations.append(invitation)
+    except (UnicodeDecodeError, csv.Error) as error:
+        return [], [f"Line {reader.line_num + 1}: unreadable CSV file ({error})."]
+
+    registered = (
+        get_user_model()
+        .objects.annotate(lower_email=Lower("email"))
+        .filter(lower_email__in=seen_emails)
+        .values_list("lower_email", flat=True)
+    )
+    errors.extend(
+        f"Line {seen_emails[email]}: {email} is already registered."
+        for email in registered
+    )
+    # a second token would leave two valid registration links for one resident
+    pending = (
+        RegistrationToken.objects.valid()
+        .annotate(lower_email=Lower("register_email"))
+        .filter(lower_email__in=seen_emails)
+        .exclude(lower_email__in=registered)
+        .values_list("lower_email", flat=True)
+        .distinct()
+    )
+    errors.extend(
+        f"Line {seen_emails[email]}: {email} was already invited and has not "
+        "registered yet."
+        for email in pending
+    )
+    return invitations, errors
+
+
+def _read_row(row, apartments) -> Invitation:
+    values = {column: (row[column] or "").strip() for column in CSV_COLUMNS}
+    if not values["first_name"] or not values["last_name"]:
+        raise ValidationError("first and last names are required.")
+    email = values["email"].lower()
+    validate_email(email)
+    apartment = apartments.get((values["block"].lower(), values["apartment"].lower()))
+    if apartment is None:
+        raise ValidationError(
+            f"apartment {values['apartment']} of block {values['block']} does not "
+            "exist."
+        )
+    return Invitation(values["first_name"], values["last_name"], email, apartment)
+
+
+def create_invitations(invitations: list[Invitation], condominium, site_url) -> list:
+    """
+    Creates the registration tokens of residents with one INSERT and queues
+    the jobs sending their e-mails in the same transaction. The registration
+    links point to site_url, the root URL of the request. Returns the tokens.
+    """
+    resident_group = Group.objects.get(name="resident")
+    expires_at = timezone.now() + timedelta(days=DAYS_TO_EXPIRE)
+    with transaction.atomic():
+        tokens = RegistrationToken.objects.bulk_create(
+            RegistrationToken(
+                register_first_name=invitation.first_name,
+                register_last_name=invitation.last_name,
+                register_email=invitation.email,
+                register_group=resident_group,
+                register_condominium=condominium,
+                register_apartment=invitation.apartment,
+                token=get_random_string(length=32),
+                expires_at=expires_at,
+            )
+            for invitation in invitations
+        )
+        token_ids = [token.pk for token in tokens]
+        for start in range(0, len(token_ids), EMAILS_PER_JOB):
+            send_invitations.delay(token_ids[start : start + EMAILS_PER_JOB], site_url)
+    return tokens
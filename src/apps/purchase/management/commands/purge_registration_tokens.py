@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.purchase.models import RegistrationToken
+from apps.purchase.tasks import purge_registration_tokens
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes used and expired registration tokens in small batches, or with "
+        "--schedule queues the background job doing it every day."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Tokens deleted per transaction.",
+        )
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Queue the daily purge job (if it is not queued yet) and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            job = purge_registration_tokens.schedule_once(
+                timezone.now(), options["batch_size"]
+            )
+            if job is None:
+                self.stdout.write("The daily purge job is already queued.")
+            else:
+                self.stdout.write(self.style.SUCCESS("Daily purge job queued."))
+            return
+
+        deleted = RegistrationToken.objects.purge(options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(f"{deleted} used or expired tokens deleted.")
+        )
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-17 20:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0004_setupprogress_backfill"),
+        ("purchase", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="registrationtoken",
+            name="register_apartment",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="registration_tokens",
+                to="condo.apartment",
+            ),
+        ),
+        migrations.AddField(
+            model_name="registrationtoken",
+            name="register_condominium",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="registration_tokens",
+                to="condo.condominium",
+            ),
+        ),
+    ]
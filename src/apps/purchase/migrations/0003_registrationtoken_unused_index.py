@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-17 20:43
+
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # the index is built without locking the table against writes
+    atomic = False
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("condo", "0004_setupprogress_backfill"),
+        ("purchase", "0002_registrationtoken_invitation"),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name="registrationtoken",
+            index=models.Index(
+                condition=models.Q(("not_used_yet", True)),
+                fields=["token"],
+                include=("expires_at",),
+                name="purchase_token_unused_idx",
+            ),
+        ),
+    ]
@@ -1,7 +1,37 @@
 from django.contrib.auth.models import Group
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 
+from apps.condo.models import Apartment, Condominium
+
+
+class RegistrationTokenQuerySet(models.QuerySet):
+    def valid(self, now=None):
+        """Tokens that can still be used to register (see is_valid)"""
+        return self.filter(not_used_yet=True, expires_at__gt=now or timezone.now())
+
+    def purgeable(self, now=None):
+        """Used or expired tokens, which will never be valid again"""
+        return self.filter(
+            Q(not_used_yet=False) | Q(expires_at__lte=now or timezone.now())
+        )
+
+    def purge(self, batch_size: int = 1000) -> int:
+        """
+        Deletes used and expired tokens in batches of at most batch_size rows,
+        each one in its own short transaction, so registrations are never
+        blocked by a long running delete. Returns the number of deleted tokens.
+        """
+        now = timezone.now()
+        deleted = 0
+        while True:
+            batch = list(self.purgeable(now).values_list("pk", flat=True)[:batch_size])
+            if not batch:
+                return deleted
+            with transaction.atomic():
+                deleted += self.filter(pk__in=batch).delete()[0]
+
 
 class RegistrationToken(models.Model):
     register_first_name = models.CharField(max_length=100, blank=False, null=True)
@@ -12,6 +42,23 @@ class RegistrationToken(models.Model):
     created_at = models.DateTimeField(default=timezone.now)
     expires_at = models.DateTimeField()
     not_used_yet = models.BooleanField(default=True)
+    # residents invited by a manager join the condominium/apartment on register
+    register_condominium = models.ForeignKey(
+        to=Condominium,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="registration_tokens",
+    )
+    register_apartment = models.ForeignKey(
+        to=Apartment,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name="registration_tokens",
+    )
+
+    objects = RegistrationTokenQuerySet.as_manager()
 
     def is_valid(self):
         expiration_validation_is_ok = self.expires_at > timezone.now()
@@ -22,3 +69,13 @@ class RegistrationToken(models.Model):
 
     class Meta:
         app_label = "purchase"
+        indexes = [
+            # registration looks up unused tokens only: this index stays small
+            # (used ones are purged) and answers the expiration check by itself
+            models.Index(
+                fields=["token"],
+                include=["expires_at"],
+                condition=Q(not_used_yet=True),
+                name="purchase_token_unused_idx",
+            ),
+        ]
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from urllib.parse import urljoin
+
+from django.core.mail import EmailMessage, get_connection, send_mail
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.purchase.models import RegistrationToken
+from apps.tasks.queue import task
+
+SUBJECT = "Your registration link"
+FROM_EMAIL = "no-reply@condome.com"
+PURGE_INTERVAL = timedelta(days=1)
+
+
+def registration_message(registration_link: str) -> str:
+    return f"Please, click on the following link to complete your Condo_Me registration: {registration_link}"  # noqa: E501
+
+
+@task
+def send_registration_link(register_email: str, registration_link: str) -> None:
+    send_mail(
+        subject=SUBJECT,
+        message=registration_message(registration_link),
+        from_email=FROM_EMAIL,
+        recipient_list=[register_email],
+        fail_silently=False,
+    )
+
+
+@task
+def send_invitations(token_ids: list, site_url: str) -> None:
+    """
+    Sends the registration links of a batch of invitations over a single SMTP
+    connection. Tokens used meanwhile are skipped. site_url is the root URL of
+    the site the manager invited them from (i.e. "https://condo.me/").
+    """
+    tokens = RegistrationToken.objects.filter(pk__in=token_ids, not_used_yet=True)
+    emails = [
+        EmailMessage(
+            subject=SUBJECT,
+            body=registration_message(
+                urljoin(site_url, reverse("condo_people:register", args=[token.token]))
+            ),
+            from_email=FROM_EMAIL,
+            to=[token.register_email],
+        )
+        for token in tokens
+    ]
+    with get_connection(fail_silently=False) as connection:
+        connection.send_messages(emails)
+
+
+@task
+def purge_registration_tokens(batch_size: int = 1000) -> None:
+    """
+    Deletes used and expired registration tokens, then schedules itself again
+    for the next day (see "manage.py purge_registration_tokens --schedule").
+    """
+    RegistrationToken.objects.purge(batch_size)
+    purge_registration_tokens.schedule_once(timezone.now() + PURGE_INTERVAL, batch_size)
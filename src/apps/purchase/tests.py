@@ -1,3 +1,72 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.purchase.models import RegistrationToken
+from apps.purchase.tasks import purge_registration_tokens
+from apps.tasks.models import Job
+
+
+class RegistrationTokenPurgeTest(TestCase):
+    def setUp(self):
+        group = Group.objects.get_or_create(name="manager")[0]
+        now = timezone.now()
+        self.tokens = {
+            name: RegistrationToken.objects.create(
+                register_email=f"{name}@doe.com",
+                register_group=group,
+                token=name,
+                expires_at=now + timedelta(days=days),
+                not_used_yet=not used,
+            )
+            for name, days, used in [
+                ("valid", 10, False),
+                ("used", 10, True),
+                ("expired", -1, False),
+                ("expired_used", -1, True),
+            ]
+        }
+
+    def test_valid_returns_unused_and_unexpired_tokens(self):
+        self.assertQuerySetEqual(
+            RegistrationToken.objects.valid(), [self.tokens["valid"]]
+        )
+
+    def test_valid_token_lookup_can_use_the_partial_index(self):
+        queryset = RegistrationToken.objects.valid().filter(token="valid")
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        self.assertIn("purchase_token_unused_idx", plan)
+
+    def test_purge_deletes_used_and_expired_tokens_in_batches(self):
+        with CaptureQueriesContext(connection) as queries:
+            deleted = RegistrationToken.objects.purge(batch_size=1)
+        self.assertEqual(deleted, 3)
+        deletes = [q["sql"] for q in queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 3)
+        self.assertQuerySetEqual(
+            RegistrationToken.objects.all(), [self.tokens["valid"]]
+        )
+
+    def test_purge_command(self):
+        out = StringIO()
+        call_command("purge_registration_tokens", stdout=out)
+        self.assertIn("3 used or expired tokens deleted.", out.getvalue())
+
+    def test_purge_job_is_scheduled_once_and_reschedules_itself(self):
+        call_command("purge_registration_tokens", schedule=True, stdout=StringIO())
+        call_command("purge_registration_tokens", schedule=True, stdout=StringIO())
+        job = Job.objects.get()
+        self.assertEqual(job.name, purge_registration_tokens.name)
 
-# Create your tests here.
+        job.delete()
+        purge_registration_tokens(*job.args)
+        self.assertEqual(RegistrationToken.objects.count(), 1)
+        self.assertGreater(Job.objects.get().run_at, timezone.now())
@@ -2,7 +2,7 @@ from datetime import timedelta
 
 from apps.purchase.models import RegistrationToken
 from django.contrib.auth.models import Group
-from django.core.mail import send_mail
+from django.db import transaction
 from django.http import Http404
 from django.shortcuts import redirect, render
 from django.urls import reverse
@@ -10,6 +10,7 @@ from django.utils import timezone
 from django.utils.crypto import get_random_string
 
 from .forms import PurchaseForm
+from .tasks import send_registration_link
 
 
 def purchase_view(request):
@@ -34,26 +35,21 @@ def purchase_create(request):
         # Set up a new token.
         crypted_token = get_random_string(length=32)
         expires_at = timezone.now() + timedelta(days=DAYS_TO_EXPIRE)
-        # Create a token object in db.
-        RegistrationToken.objects.create(
-            register_first_name=register_first_name,
-            register_last_name=register_last_name,
-            register_email=register_email,
-            register_group=register_group,
-            token=crypted_token,
-            expires_at=expires_at,
-        )
         registration_link = request.build_absolute_uri(
             reverse("condo_people:register", args=[crypted_token])
         )
-        send_mail(
-            subject="Your registration link",
-            message=f"Please, click on the following link to complete your Condo_Me registration: {registration_link}",
-            from_email="no-reply@condome.com",
-            # Have to colect from a form
-            recipient_list=[register_email],
-            fail_silently=False,
-        )
+        # The email is sent by a background task, queued along with the token
+        with transaction.atomic():
+            # Create a token object in db.
+            RegistrationToken.objects.create(
+                register_first_name=register_first_name,
+                register_last_name=register_last_name,
+                register_email=register_email,
+                register_group=register_group,
+                token=crypted_token,
+                expires_at=expires_at,
+            )
+            send_registration_link.delay(register_email, registration_link)
         return redirect(reverse("purchase:email_order"))
     return render(request, "purchase/pages/purchase.html", context={"form": form})
 
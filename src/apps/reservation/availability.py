@@ -0,0 +1,209 @@
+"""
+Availability engine for common areas.
+
+Reservations of a common area on a given day are kept in a sorted interval
+index (minutes since midnight), so "does this overlap?" and "which slots are
+free?" are answered with a binary search instead of scanning every
+reservation (except for edited reservations, see DayIndex.overlaps). Only
+exclusive reservations are indexed: shared ones (share_with_others) never
+conflict, as in the reservation_no_overlap constraint. Reservation.clean()
+checks new and edited reservations with is_available(), and the free slots of
+a day are served by views.free_slots.
+
+Indexes are built with a single query and stored through Django's cache
+framework, keyed by common area and date, but only when the cache is shared
+by every process (see project/caches.py). Cached indexes are never patched:
+the reservation signals (see signals.py) delete the index of every day whose
+reservations change, and delete it again when the transaction commits, so an
+index read by a concurrent request before the commit doesn't stay cached.
+Queryset ".update()" calls bypass signals, so entries also expire after
+INDEX_TIMEOUT seconds.
+"""
+
+import bisect
+from datetime import time
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from project.caches import is_shared
+from project.db_routers import use_primary
+
+INDEX_TIMEOUT = 60 * 60
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def to_time(minutes: int) -> time:
+    return time(hour=minutes // 60, minute=minutes % 60)
+
+
+def reservation_bounds(start_time, end_time) -> tuple[int, int]:
+    """
+    Returns (start, end) in minutes for a reservation. Whole day reservations
+    (no start or end time) take the entire day.
+    """
+    start = to_minutes(start_time) if start_time else 0
+    end = to_minutes(end_time) if end_time else MINUTES_PER_DAY
+    return start, end
+
+
+class DayIndex:
+    """
+    Sorted interval index of the reservations of one common area on one day.
+
+    Intervals are half-open [start, end) and kept sorted by start. A prefix
+    maximum of the end values lets overlaps() answer with a single bisect:
+    every interval starting before "end" is at positions [0, i), and one of
+    them overlaps if and only if the greatest end among them is after "start".
+    """
+
+    def __init__(self, intervals=()):
+        self._starts = []
+        self._ends = []
+        self._ids = []
+        self._max_ends = []
+        running = 0
+        for reservation_id, start, end in sorted(intervals, key=lambda i: i[1]):
+            running = max(running, end)
+            self._starts.append(start)
+            self._ends.append(end)
+            self._ids.append(reservation_id)
+            self._max_ends.append(running)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, reservation_id) -> bool:
+        return reservation_id in self._ids
+
+    def overlaps(self, start: int, end: int, exclude=None) -> bool:
+        """
+        Checks if [start, end) overlaps any indexed reservation, in O(log n).
+        "exclude" is the id of a reservation being edited, which must not
+        conflict with itself: when the bisect finds a possible overlap, the
+        reservations starting before "end" are then scanned, in O(n).
+        """
+        candidates = bisect.bisect_left(self._starts, end)
+        if not candidates or self._max_ends[candidates - 1] <= start:
+            return False
+        if exclude is None:
+            return True
+        return any(
+            self._ends[i] > start and self._ids[i] != exclude for i in range(candidates)
+        )
+
+
+def _index_key(common_area_id, day) -> str:
+    return f"reservation:availability:{common_area_id}:{day.isoformat()}"
+
+
+def build_day_index(common_area, day) -> DayIndex:
+    """Loads the exclusive reservations of common_area on day with a single query"""
+    rows = common_area.reservations.filter(
+        date=day, share_with_others=False
+    ).values_list("pk", "start_time", "end_time")
+    return DayIndex(
+        (pk, *reservation_bounds(start_time, end_time))
+        for pk, start_time, end_time in rows
+    )
+
+
+def get_day_index(common_area, day) -> DayIndex:
+    if not is_shared():
+        return build_day_index(common_area, day)
+    key = _index_key(common_area.pk, day)
+    index = cache.get(key)
+    if index is None:
+        # shared with every request: never cache what a lagging replica has
+        with use_primary():
+            index = build_day_index(common_area, day)
+        cache.set(key, index, INDEX_TIMEOUT)
+    return index
+
+
+def forget_day_index(common_area_id, day) -> None:
+    """
+    Deletes the cached index of a day whose reservations changed, now and
+    once the current transaction commits.
+    """
+    key = _index_key(common_area_id, day)
+    cache.delete(key)
+    transaction.on_commit(lambda: cache.delete(key))
+
+
+def is_available(common_area, day, start_time=None, end_time=None, exclude=None):
+    """
+    Checks if common_area is free on day between start_time and end_time.
+    Whole day areas (or missing times) are checked for the entire day.
+    """
+    if common_area.whole_day:
+        start_time = end_time = None
+    start, end = reservation_bounds(start_time, end_time)
+    return not get_day_index(common_area, day).overlaps(start, end, exclude=exclude)
+
+
+def slot_grid(common_area) -> list[tuple[int, int]]:
+    """
+    Returns the (start, end) minutes of every bookable slot of common_area in a
+    day. Slots follow the area opening hours in steps of minimum_using_minutes;
+    whole day areas have one single slot for the entire opening period.
+    """
+    opens_at = to_minutes(common_area.opens_at)
+    closes_at = to_minutes(common_area.closes_at)
+
+    if common_area.whole_day or not common_area.minimum_using_minutes:
+        return [(opens_at, closes_at)]
+
+    step = common_area.minimum_using_minutes
+    return [
+        (start, start + step) for start in range(opens_at, closes_at - step + 1, step)
+    ]
+
+
+def free_slots(common_area, day) -> list[tuple[time, time]]:
+    """Returns the (start, end) slots of common_area that are still free on day"""
+    index = get_day_index(common_area, day)
+    return [
+        (to_time(start), to_time(end))
+        for start, end in slot_grid(common_area)
+        if not index.overlaps(start, end)
+    ]
+
+
+def validate_window(common_area, start_time, end_time) -> None:
+    """
+    Validates a reservation period against the common area rules: opening
+    hours, minimum using minutes and maximum using time. Whole day areas have
+    no period to validate.
+    """
+    if common_area.whole_day:
+        return
+    if not start_time or not end_time:
+        raise ValidationError("Please, inform when your reservation starts and ends.")
+
+    start, end = to_minutes(start_time), to_minutes(end_time)
+    if end <= start:
+        raise ValidationError("Reservation must end after it starts.")
+    if start < to_minutes(common_area.opens_at) or end > to_minutes(
+        common_area.closes_at
+    ):
+        raise ValidationError(
+            f"{common_area.name} is only available from "
+            f"{common_area.opens_at:%H:%M} to {common_area.closes_at:%H:%M}."
+        )
+
+    minimum = common_area.minimum_using_minutes
+    if minimum and end - start < minimum:
+        raise ValidationError(
+            f"{common_area.name} must be reserved for at least {minimum} minutes."
+        )
+    maximum = common_area.maximum_using_time
+    if maximum and end - start > maximum:
+        raise ValidationError(
+            f"{common_area.name} may be reserved for at most {maximum} minutes."
+        )
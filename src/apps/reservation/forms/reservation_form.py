@@ -1,5 +1,7 @@
-from apps.reservation.models import Reservation
+from apps.reservation.models import OVERLAP_MESSAGE, Reservation
 from django import forms
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 
 
 class ReservationForm(forms.ModelForm):
@@ -13,3 +15,23 @@ class ReservationForm(forms.ModelForm):
             "end_time",
             "share_with_others",
         }
+
+    def save(self, commit=True):
+        """
+        Overlapping reservations are rejected by the database exclusion
+        constraint. Validation already checks it, but two concurrent requests may
+        both pass validation and only one insert succeeds: the other one gets the
+        same error as a failed validation, added to the form (which is invalid
+        from then on), and a ValidationError is raised so the caller re-renders
+        the form instead of going on without a reservation.
+        """
+        if not commit:
+            return super().save(commit=False)
+        try:
+            with transaction.atomic():
+                return super().save(commit=True)
+        except IntegrityError as error:
+            if not Reservation.is_overlap_violation(error):
+                raise
+            self.add_error(None, OVERLAP_MESSAGE)
+            raise ValidationError(OVERLAP_MESSAGE, code="overlap") from error
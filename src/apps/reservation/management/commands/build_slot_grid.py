@@ -0,0 +1,58 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.reservation.models import CommonAreaSlot
+from apps.reservation.tasks import SLOT_GRID_DAYS, build_slot_grid
+
+
+class Command(BaseCommand):
+    help = (
+        "Materializes the bookable slots of every common area for a rolling window "
+        "of days and recounts their booked counters, or with --schedule queues "
+        "the background job doing it every day."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=SLOT_GRID_DAYS,
+            help="Number of days (starting today) to build slots for.",
+        )
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Drop the slots of the window first (e.g. opening hours changed).",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--schedule",
+            action="store_true",
+            help="Queue the daily slot grid job (if it is not queued yet) and exit.",
+        )
+
+    def handle(self, *args, **options):
+        if options["schedule"]:
+            job = build_slot_grid.schedule_once(timezone.now(), options["days"])
+            if job is None:
+                self.stdout.write("The daily slot grid job is already queued.")
+            else:
+                self.stdout.write(self.style.SUCCESS("Daily slot grid job queued."))
+            return
+
+        first_day = timezone.localdate()
+        last_day = first_day + timedelta(days=options["days"] - 1)
+        expired = CommonAreaSlot.objects.build_window(
+            first_day,
+            options["days"],
+            rebuild=options["rebuild"],
+            batch_size=options["batch_size"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Slot grid ready from {first_day} to {last_day} "
+                f"({expired} expired slots removed)."
+            )
+        )
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:50
+
+import django.contrib.postgres.constraints
+from django.conf import settings
+from django.contrib.postgres.operations import BtreeGistExtension
+from django.db import migrations, models
+
+import apps.reservation.models
+
+# frozen copy of the SQL of apps.reservation.models.ReservationPeriod
+PERIOD = (
+    "TSRANGE({0}.date + COALESCE({0}.start_time, TIME '00:00'), "
+    "COALESCE({0}.date + {0}.end_time, {0}.date + 1), '[)')"
+)
+
+
+def check_overlaps(apps, schema_editor):
+    """Fails with a readable list instead of an error adding the constraint"""
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT a.common_area_id, a.date, a.id, b.id "
+            "FROM reservation_reservation a "
+            "JOIN reservation_reservation b "
+            "ON a.common_area_id = b.common_area_id AND a.id < b.id "
+            "WHERE NOT a.share_with_others AND NOT b.share_with_others "
+            f"AND {PERIOD.format('a')} && {PERIOD.format('b')} "
+            "ORDER BY a.common_area_id, a.date, a.id, b.id"
+        )
+        overlaps = [
+            f"common area {common_area_id} on {date}: reservations {first} and {second}"
+            for common_area_id, date, first, second in cursor.fetchall()
+        ]
+    if overlaps:
+        raise RuntimeError(
+            "Reservations of the same common area must not overlap before "
+            "migrating, share or move one of each pair:\n" + "\n".join(overlaps)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0002_alter_commonarea_options_and_more"),
+        ("reservation", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(check_overlaps, migrations.RunPython.noop),
+        BtreeGistExtension(),
+        migrations.AddConstraint(
+            model_name="reservation",
+            constraint=django.contrib.postgres.constraints.ExclusionConstraint(
+                condition=models.Q(("share_with_others", False)),
+                expressions=[
+                    ("common_area", "="),
+                    (apps.reservation.models.ReservationPeriod(), "&&"),
+                ],
+                name="reservation_no_overlap",
+                violation_error_message="This common area is already reserved for the selected period. Please, choose a different time.",
+            ),
+        ),
+    ]
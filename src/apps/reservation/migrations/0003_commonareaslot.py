@@ -0,0 +1,50 @@
+# Generated by Django 5.1.15 on 2026-10-17 19:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("condo", "0002_alter_commonarea_options_and_more"),
+        ("reservation", "0002_reservation_no_overlap"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CommonAreaSlot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("starts_at", models.TimeField()),
+                ("ends_at", models.TimeField()),
+                ("booked", models.PositiveIntegerField(default=0)),
+                (
+                    "common_area",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="slots",
+                        to="condo.commonarea",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date", "starts_at"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("common_area", "date", "starts_at"),
+                        name="unique_common_area_slot",
+                    )
+                ],
+            },
+        ),
+    ]
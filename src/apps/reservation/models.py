@@ -1,7 +1,50 @@
+from datetime import timedelta
+
 from apps.condo.models import CommonArea, Condominium
+from apps.reservation import availability
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.constraints import ExclusionConstraint
+from django.contrib.postgres.fields import DateTimeRangeField, RangeOperators
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+OVERLAP_CONSTRAINT = "reservation_no_overlap"
+OVERLAP_MESSAGE = (
+    "This common area is already reserved for the selected period. Please, "
+    "choose a different time."
+)
+
+
+class ReservationPeriod(models.Func):
+    """
+    PostgreSQL tsrange covering a reservation: [date + start_time, date + end_time).
+    Whole day reservations (no start and/or end time) take the entire date.
+    """
+
+    arity = 3
+    output_field = DateTimeRangeField()
+
+    def __init__(self, date="date", start_time="start_time", end_time="end_time"):
+        super().__init__(date, start_time, end_time)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        (date, date_params), (start, start_params), (end, end_params) = (
+            compiler.compile(expression) for expression in self.get_source_expressions()
+        )
+        sql = (
+            f"TSRANGE(({date})::date + COALESCE(({start})::time, TIME '00:00'), "
+            f"COALESCE(({date})::date + ({end})::time, ({date})::date + 1), '[)')"
+        )
+        params = (
+            *date_params,
+            *start_params,
+            *date_params,
+            *end_params,
+            *date_params,
+        )
+        return sql, params
 
 
 class Reservation(models.Model):
@@ -38,6 +81,30 @@ class Reservation(models.Model):
                 "No need to fill start and end fields. The common area you \
                     selected can only be reserved for the entire day of use."
             )
+        availability.validate_window(self.common_area, self.start_time, self.end_time)
+        if (
+            self.date
+            and not self.share_with_others
+            and not availability.is_available(
+                self.common_area,
+                self.date,
+                self.start_time,
+                self.end_time,
+                exclude=self.pk,
+            )
+        ):
+            raise ValidationError(OVERLAP_MESSAGE, code="overlap")
+
+    def get_constraints(self):
+        # the overlap constraint is validated by clean(), through the (cached)
+        # availability index; the database still enforces it on save
+        return [
+            (
+                model,
+                [c for c in constraints if c.name != OVERLAP_CONSTRAINT],
+            )
+            for model, constraints in super().get_constraints()
+        ]
 
     def get_apartments(self):
         users = self.user.all()
@@ -45,5 +112,145 @@ class Reservation(models.Model):
 
     get_apartments.short_description = "Apartments"
 
+    @staticmethod
+    def is_overlap_violation(error) -> bool:
+        """
+        Checks if an IntegrityError was raised by the non-overlap exclusion
+        constraint (SQLSTATE 23P01), i.e. a concurrent double-booking.
+        """
+        cause = error.__cause__
+        sqlstate = getattr(cause, "pgcode", None) or getattr(cause, "sqlstate", None)
+        constraint = getattr(getattr(cause, "diag", None), "constraint_name", None)
+        return sqlstate == "23P01" and constraint == OVERLAP_CONSTRAINT
+
+    class Meta:
+        app_label = "reservation"
+        constraints = [
+            # Non-shared reservations of the same common area must not overlap.
+            # Checked by PostgreSQL through a GiST index (btree_gist provides the
+            # "=" operator class for common_area), so concurrent bookings are
+            # safe without table locks.
+            ExclusionConstraint(
+                name=OVERLAP_CONSTRAINT,
+                expressions=[
+                    ("common_area", RangeOperators.EQUAL),
+                    (ReservationPeriod(), RangeOperators.OVERLAPS),
+                ],
+                condition=models.Q(share_with_others=False),
+                violation_error_message=OVERLAP_MESSAGE,
+            ),
+        ]
+
+
+class CommonAreaSlotQuerySet(models.QuerySet):
+    def for_period(self, common_area, first_day, last_day):
+        """Slots of common_area between first_day and last_day (inclusive)"""
+        return self.filter(
+            common_area=common_area, date__range=(first_day, last_day)
+        ).order_by("date", "starts_at")
+
+    def overlapping(self, common_area_id, date, start_time, end_time):
+        """
+        Slots covered by a reservation. Whole day reservations (no start and/or
+        end time) cover every slot of the date.
+        """
+        slots = self.filter(common_area_id=common_area_id, date=date)
+        if start_time:
+            slots = slots.filter(ends_at__gt=start_time)
+        if end_time:
+            slots = slots.filter(starts_at__lt=end_time)
+        return slots
+
+    def book(self, common_area_id, date, start_time, end_time, delta=1):
+        """Atomically adds delta to the booked counter of the covered slots"""
+        slots = self.overlapping(common_area_id, date, start_time, end_time)
+        if delta < 0:
+            slots = slots.filter(booked__gte=-delta)
+        return slots.update(booked=F("booked") + delta)
+
+    def build_window(self, first_day, days: int, rebuild=False, batch_size=1000):
+        """
+        Materializes the slots of every common area from first_day, for "days"
+        days, and recounts their booked counters. Existing slots are kept
+        unless rebuild (e.g. opening hours changed) and slots of past days are
+        deleted. Returns the number of deleted past slots.
+        """
+        last_day = first_day + timedelta(days=days - 1)
+        window = self.filter(date__range=(first_day, last_day))
+        with transaction.atomic():
+            # slots in the past are never read again
+            expired, _ = self.filter(date__lt=first_day).delete()
+            if rebuild:
+                window.delete()
+
+            for common_area in CommonArea.objects.iterator():
+                grid = availability.slot_grid(common_area)
+                slots = [
+                    CommonAreaSlot(
+                        common_area=common_area,
+                        date=first_day + timedelta(days=n),
+                        starts_at=availability.to_time(start),
+                        ends_at=availability.to_time(end),
+                    )
+                    for n in range(days)
+                    for start, end in grid
+                ]
+                # existing slots are kept as they are (unique on area/date/start)
+                self.bulk_create(slots, batch_size=batch_size, ignore_conflicts=True)
+            window.recount()
+        return expired
+
+    def recount(self):
+        """
+        Recomputes the booked counter of every slot in this queryset from the
+        reservations table, in a single UPDATE statement.
+        """
+        covering_reservations = (
+            Reservation.objects.filter(
+                common_area=OuterRef("common_area"), date=OuterRef("date")
+            )
+            .filter(Q(start_time__isnull=True) | Q(start_time__lt=OuterRef("ends_at")))
+            .filter(Q(end_time__isnull=True) | Q(end_time__gt=OuterRef("starts_at")))
+            .order_by()
+            .values("common_area")
+            .annotate(total=Count("pk"))
+            .values("total")
+        )
+        return self.update(booked=Coalesce(Subquery(covering_reservations), 0))
+
+
+class CommonAreaSlot(models.Model):
+    """
+    Precomputed bookable slot of a common area on a given date.
+
+    The grid is materialized for a rolling window by the build_slot_grid task,
+    rescheduling itself every day (see "manage.py build_slot_grid --schedule"),
+    so the calendar reads slots with one indexed range scan on (common_area,
+    date) instead of recomputing them from reservations. "booked" counts the
+    reservations covering the slot and is kept up to date by the reservation
+    signals.
+    """
+
+    common_area = models.ForeignKey(
+        to=CommonArea, on_delete=models.CASCADE, related_name="slots"
+    )
+    date = models.DateField()
+    starts_at = models.TimeField()
+    ends_at = models.TimeField()
+    booked = models.PositiveIntegerField(default=0)
+
+    objects = CommonAreaSlotQuerySet.as_manager()
+
+    def __str__(self) -> str:
+        return f"{self.common_area} {self.date} {self.starts_at:%H:%M}"
+
     class Meta:
         app_label = "reservation"
+        ordering = ["date", "starts_at"]
+        constraints = [
+            # also the index used by the calendar range scans
+            models.UniqueConstraint(
+                fields=["common_area", "date", "starts_at"],
+                name="unique_common_area_slot",
+            ),
+        ]
@@ -0,0 +1,56 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from apps.reservation import availability
+from apps.reservation.models import CommonAreaSlot, Reservation
+
+
+@receiver(pre_save, sender=Reservation)
+def remember_previous_booking(sender, instance, using, **kwargs):
+    """
+    Keeps the stored common area, date and times of an edited reservation, so
+    post_save handlers can update whatever was computed from the old values.
+    They are read from the database being written, never from a replica.
+    """
+    instance._previous_booking = None
+    if not instance._state.adding:
+        instance._previous_booking = (
+            sender.objects.using(using)
+            .filter(pk=instance.pk)
+            .values_list("common_area_id", "date", "start_time", "end_time")
+            .first()
+        )
+
+
+@receiver(post_save, sender=Reservation)
+def forget_availability_index(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_booking", None)
+    if previous is not None:
+        availability.forget_day_index(*previous[:2])
+    availability.forget_day_index(instance.common_area_id, instance.date)
+
+
+@receiver(post_save, sender=Reservation)
+def update_slot_counters(sender, instance, **kwargs):
+    previous = getattr(instance, "_previous_booking", None)
+    if previous is not None:
+        CommonAreaSlot.objects.book(*previous, delta=-1)
+    CommonAreaSlot.objects.book(
+        instance.common_area_id, instance.date, instance.start_time, instance.end_time
+    )
+
+
+@receiver(post_delete, sender=Reservation)
+def forget_availability_index_on_delete(sender, instance, **kwargs):
+    availability.forget_day_index(instance.common_area_id, instance.date)
+
+
+@receiver(post_delete, sender=Reservation)
+def release_slot_counters(sender, instance, **kwargs):
+    CommonAreaSlot.objects.book(
+        instance.common_area_id,
+        instance.date,
+        instance.start_time,
+        instance.end_time,
+        delta=-1,
+    )
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from apps.reservation.models import CommonAreaSlot
+from apps.tasks.queue import task
+
+SLOT_GRID_DAYS = 30
+SLOT_GRID_INTERVAL = timedelta(days=1)
+
+
+@task
+def build_slot_grid(days: int = SLOT_GRID_DAYS) -> None:
+    """
+    Extends the slot grid to the next "days" days (dropping past ones), then
+    schedules itself again for the next day (see "manage.py build_slot_grid
+    --schedule").
+    """
+    CommonAreaSlot.objects.build_window(timezone.localdate(), days)
+    build_slot_grid.schedule_once(timezone.now() + SLOT_GRID_INTERVAL, days)
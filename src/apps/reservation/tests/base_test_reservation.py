@@ -0,0 +1,79 @@
+from datetime import date, time
+
+from django.test import TestCase
+
+from apps.condo.models import CommonArea, Condominium
+from apps.reservation.models import Reservation
+
+
+class ReservationTestBase(TestCase):
+    """
+    Base test case for reservations.
+    Creates a condominium with a "BBQ Grill" common area, open from
+    grill_opens_at to grill_closes_at, and a default day to book it.
+    Methods:
+        create_party_room(condominium):
+            Creates and returns a whole day common area (of the condominium of
+            the test unless told otherwise).
+        reserve(start_time, end_time, common_area, day, share_with_others):
+            Creates and returns a reservation, of the grill and on the default
+            day unless told otherwise.
+    """
+
+    grill_opens_at = time(10, 0)
+    grill_closes_at = time(14, 0)
+    grill_maximum_using_fraction = 4
+    day = date(2025, 3, 23)
+
+    def setUp(self):
+        super().setUp()
+        self.condominium = Condominium.objects.create(
+            name="MyCondo",
+            description="Good Condo",
+            cnpj="15306944000169",
+            address1="My Street, 10",
+            address2="Wonderland",
+            city="Soma City",
+            state="Wellness State",
+            country="BR",
+            postal_code="88456123",
+        )
+        self.grill = CommonArea.objects.create(
+            name="BBQ Grill",
+            condominium=self.condominium,
+            description="Clean it after use",
+            opens_at=self.grill_opens_at,
+            closes_at=self.grill_closes_at,
+            whole_day=False,
+            paid_area=False,
+            minimum_using_minutes=60,
+            maximum_using_fraction=self.grill_maximum_using_fraction,
+        )
+
+    def create_party_room(self, condominium=None):
+        return CommonArea.objects.create(
+            name="Party Room",
+            condominium=condominium or self.condominium,
+            description="No loud music after 22h",
+            opens_at=time(9, 0),
+            closes_at=time(23, 0),
+            whole_day=True,
+            paid_area=False,
+        )
+
+    def reserve(
+        self,
+        start_time,
+        end_time,
+        common_area=None,
+        day=None,
+        share_with_others=False,
+    ):
+        return Reservation.objects.create(
+            condominium=self.condominium,
+            common_area=common_area or self.grill,
+            date=day or self.day,
+            start_time=start_time,
+            end_time=end_time,
+            share_with_others=share_with_others,
+        )
@@ -0,0 +1,134 @@
+from datetime import time
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from apps.reservation import availability
+from apps.reservation.availability import DayIndex
+from apps.reservation.models import OVERLAP_MESSAGE, Reservation
+from apps.reservation.tests.base_test_reservation import ReservationTestBase
+
+
+class DayIndexTest(SimpleTestCase):
+    def setUp(self):
+        # 08:00-09:00, 10:00-12:00 and 11:00-11:30 (a shared overlap)
+        self.index = DayIndex([(2, 600, 720), (1, 480, 540), (3, 660, 690)])
+
+    def test_overlaps_detects_conflicts_and_free_gaps(self):
+        self.assertTrue(self.index.overlaps(500, 520))
+        self.assertTrue(self.index.overlaps(700, 800))
+        self.assertFalse(self.index.overlaps(540, 600))
+        self.assertFalse(self.index.overlaps(720, 780))
+
+    def test_overlaps_ignores_excluded_reservation(self):
+        self.assertFalse(self.index.overlaps(480, 540, exclude=1))
+        self.assertTrue(self.index.overlaps(650, 700, exclude=2))
+
+    def test_index_keeps_every_reservation(self):
+        self.assertEqual(len(self.index), 3)
+        self.assertIn(3, self.index)
+        self.assertNotIn(4, self.index)
+
+
+class AvailabilityEngineTest(ReservationTestBase):
+    grill_closes_at = time(13, 0)
+    grill_maximum_using_fraction = 2
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+    def test_free_slots_follow_opening_hours_and_reservations(self):
+        self.assertEqual(
+            availability.free_slots(self.grill, self.day),
+            [
+                (time(10, 0), time(11, 0)),
+                (time(11, 0), time(12, 0)),
+                (time(12, 0), time(13, 0)),
+            ],
+        )
+        self.reserve(time(11, 0), time(12, 0))
+        self.assertEqual(
+            availability.free_slots(self.grill, self.day),
+            [(time(10, 0), time(11, 0)), (time(12, 0), time(13, 0))],
+        )
+
+    @mock.patch("apps.reservation.availability.is_shared", return_value=True)
+    def test_cached_index_is_forgotten_on_create_edit_and_delete(self, is_shared):
+        # build the index before any reservation exists
+        self.assertTrue(
+            availability.is_available(self.grill, self.day, time(10, 0), time(11, 0))
+        )
+        reservation = self.reserve(time(10, 0), time(11, 0))
+        self.assertFalse(
+            availability.is_available(self.grill, self.day, time(10, 0), time(11, 0))
+        )
+
+        reservation.start_time, reservation.end_time = time(11, 0), time(12, 0)
+        reservation.save()
+        self.assertTrue(
+            availability.is_available(self.grill, self.day, time(10, 0), time(11, 0))
+        )
+        self.assertFalse(
+            availability.is_available(self.grill, self.day, time(11, 0), time(12, 0))
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            reservation.delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(len(availability.get_day_index(self.grill, self.day)), 0)
+        with self.assertNumQueries(0):
+            availability.get_day_index(self.grill, self.day)
+
+    def test_index_is_not_kept_in_a_local_memory_cache(self):
+        availability.get_day_index(self.grill, self.day)
+        with self.assertNumQueries(1):
+            availability.get_day_index(self.grill, self.day)
+
+    def test_whole_day_reservation_blocks_the_whole_day(self):
+        party_room = self.create_party_room()
+        self.assertEqual(
+            availability.free_slots(party_room, self.day),
+            [(time(9, 0), time(23, 0))],
+        )
+        self.reserve(None, None, common_area=party_room)
+        self.assertEqual(availability.free_slots(party_room, self.day), [])
+
+    def test_clean_rejects_reservations_overlapping_exclusive_ones(self):
+        booked = self.reserve(time(10, 0), time(12, 0))
+        shared = self.reserve(time(12, 0), time(13, 0), share_with_others=True)
+        reservation = Reservation(
+            condominium=self.condominium,
+            common_area=self.grill,
+            date=self.day,
+            start_time=time(11, 0),
+            end_time=time(12, 0),
+            share_with_others=False,
+        )
+        with self.assertRaisesMessage(ValidationError, OVERLAP_MESSAGE):
+            reservation.full_clean()
+
+        # shared reservations neither conflict nor are conflicted with
+        reservation.share_with_others = True
+        reservation.full_clean()
+        reservation.share_with_others = False
+        reservation.start_time = time(12, 0)
+        reservation.end_time = time(13, 0)
+        reservation.full_clean()
+
+        # an edited reservation does not conflict with itself
+        booked.end_time = time(11, 0)
+        booked.full_clean()
+        shared.full_clean()
+
+    def test_validate_window_enforces_common_area_rules(self):
+        with self.assertRaises(ValidationError):
+            availability.validate_window(self.grill, time(9, 0), time(10, 0))
+        with self.assertRaises(ValidationError):
+            availability.validate_window(self.grill, time(10, 0), time(10, 30))
+        with self.assertRaises(ValidationError):
+            # maximum using time is 60 * 2 minutes
+            availability.validate_window(self.grill, time(10, 0), time(13, 0))
+        availability.validate_window(self.grill, time(10, 0), time(12, 0))
@@ -0,0 +1,64 @@
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from apps.reservation.forms.reservation_form import ReservationForm
+from apps.reservation.models import OVERLAP_MESSAGE, Reservation
+from apps.reservation.tests.base_test_reservation import ReservationTestBase
+
+
+class ReservationOverlapConstraintTest(ReservationTestBase):
+    grill_opens_at = time(8, 0)
+    grill_closes_at = time(22, 0)
+
+    def test_overlapping_reservations_are_rejected_by_database(self):
+        self.reserve(time(10, 0), time(12, 0))
+        with self.assertRaises(IntegrityError) as context, transaction.atomic():
+            self.reserve(time(11, 0), time(13, 0))
+        self.assertTrue(Reservation.is_overlap_violation(context.exception))
+
+    def test_adjacent_and_shared_reservations_are_accepted(self):
+        self.reserve(time(10, 0), time(12, 0))
+        self.reserve(time(12, 0), time(14, 0))
+        self.reserve(time(10, 0), time(12, 0), share_with_others=True)
+        self.assertEqual(Reservation.objects.count(), 3)
+
+    def build_form(self):
+        user = get_user_model().objects.create_user(
+            first_name="John",
+            last_name="Doe",
+            email="johndoe@dummy.com",
+            username="johndoe",
+            password="P@ssw0rd",
+        )
+        return ReservationForm(
+            data={
+                "user": [user.pk],
+                "common_area": self.grill.pk,
+                "date": self.day,
+                "start_time": "10:00",
+                "end_time": "11:00",
+                "share_with_others": False,
+            },
+            instance=Reservation(condominium=self.condominium),
+        )
+
+    def test_form_validation_reports_overlapping_reservation(self):
+        self.reserve(time(9, 0), time(10, 30))
+        form = self.build_form()
+        self.assertFalse(form.is_valid())
+        self.assertIn(OVERLAP_MESSAGE, form.non_field_errors())
+
+    def test_form_turns_concurrent_double_booking_into_form_error(self):
+        form = self.build_form()
+        self.assertTrue(form.is_valid())
+
+        # another resident books the same period after validation
+        self.reserve(time(10, 0), time(11, 0))
+
+        with self.assertRaises(ValidationError):
+            form.save()
+        self.assertFalse(form.is_valid())
+        self.assertIn(OVERLAP_MESSAGE, form.non_field_errors())
@@ -0,0 +1,63 @@
+from datetime import time, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.utils import timezone
+
+from apps.reservation.models import CommonAreaSlot
+from apps.reservation.tasks import build_slot_grid
+from apps.reservation.tests.base_test_reservation import ReservationTestBase
+from apps.tasks.models import Job
+
+
+class CommonAreaSlotTest(ReservationTestBase):
+    def setUp(self):
+        super().setUp()
+        self.today = timezone.localdate()
+
+    def booked_slots(self, day=None):
+        day = day or self.today
+        return list(
+            CommonAreaSlot.objects.for_period(self.grill, day, day)
+            .filter(booked__gt=0)
+            .values_list("starts_at", flat=True)
+        )
+
+    def test_build_slot_grid_creates_window_and_counts_existing_reservations(self):
+        self.reserve(time(10, 0), time(12, 0), day=self.today)
+        call_command("build_slot_grid", days=7, stdout=StringIO())
+
+        self.assertEqual(CommonAreaSlot.objects.count(), 7 * 4)
+        self.assertEqual(self.booked_slots(), [time(10, 0), time(11, 0)])
+
+        # running it again keeps the grid as it is
+        call_command("build_slot_grid", days=7, stdout=StringIO())
+        self.assertEqual(CommonAreaSlot.objects.count(), 7 * 4)
+
+    def test_booked_counter_follows_reservation_changes(self):
+        call_command("build_slot_grid", days=2, stdout=StringIO())
+
+        reservation = self.reserve(time(12, 0), time(13, 0), day=self.today)
+        self.assertEqual(self.booked_slots(), [time(12, 0)])
+
+        tomorrow = self.today + timedelta(days=1)
+        reservation.date = tomorrow
+        reservation.save()
+        self.assertEqual(self.booked_slots(), [])
+        self.assertEqual(self.booked_slots(tomorrow), [time(12, 0)])
+
+        reservation.delete()
+        self.assertEqual(self.booked_slots(tomorrow), [])
+
+    def test_slot_grid_job_is_scheduled_once_and_reschedules_itself(self):
+        call_command("build_slot_grid", schedule=True, days=2, stdout=StringIO())
+        call_command("build_slot_grid", schedule=True, days=2, stdout=StringIO())
+        job = Job.objects.get()
+        self.assertEqual(job.name, build_slot_grid.name)
+
+        job.delete()
+        self.reserve(time(10, 0), time(11, 0), day=self.today)
+        build_slot_grid(*job.args)
+        self.assertEqual(CommonAreaSlot.objects.count(), 2 * 4)
+        self.assertEqual(self.booked_slots(), [time(10, 0)])
+        self.assertGreater(Job.objects.get().run_at, timezone.now())
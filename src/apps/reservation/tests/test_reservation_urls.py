@@ -6,3 +6,12 @@ class ReservationURLsTest(TestCase):
     def test_reservation_url_is_correct(self):
         reservation_url = reverse("reservation:reserve")
         self.assertEqual(reservation_url, "/reservation/")
+
+    def test_free_slots_url_is_correct(self):
+        common_area_id = "c7c2a8a4-2f55-4d5e-9a0e-63c5b8f1f0b5"
+        free_slots_url = reverse(
+            "reservation:free_slots", args=(common_area_id, 2025, 3, 23)
+        )
+        self.assertEqual(
+            free_slots_url, f"/reservation/free_slots/{common_area_id}/2025/3/23/"
+        )
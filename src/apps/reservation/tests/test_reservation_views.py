@@ -0,0 +1,58 @@
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from apps.condo.models import Condominium
+from apps.reservation.tests.base_test_reservation import ReservationTestBase
+
+
+class FreeSlotsViewTest(ReservationTestBase):
+    grill_closes_at = time(13, 0)
+
+    def setUp(self):
+        super().setUp()
+        get_user_model().objects.create_user(
+            first_name="John",
+            last_name="Doe",
+            email="johndoe@dummy.com",
+            username="johndoe",
+            password="P@ssw0rd",
+            condominium=self.condominium,
+        )
+        self.client.login(username="johndoe", password="P@ssw0rd")
+
+    def url(self, common_area=None, year=2025, month=3, day=23):
+        common_area = common_area or self.grill
+        return reverse(
+            "reservation:free_slots", args=(common_area.pk, year, month, day)
+        )
+
+    def test_free_slots_leave_out_exclusive_reservations_only(self):
+        self.reserve(time(10, 0), time(11, 0))
+        self.reserve(time(12, 0), time(13, 0), share_with_others=True)
+
+        data = self.client.get(self.url()).json()
+
+        self.assertEqual(data["date"], "2025-03-23")
+        self.assertEqual(
+            data["free_slots"],
+            [{"start": "11:00", "end": "12:00"}, {"start": "12:00", "end": "13:00"}],
+        )
+
+    def test_free_slots_raise_404_for_other_condominiums_and_invalid_dates(self):
+        other_condominium = Condominium.objects.create(
+            name="OtherCondo",
+            description="Another Condo",
+            cnpj="39053118000113",
+            address1="Other Street, 20",
+            address2="Wonderland",
+            city="Soma City",
+            state="Wellness State",
+            country="BR",
+            postal_code="88456123",
+        )
+        other_party_room = self.create_party_room(other_condominium)
+
+        self.assertEqual(self.client.get(self.url(other_party_room)).status_code, 404)
+        self.assertEqual(self.client.get(self.url(day=32)).status_code, 404)
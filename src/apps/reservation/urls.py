@@ -6,4 +6,9 @@ app_name = "reservation"
 
 urlpatterns = [
     path("", views.make_reservation, name="reserve"),
+    path(
+        "free_slots/<uuid:common_area_id>/<int:year>/<int:month>/<int:day>/",
+        views.free_slots,
+        name="free_slots",
+    ),
 ]
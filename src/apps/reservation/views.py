@@ -1,4 +1,11 @@
-from django.shortcuts import render
+from datetime import date
+
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404, render
+
+from apps.condo.models import CommonArea
+from apps.reservation import availability
 
 from .forms.reservation_form import ReservationForm
 
@@ -10,3 +17,28 @@ def make_reservation(request):
         template_name="reservation/pages/reservation.html",
         context={"form": form},
     )
+
+
+@login_required(redirect_field_name="redirect_to", login_url="/condo_people/login")
+def free_slots(request, common_area_id, year, month, day):
+    """
+    Free slots of a common area of the user's condominium on a day, as JSON,
+    answered by the availability index (see availability.py).
+    """
+    try:
+        day = date(year, month, day)
+    except (ValueError, OverflowError):
+        raise Http404("Invalid date.")
+    common_area = get_object_or_404(
+        CommonArea, pk=common_area_id, condominium=request.user.condominium_id
+    )
+    return JsonResponse(
+        {
+            "common_area": str(common_area.pk),
+            "date": day.isoformat(),
+            "free_slots": [
+                {"start": f"{start:%H:%M}", "end": f"{end:%H:%M}"}
+                for start, end in availability.free_slots(common_area, day)
+            ],
+        }
+    )
@@ -0,0 +1,21 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from apps.tasks.models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ["name", "status", "attempts", "max_attempts", "run_at"]
+    list_filter = ["status", "name"]
+    readonly_fields = ["created_at", "updated_at", "locked_until", "last_error"]
+    actions = ["retry"]
+
+    @admin.action(description="Queue selected jobs again")
+    def retry(self, request, queryset):
+        queryset.update(
+            status=Job.Status.QUEUED,
+            attempts=0,
+            run_at=timezone.now(),
+            locked_until=None,
+        )
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
+
+
+class TasksConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "apps.tasks"
+    verbose_name = "Background tasks"
+
+    def ready(self) -> None:
+        # registers the @task functions of every app (their "tasks" module)
+        autodiscover_modules("tasks")
@@ -0,0 +1,118 @@
+import logging
+import signal
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.tasks.models import Job
+from apps.tasks.queue import run_job
+
+logger = logging.getLogger(__name__)
+
+
+def _run_job_in_thread(job: Job) -> bool:
+    try:
+        return run_job(job)
+    finally:
+        # each pool thread has its own connection, don't keep it idle
+        connections.close_all()
+
+
+def _outcome(future, job: Job) -> bool:
+    try:
+        return future.result()
+    except Exception:
+        # run_job could not record the outcome (e.g. the database connection
+        # was lost): the job is taken again once its visibility timeout expires
+        logger.exception("Job %s (%s) raised in the worker", job.pk, job.name)
+        return False
+
+
+class Command(BaseCommand):
+    help = (
+        "Runs queued background tasks (see apps/tasks/queue.py) until SIGTERM or "
+        "SIGINT, finishing the running ones before exiting."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.TASKS_CONCURRENCY,
+            help="Number of jobs run at the same time (threads).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before looking for jobs when the queue is empty.",
+        )
+        parser.add_argument(
+            "--visibility-timeout",
+            type=int,
+            default=settings.TASKS_VISIBILITY_TIMEOUT,
+            help="Seconds after which a running job is considered lost and is "
+            "run again by another worker.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once there are no ready jobs left.",
+        )
+
+    def handle(self, *args, **options):
+        concurrency = options["concurrency"]
+        stop = threading.Event()
+        previous_handlers = {
+            signum: signal.signal(signum, lambda *_: stop.set())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        succeeded = failed = 0
+        try:
+            with ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix="task"
+            ) as pool:
+                running = {}  # future: job
+                while not stop.is_set():
+                    done = [future for future in running if future.done()]
+                    outcomes = [
+                        _outcome(future, running.pop(future)) for future in done
+                    ]
+                    succeeded += sum(outcomes)
+                    failed += len(outcomes) - sum(outcomes)
+
+                    jobs = []
+                    if len(running) < concurrency:
+                        jobs = Job.objects.claim(
+                            concurrency - len(running), options["visibility_timeout"]
+                        )
+                    running.update(
+                        (pool.submit(_run_job_in_thread, job), job) for job in jobs
+                    )
+
+                    if not jobs:
+                        if options["burst"] and not running:
+                            break
+                        if running:
+                            wait(
+                                running,
+                                timeout=options["poll_interval"],
+                                return_when=FIRST_COMPLETED,
+                            )
+                        else:
+                            stop.wait(options["poll_interval"])
+                # leaving the "with" waits for the running jobs
+            outcomes = [_outcome(future, job) for future, job in running.items()]
+            succeeded += sum(outcomes)
+            failed += len(outcomes) - sum(outcomes)
+        finally:
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+            connections.close_all()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{succeeded} jobs succeeded, {failed} failed.")
+        )
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+class JobQuerySet(models.QuerySet):
+    def ready(self, now=None):
+        """
+        Jobs that can be taken by a worker: queued ones whose time has come, and
+        running ones whose worker did not finish them in time (crashed or was
+        killed), i.e. the visibility timeout expired.
+        """
+        now = now or timezone.now()
+        return self.filter(
+            Q(status=Job.Status.QUEUED, run_at__lte=now)
+            | Q(status=Job.Status.RUNNING, locked_until__lte=now)
+        )
+
+    def claim(self, limit: int, visibility_timeout: int) -> list["Job"]:
+        """
+        Marks up to "limit" ready jobs as running, for visibility_timeout
+        seconds, and returns them. Rows locked by other workers are skipped
+        (FOR UPDATE SKIP LOCKED), so any number of workers can claim jobs
+        concurrently without waiting for each other or taking the same job.
+        """
+        now = timezone.now()
+        with transaction.atomic():
+            ids = list(
+                self.ready(now)
+                .select_for_update(skip_locked=True)
+                .order_by("run_at")
+                .values_list("pk", flat=True)[:limit]
+            )
+            if not ids:
+                return []
+            self.filter(pk__in=ids).update(
+                status=Job.Status.RUNNING,
+                locked_until=now + timedelta(seconds=visibility_timeout),
+                attempts=F("attempts") + 1,
+                updated_at=now,
+            )
+            return list(self.filter(pk__in=ids).order_by("run_at"))
+
+
+class Job(models.Model):
+    """
+    A call of a @task function (see queue.py) to be run by "manage.py
+    run_worker". Jobs are deleted once they succeed; failed ones are kept
+    for inspection and can be queued again from the admin.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        FAILED = "failed", "Failed"
+
+    name = models.CharField(max_length=200)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.QUEUED
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    # a running job is given back to the queue after this moment
+    locked_until = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = JobQuerySet.as_manager()
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    class Meta:
+        app_label = "tasks"
+        indexes = [
+            # what workers poll: failed jobs (kept around) are left out
+            models.Index(
+                fields=["run_at"],
+                condition=Q(status__in=["queued", "running"]),
+                name="tasks_job_pending_idx",
+            ),
+        ]
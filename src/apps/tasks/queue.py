@@ -0,0 +1,130 @@
+"""
+PostgreSQL backed task queue.
+
+Functions decorated with @task (in the "tasks" module of an app) are queued
+with .delay(*args, **kwargs), which inserts a Job row: no broker is needed,
+and jobs queued inside a transaction only exist if it commits. Arguments must
+be JSON serializable (pass ids, not model instances).
+
+"manage.py run_worker" claims ready jobs and runs them in a thread pool.
+A failing job is retried with exponential backoff until it has been tried
+max_attempts times, then it is kept as failed. A job whose worker dies is
+taken again once its visibility timeout expires, so tasks must be safe to run
+more than once.
+
+With TASKS_EAGER (i.e. in development without a worker), jobs run in the
+same process right after the current transaction commits.
+"""
+
+import random
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.tasks.models import Job
+
+RETRY_BASE_SECONDS = 10
+RETRY_MAX_SECONDS = 60 * 60
+
+registry = {}
+
+
+class Task:
+    def __init__(self, func, max_attempts: int):
+        self.func = func
+        self.name = f"{func.__module__}.{func.__qualname__}"
+        self.max_attempts = max_attempts
+        self.__doc__ = func.__doc__
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"<Task {self.name}>"
+
+    def delay(self, *args, **kwargs) -> Job | None:
+        """Queues a call of the task. Eager tasks return None."""
+        if settings.TASKS_EAGER:
+            transaction.on_commit(lambda: self.func(*args, **kwargs))
+            return None
+        return self.schedule(timezone.now(), *args, **kwargs)
+
+    def schedule(self, run_at, *args, **kwargs) -> Job:
+        """
+        Queues a call of the task to be run at (or after) run_at. Scheduled
+        jobs always go to the queue, even with TASKS_EAGER.
+        """
+        return Job.objects.create(
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs,
+            max_attempts=self.max_attempts,
+            run_at=run_at,
+        )
+
+    def schedule_once(self, run_at, *args, **kwargs) -> Job | None:
+        """
+        Like schedule(), unless a call of the task is already waiting to be run:
+        returns None then. The check and the insert hold a transaction level
+        advisory lock on the task name, so concurrent callers (e.g. a job
+        rescheduling itself and a deploy) queue a single job.
+        """
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT pg_advisory_xact_lock(hashtext(%s))", [self.name]
+                )
+            if Job.objects.filter(name=self.name, status=Job.Status.QUEUED).exists():
+                return None
+            return self.schedule(run_at, *args, **kwargs)
+
+
+def task(func=None, *, max_attempts: int = 5):
+    """
+    Registers a function as a task: @task or @task(max_attempts=...).
+    """
+
+    def register(func):
+        registered = Task(func, max_attempts)
+        registry[registered.name] = registered
+        return registered
+
+    return register(func) if func else register
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff (10s, 20s, 40s...) with jitter, capped at one hour"""
+    seconds = min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS)
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def run_job(job: Job) -> bool:
+    """
+    Runs a claimed job. It is deleted on success, or scheduled again (failed
+    when out of attempts) on error. Updates are conditional on the attempt
+    number: if the job was taken by another worker after its visibility
+    timeout expired, that worker owns it now.
+    """
+    mine = Job.objects.filter(
+        pk=job.pk, status=Job.Status.RUNNING, attempts=job.attempts
+    )
+    try:
+        registered = registry.get(job.name)
+        if registered is None:
+            raise LookupError(f"Unknown task {job.name}")
+        registered.func(*job.args, **job.kwargs)
+    except Exception:
+        now = timezone.now()
+        changes = {"last_error": traceback.format_exc(), "locked_until": None}
+        if job.attempts >= job.max_attempts:
+            changes["status"] = Job.Status.FAILED
+        else:
+            changes["status"] = Job.Status.QUEUED
+            changes["run_at"] = now + retry_delay(job.attempts)
+        mine.update(updated_at=now, **changes)
+        return False
+    mine.delete()
+    return True
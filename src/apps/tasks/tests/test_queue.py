@@ -0,0 +1,193 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.tasks.models import Job
+from apps.tasks.queue import registry, run_job, task
+
+calls = []
+
+
+@task
+def remember(value):
+    calls.append(value)
+
+
+@task(max_attempts=2)
+def explode():
+    raise RuntimeError("boom")
+
+
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_tasks_are_registered_by_name(self):
+        self.assertIs(registry["apps.tasks.tests.test_queue.remember"], remember)
+
+    def test_delay_queues_a_job(self):
+        job = remember.delay("hello")
+        self.assertEqual(job.name, "apps.tasks.tests.test_queue.remember")
+        self.assertEqual(job.args, ["hello"])
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertEqual(calls, [])
+
+    def test_claimed_jobs_are_hidden_until_visibility_timeout_expires(self):
+        remember.delay("hello")
+        [job] = Job.objects.claim(10, visibility_timeout=60)
+        self.assertEqual(job.status, Job.Status.RUNNING)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(Job.objects.claim(10, visibility_timeout=60), [])
+
+        # the worker running the job died
+        Job.objects.update(locked_until=timezone.now() - timedelta(seconds=1))
+        [job] = Job.objects.claim(10, visibility_timeout=60)
+        self.assertEqual(job.attempts, 2)
+
+    def test_successful_jobs_are_deleted(self):
+        remember.delay("hello")
+        [job] = Job.objects.claim(10, visibility_timeout=60)
+        self.assertTrue(run_job(job))
+        self.assertEqual(calls, ["hello"])
+        self.assertFalse(Job.objects.exists())
+
+    def test_failed_jobs_are_retried_with_backoff_then_kept_as_failed(self):
+        explode.delay()
+        [job] = Job.objects.claim(10, visibility_timeout=60)
+        self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.QUEUED)
+        self.assertGreater(job.run_at, timezone.now())
+        self.assertIn("RuntimeError: boom", job.last_error)
+        self.assertEqual(Job.objects.claim(10, visibility_timeout=60), [])
+
+        Job.objects.update(run_at=timezone.now())
+        [job] = Job.objects.claim(10, visibility_timeout=60)
+        self.assertFalse(run_job(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(Job.objects.ready().count(), 0)
+
+    def test_job_taken_by_another_worker_is_left_alone(self):
+        remember.delay("hello")
+        [job] = Job.objects.claim(10, visibility_timeout=60)
+        Job.objects.update(locked_until=timezone.now())
+        Job.objects.claim(10, visibility_timeout=60)
+
+        run_job(job)
+        self.assertEqual(Job.objects.get().attempts, 2)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_tasks_run_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(remember.delay("hello"))
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, ["hello"])
+        self.assertFalse(Job.objects.exists())
+
+
+class ScheduleOnceTest(TransactionTestCase):
+    def schedule_in_thread(self, started=None, release=None):
+        def run():
+            try:
+                with transaction.atomic():
+                    remember.schedule_once(timezone.now(), "hello")
+                    if started:
+                        started.set()
+                        release.wait(5)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def test_a_queued_job_is_not_scheduled_again(self):
+        self.assertIsNotNone(remember.schedule_once(timezone.now(), "hello"))
+        self.assertIsNone(remember.schedule_once(timezone.now(), "hello"))
+        self.assertEqual(Job.objects.count(), 1)
+
+    def test_concurrent_calls_schedule_a_single_job(self):
+        started, release = threading.Event(), threading.Event()
+        first = self.schedule_in_thread(started, release)
+        self.assertTrue(started.wait(5))
+        # waits for the lock held by the first transaction, then sees its job
+        second = self.schedule_in_thread()
+        second.join(0.5)
+        self.assertTrue(second.is_alive())
+
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertEqual(Job.objects.count(), 1)
+
+
+class RunWorkerCommandTest(TransactionTestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_burst_worker_runs_every_ready_job(self):
+        for value in range(5):
+            remember.delay(value)
+        explode.delay()
+
+        out = StringIO()
+        call_command("run_worker", burst=True, concurrency=2, stdout=out)
+
+        self.assertIn("5 jobs succeeded, 1 failed.", out.getvalue())
+        self.assertCountEqual(calls, range(5))
+        self.assertEqual(Job.objects.get().name, explode.name)
+
+    def test_worker_keeps_running_when_recording_a_job_outcome_raises(self):
+        for value in range(3):
+            remember.delay(value)
+        lost = remember.delay("lost")
+
+        def run_job_losing_connection(job):
+            if job.pk == lost.pk:
+                raise ConnectionError("connection lost")
+            return run_job(job)
+
+        out = StringIO()
+        with (
+            mock.patch(
+                "apps.tasks.management.commands.run_worker.run_job",
+                run_job_losing_connection,
+            ),
+            self.assertLogs(
+                "apps.tasks.management.commands.run_worker", "ERROR"
+            ) as logs,
+        ):
+            call_command("run_worker", burst=True, concurrency=2, stdout=out)
+
+        self.assertIn("3 jobs succeeded, 1 failed.", out.getvalue())
+        self.assertCountEqual(calls, range(3))
+        self.assertIn(f"Job {lost.pk} ", logs.output[0])
+        self.assertIn("ConnectionError: connection lost", logs.output[0])
+        # left running, taken again once its visibility timeout expires
+        self.assertEqual(Job.objects.get().status, Job.Status.RUNNING)
+
+    def test_purchase_registration_email_is_sent_by_worker(self):
+        response = self.client.post(
+            reverse("purchase:purchase_create"),
+            {
+                "register_first_name": "John",
+                "register_last_name": "Doe",
+                "register_email": "john@doe.com",
+                "register_email2": "john@doe.com",
+            },
+        )
+        self.assertRedirects(response, reverse("purchase:email_order"))
+        self.assertEqual(len(mail.outbox), 0)
+
+        call_command("run_worker", burst=True, stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["john@doe.com"])
@@ -0,0 +1,41 @@
+// Infinite scroll for keyset paginated lists (see KeysetPaginationMixin).
+// A "Load more" link with data-next-page="<rows element id>" is followed
+// without leaving the page as soon as it becomes visible: the next page is
+// fetched as JSON and its rows are appended to the rows element.
+document.addEventListener("DOMContentLoaded", function () {
+  document.querySelectorAll("[data-next-page]").forEach(function (link) {
+    const rows = document.getElementById(link.dataset.nextPage);
+    let loading = false;
+
+    const observer = new IntersectionObserver(function (entries) {
+      if (!entries[0].isIntersecting || loading) {
+        return;
+      }
+      loading = true;
+      const url = new URL(link.href);
+      url.searchParams.set("format", "json");
+      fetch(url, { headers: { Accept: "application/json" } })
+        .then(function (response) {
+          if (!response.ok) {
+            throw new Error(response.statusText);
+          }
+          return response.json();
+        })
+        .then(function (page) {
+          rows.insertAdjacentHTML("beforeend", page.html);
+          if (page.next) {
+            link.href = page.next;
+            loading = false;
+          } else {
+            observer.disconnect();
+            link.remove();
+          }
+        })
+        .catch(function () {
+          // the link still works as a regular page change
+          observer.disconnect();
+        });
+    });
+    observer.observe(link);
+  });
+});
@@ -0,0 +1,17 @@
+"""
+Helpers about the configured caches (see CACHES in settings.py).
+"""
+
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+def is_shared(alias: str = "default") -> bool:
+    """
+    Checks if a cache is seen by every process. A local memory cache lives in
+    one process: each gunicorn worker (and the task worker) has its own, and a
+    key deleted by one of them stays in the others. Data invalidated when
+    something changes (authorization, availability) must only be cached in a
+    shared cache (REDIS_URL).
+    """
+    return not isinstance(caches[alias], LocMemCache)
@@ -0,0 +1,83 @@
+"""
+Primary/replica database routing.
+
+Reads of the condo and reservation apps (setup lists, home pages, calendars)
+go to the "replica" alias when it is configured (POSTGRES_REPLICA_HOST); every
+write, and every read of sessions, users and auth tables, stays on "default".
+
+Replicas lag behind the primary, so only reads made while handling a safe
+request (GET, ...) go to the replica, enabled by ReadYourWritesMiddleware.
+Background tasks, management commands and the shell always read the primary,
+since what they read is usually written back or cached. Reads are also pinned
+to the primary:
+- inside transactions, which must see their own writes;
+- while handling unsafe requests (POST, ...);
+- for a few seconds after a POST in the same session, so the redirect after
+  a form_valid() sees what was just saved (see ReadYourWritesMiddleware);
+- inside use_primary() blocks, i.e. reads filling a cache shared with
+  other requests.
+Related objects are read from the database their instance came from.
+"""
+
+import contextvars
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+REPLICA_APPS = {"condo", "reservation"}
+
+_replica_allowed = contextvars.ContextVar("replica_allowed", default=False)
+_pinned_to_primary = contextvars.ContextVar("pinned_to_primary", default=False)
+
+
+@contextmanager
+def use_replica():
+    """Lets reads of the enclosed block (a safe request) go to the replica"""
+    token = _replica_allowed.set(True)
+    try:
+        yield
+    finally:
+        _replica_allowed.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """Routes every read of the enclosed block to the primary database"""
+    token = _pinned_to_primary.set(True)
+    try:
+        yield
+    finally:
+        _pinned_to_primary.reset(token)
+
+
+def replica_configured() -> bool:
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if (
+            model._meta.app_label not in REPLICA_APPS
+            or not replica_configured()
+            or not _replica_allowed.get()
+            or _pinned_to_primary.get()
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            # related objects are read where their instance was
+            return instance._state.db
+        return REPLICA_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # the replica holds the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
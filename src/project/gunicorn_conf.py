@@ -0,0 +1,59 @@
+"""
+Gunicorn configuration for production serving.
+
+    WSGI: gunicorn project.wsgi:application -c project/gunicorn_conf.py
+    ASGI: gunicorn project.asgi:application -c project/gunicorn_conf.py \
+              -k uvicorn.workers.UvicornWorker
+
+Every value can be overridden through environment variables (see .env-example);
+production_config/commands.sh picks the mode from SERVER_MODE. Send SIGHUP to
+the master process for a graceful reload of the workers.
+"""
+
+import multiprocessing
+import os
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+# (2 x CPU) + 1 sync workers is the usual starting point for I/O bound apps
+workers = _env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+threads = _env_int("GUNICORN_THREADS", 1)
+
+# Django is imported once in the master and workers are forked from it:
+# faster boot and copy-on-write shared memory. Database connections are only
+# opened inside workers, on the first request.
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+# keep connections from the reverse proxy open between requests
+keepalive = _env_int("GUNICORN_KEEPALIVE", 5)
+timeout = _env_int("GUNICORN_TIMEOUT", 30)
+# time given to workers to finish in-flight requests on reload/shutdown
+graceful_timeout = _env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+# recycle workers regularly (jitter avoids restarting all of them at once)
+max_requests = _env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = _env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-")
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+forwarded_allow_ips = os.getenv("FORWARDED_ALLOW_IPS", "127.0.0.1")
+
+
+def when_ready(server):
+    """
+    With preload_app, compiles every template in the master before workers are
+    forked, so they all start with a warm cached template loader.
+    """
+    if not server.cfg.preload_app:
+        return
+    from apps.condo.management.commands.warm_templates import compile_templates
+
+    timings = compile_templates()
+    server.log.info("%d templates compiled before forking workers", len(timings))
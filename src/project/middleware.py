@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+
+from .db_routers import use_primary, use_replica
+
+PIN_SESSION_KEY = "_db_primary_until"
+
+
+class ReadYourWritesMiddleware:
+    """
+    Sends the database reads of safe requests to the replica, except for
+    REPLICA_PIN_SECONDS after an unsafe request in the same session: reads
+    stay on the primary while handling unsafe requests and right after them,
+    so users always see their own writes even if the replica lags (see
+    db_routers.py).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 5)
+
+    def __call__(self, request):
+        is_write = request.method not in ("GET", "HEAD", "OPTIONS", "TRACE")
+        pinned = is_write or request.session.get(PIN_SESSION_KEY, 0) > time.time()
+        if not pinned:
+            with use_replica():
+                return self.get_response(request)
+
+        with use_primary():
+            response = self.get_response(request)
+        if is_write and request.user.is_authenticated:
+            request.session[PIN_SESSION_KEY] = time.time() + self.pin_seconds
+        return response
@@ -19,6 +19,9 @@ SECRET_KEY = os.getenv("SECRET_KEY", "change-me")
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.environ.get("DEBUG") == "1"
 
+# "development" or "production"
+DJANGO_ENV = os.getenv("DJANGO_ENV", "development")
+
 ALLOWED_HOSTS = [
     h.strip() for h in os.getenv("ALLOWED_HOSTS", "").split(",") if h.strip()
 ]
@@ -37,6 +40,7 @@ INSTALLED_APPS = [
     "apps.condo_people.apps.CondoPeopleConfig",
     "apps.reservation",
     "apps.purchase",
+    "apps.tasks",
 ]
 
 MIDDLEWARE = [
@@ -53,20 +57,31 @@ ROOT_URLCONF = "project.urls"
 
 APPEND_SLASH = True
 
+# Templates are parsed once per process and kept compiled in memory, except in
+# development (DEBUG) where edits must show up on reload. In production they
+# are compiled at startup by "manage.py warm_templates" (see commands.sh).
+TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+if not DEBUG:
+    TEMPLATE_LOADERS = [("django.template.loaders.cached.Loader", TEMPLATE_LOADERS)]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [
             BASE_DIR / "src" / "base_templates",
         ],
-        "APP_DIRS": True,
         "OPTIONS": {
+            "loaders": TEMPLATE_LOADERS,
             "context_processors": [
                 "django.template.context_processors.debug",
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "apps.condo_people.context_processors.user_groups",
+                "apps.condo.context_processors.fragment_cache",
             ],
         },
     },
@@ -86,12 +101,79 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_PORT"),
+        # Persistent connections: reused by the requests of each worker thread
+        # for DB_CONN_MAX_AGE seconds ("0" closes them after every request,
+        # "None" keeps them forever), checked before reuse if health checks on.
+        "CONN_MAX_AGE": (
+            None
+            if os.getenv("DB_CONN_MAX_AGE") == "None"
+            else int(os.getenv("DB_CONN_MAX_AGE", "60"))
+        ),
+        "CONN_HEALTH_CHECKS": os.getenv("DB_CONN_HEALTH_CHECKS", "1") == "1",
     }
 }
 
+# Connection pool (Django 5.1+, requires psycopg 3 with the "pool" extra). The
+# pool keeps connections open itself, so persistent connections are disabled.
+if os.getenv("DB_POOL") == "1":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            # seconds a request waits for a free connection before failing
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    }
+
+# Under ASGI (SERVER_MODE=asgi, uvicorn workers) the sync code of each request
+# runs in a new thread, so a persistent connection is never reused by another
+# request and stays open until the database refuses new ones: Django requires
+# CONN_MAX_AGE = 0 there. Use DB_POOL=1 to reuse connections.
+if os.getenv("SERVER_MODE") == "asgi":
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+
+# Read replica: reads of the condo and reservation apps are routed to it (see
+# project/db_routers.py). Tests run it as a mirror of the default database.
+if os.getenv("POSTGRES_REPLICA_HOST"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "HOST": os.getenv("POSTGRES_REPLICA_HOST"),
+        "PORT": os.getenv("POSTGRES_REPLICA_PORT", os.getenv("POSTGRES_PORT")),
+        "TEST": {"MIRROR": "default"},
+    }
+    # reads stay on the primary this long after a POST (read-your-writes)
+    REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.contrib.auth.middleware.AuthenticationMiddleware") + 1,
+        "project.middleware.ReadYourWritesMiddleware",
+    )
+
+DATABASE_ROUTERS = ["project.db_routers.PrimaryReplicaRouter"]
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Local memory (one cache per process) unless a Redis server is configured
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
 # Changing Django standart user model to mine:
 AUTH_USER_MODEL = "condo_people.User"
 
+# Permissions of users are cached across requests (see condo_people.backends)
+AUTHENTICATION_BACKENDS = ["apps.condo_people.backends.AccessCacheBackend"]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -139,6 +221,29 @@ STATICFILES_DIRS = [
     BASE_DIR / "src" / "base_static",
 ]
 
+# In production, collectstatic stores content-hashed copies of every file
+# (i.e. css/style.3f2a1b.css) along with gzip/brotli variants, and WhiteNoise
+# serves them with "Cache-Control: max-age=315360000, immutable": a new
+# deploy changes the names, so browsers never need to revalidate them.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "project.storage.CompressedManifestStorage"
+            if DJANGO_ENV == "production"
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+if DJANGO_ENV == "production":
+    # serves STATIC_ROOT before any other middleware or view is involved
+    MIDDLEWARE.insert(
+        MIDDLEWARE.index("django.middleware.security.SecurityMiddleware") + 1,
+        "whitenoise.middleware.WhiteNoiseMiddleware",
+    )
+
 # URL available for users to access media files. MUST BE STRING
 # it is NOT equivalent to a fisical folder. It's more like an URL.
 MEDIA_URL = "/media/"  # i.e http://mysite.com/media/image.jpg
@@ -146,6 +251,13 @@ MEDIA_URL = "/media/"  # i.e http://mysite.com/media/image.jpg
 # where media files will be stored when transfered from.
 MEDIA_ROOT = BASE_DIR / "data" / "web" / "media"
 
+# Background tasks (see apps/tasks/queue.py), run by "manage.py run_worker".
+# Eager tasks run in the web process instead, after the transaction commits.
+TASKS_EAGER = os.getenv("TASKS_EAGER") == "1"
+TASKS_CONCURRENCY = int(os.getenv("TASKS_CONCURRENCY", "4"))
+# seconds before a job not finished by its worker is run again
+TASKS_VISIBILITY_TIMEOUT = int(os.getenv("TASKS_VISIBILITY_TIMEOUT", "300"))
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -0,0 +1,35 @@
+"""
+Static files storage for production: content-hashed names (so files can be
+cached forever by browsers and proxies) plus precompressed gzip and brotli
+variants that WhiteNoise serves without compressing on each request.
+"""
+
+import os
+
+from whitenoise.compress import Compressor
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class IncrementalCompressor(Compressor):
+    """
+    Skips files whose compressed variants are up to date. Variants get the
+    modification time of their source file when written, so collectstatic
+    without --clear only compresses new or changed files.
+    """
+
+    SUFFIXES = (".br", ".gz")
+
+    def compress(self, path):
+        mtime = os.stat(path).st_mtime
+        up_to_date = [
+            path + suffix
+            for suffix in self.SUFFIXES
+            if os.path.exists(path + suffix)
+            and os.stat(path + suffix).st_mtime == mtime
+        ]
+        return up_to_date or super().compress(path)
+
+
+class CompressedManifestStorage(CompressedManifestStaticFilesStorage):
+    def create_compressor(self, **kwargs):
+        return IncrementalCompressor(**kwargs)
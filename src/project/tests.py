@@ -0,0 +1,134 @@
+import os
+import tempfile
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.sessions.backends.signed_cookies import SessionStore
+from django.db import OperationalError, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from apps.condo.models import Block
+from apps.condo_people.models import User
+
+from .db_routers import PrimaryReplicaRouter, use_primary, use_replica
+from .middleware import PIN_SESSION_KEY, ReadYourWritesMiddleware
+from .storage import IncrementalCompressor
+
+
+class HealthCheckViewTest(TestCase):
+    def test_healthz_url_is_correct(self):
+        self.assertEqual(reverse("healthz"), "/healthz/")
+
+    def test_healthz_returns_ok_when_database_is_reachable(self):
+        response = self.client.get(reverse("healthz"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_healthz_returns_503_when_database_is_unreachable(self):
+        with mock.patch(
+            "project.views.connection.cursor", side_effect=OperationalError
+        ):
+            response = self.client.get(reverse("healthz"))
+        self.assertEqual(response.status_code, 503)
+
+
+@mock.patch.dict(settings.DATABASES, {"replica": settings.DATABASES["default"]})
+class PrimaryReplicaRouterTest(SimpleTestCase):
+    router = PrimaryReplicaRouter()
+
+    def test_condo_reads_go_to_replica_and_writes_to_primary(self):
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Block), "replica")
+            self.assertEqual(self.router.db_for_write(Block), "default")
+            # sessions and users always stay on the primary
+            self.assertEqual(self.router.db_for_read(User), "default")
+
+    def test_reads_are_pinned_to_primary(self):
+        with use_replica():
+            with use_primary():
+                self.assertEqual(self.router.db_for_read(Block), "default")
+            with mock.patch.object(connections["default"], "in_atomic_block", True):
+                self.assertEqual(self.router.db_for_read(Block), "default")
+
+    def test_reads_outside_safe_requests_stay_on_primary(self):
+        # background tasks, management commands, the shell
+        self.assertEqual(self.router.db_for_read(Block), "default")
+
+    def test_related_objects_are_read_where_their_instance_was(self):
+        block = Block()
+        block._state.db = "default"
+        with use_replica():
+            self.assertEqual(self.router.db_for_read(Block, instance=block), "default")
+            block._state.db = "replica"
+            self.assertEqual(self.router.db_for_read(Block, instance=block), "replica")
+            with use_primary():
+                self.assertEqual(
+                    self.router.db_for_read(Block, instance=block), "default"
+                )
+
+    def test_replica_is_never_migrated(self):
+        self.assertFalse(self.router.allow_migrate("replica", "condo"))
+        self.assertTrue(self.router.allow_migrate("default", "condo"))
+
+
+@mock.patch.dict(settings.DATABASES, {"replica": settings.DATABASES["default"]})
+class ReadYourWritesMiddlewareTest(SimpleTestCase):
+    def setUp(self):
+        self.routed_to = None
+
+        def view(request):
+            self.routed_to = PrimaryReplicaRouter().db_for_read(Block)
+            return HttpResponse()
+
+        self.middleware = ReadYourWritesMiddleware(view)
+        self.session = SessionStore()
+
+    def request(self, method):
+        request = getattr(RequestFactory(), method)("/")
+        request.session = self.session
+        request.user = mock.Mock(is_authenticated=True)
+        self.middleware(request)
+        return self.routed_to
+
+    def test_reads_stay_on_primary_after_a_post_in_the_same_session(self):
+        self.assertEqual(self.request("get"), "replica")
+        self.assertEqual(self.request("post"), "default")
+        self.assertEqual(self.request("get"), "default")
+
+        self.session[PIN_SESSION_KEY] = 0  # pin expired
+        self.assertEqual(self.request("get"), "replica")
+
+
+class IncrementalCompressorTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "style.css")
+        self.write("body { color: black; }\n" * 100)
+        self.compressor = IncrementalCompressor(quiet=True)
+
+    def write(self, content, mtime=None):
+        with open(self.path, "w") as file:
+            file.write(content)
+        if mtime:
+            os.utime(self.path, (mtime, mtime))
+
+    def test_up_to_date_variants_are_not_compressed_again(self):
+        variants = self.compressor.compress(self.path)
+        self.assertEqual(variants, [self.path + ".br", self.path + ".gz"])
+
+        with mock.patch.object(self.compressor, "compress_gzip") as compress_gzip:
+            self.assertEqual(self.compressor.compress(self.path), variants)
+        compress_gzip.assert_not_called()
+
+    def test_modified_files_are_compressed_again(self):
+        self.compressor.compress(self.path)
+        self.write("main { color: white; }\n" * 100, mtime=1_000_000_000)
+
+        with mock.patch.object(
+            self.compressor, "compress_gzip", wraps=self.compressor.compress_gzip
+        ) as compress_gzip:
+            self.compressor.compress(self.path)
+        compress_gzip.assert_called_once()
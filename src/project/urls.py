@@ -3,8 +3,11 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
+from . import views
+
 urlpatterns = [
     path("admin/", admin.site.urls),
+    path("healthz/", views.healthz, name="healthz"),
     path("", include("apps.prelogin.urls")),
     path("condo/", include("apps.condo.urls")),
     path("condo_people/", include("apps.condo_people.urls")),
@@ -14,4 +17,6 @@ urlpatterns = [
 
 if settings.DEBUG:
     urlpatterns += static(prefix=settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
-    urlpatterns += static(prefix=settings.STATIC_URL, document_root=settings.STATIC_ROOT)
+    urlpatterns += static(
+        prefix=settings.STATIC_URL, document_root=settings.STATIC_ROOT
+    )